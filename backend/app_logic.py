@@ -9,7 +9,7 @@
 Handles the core business logic for the Precision File Search application.
 
 This module contains the primary functions for running the document content
-classifier and extracting text from various file formats. It operates
+classifier, which extracts text in a process pool and classifies it in batches. It operates
 independently of the web server's API endpoints, focusing on the backend tasks.
 
 The "classic" file search functionality is now delegated to the high-performance
@@ -18,14 +18,20 @@ FileSearchEngine.
 
 # 1. IMPORTS ####################################################################################################
 import os
+import time
 import sqlite3
+from collections import deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Set, Dict, Any
+from typing import Deque, List, Set, Dict, Any, Tuple
 import joblib as ml
 import logging
 from .config_manager import get_config, DATA_FOLDER
-# --- NEW: Import the high-performance engine and its text extraction utility ---
-from .file_engine import FileSearchEngine, extract_text_from_file
+from .file_engine import FileSearchEngine
+from .text_extraction import extract_texts
+from .process_search import create_process_pool, terminate_process_pool
+from .search_jobs import SearchJobRegistry
 
 # 2. SETUP & CONSTANTS ##########################################################################################
 logger = logging.getLogger(__name__)
@@ -33,6 +39,17 @@ logger = logging.getLogger(__name__)
 DB_FILE = os.path.join(DATA_FOLDER, "classifier_results.db")
 CLASSIFIER_MODEL_PATH = os.path.join(DATA_FOLDER, "document_classifier.ml")
 
+# Files handed to an extraction worker per task.
+EXTRACTION_CHUNK_SIZE = 16
+# Seconds one chunk may take before its files are skipped and the extraction processes replaced.
+DEFAULT_EXTRACTION_TIMEOUT = 600
+# Default number of texts classified per `predict` call (and written per transaction).
+PREDICT_BATCH_SIZE = 256
+# Extracted texts this short are not worth classifying.
+MIN_TEXT_LENGTH = 50
+# Longest time classified results wait before they are committed.
+COMMIT_INTERVAL = 30  # seconds
+
 # 3. INITIALIZATION #############################################################################################
 try:
     CLASSIFIER_MODEL = ml.load(CLASSIFIER_MODEL_PATH)
@@ -50,6 +67,7 @@ FILE_SEARCH_ENGINE = FileSearchEngine(
     default_excluded_folders=DEFAULT_EXCLUDED_FOLDERS,
     default_file_extensions=DEFAULT_FILE_EXTENSIONS
 )
+SEARCH_JOBS = SearchJobRegistry()
 
 # 4. GLOBAL STATE & CATEGORIES ##################################################################################
 classifier_status = {"status": "idle", "progress": 0, "total": 0, "current_file": ""}
@@ -60,13 +78,43 @@ FILE_CATEGORIES = FILE_SEARCH_ENGINE.file_categories
 
 # 5. CORE LOGIC FUNCTIONS #######################################################################################
 
-# The `extract_text_from_file` function is now cleanly imported from file_engine.py
-# This avoids code duplication.
+# Text extraction goes through the shared, cached service in text_extraction.py
+# (`extract_texts` runs it in worker processes). This avoids code duplication and
+# re-parsing files other jobs have already seen.
+
+def _load_classified_mtimes(conn: sqlite3.Connection, search_path: str) -> Dict[str, float]:
+    """Loads the stored modification time of every classified file below `search_path` in one query."""
+    prefix = os.path.join(str(Path(search_path)), "")
+    upper = prefix[:-1] + chr(ord(os.sep) + 1)
+    return dict(conn.execute(
+        "SELECT path, modified_time FROM classified_files WHERE path >= ? AND path < ?", (prefix, upper)
+    ))
+
+def _classify_batch(conn: sqlite3.Connection, batch: List[Tuple[str, float, str]]):
+    """Classifies a batch of extracted texts with one `predict` call and stores them in one transaction."""
+    try:
+        predictions = CLASSIFIER_MODEL.predict([text for _, _, text in batch])
+        rows = [(path, prediction, mtime) for (path, mtime, _), prediction in zip(batch, predictions)]
+    except Exception:
+        logger.warning(f"Batch prediction failed for {len(batch)} files; classifying them one by one.", exc_info=True)
+        rows = []
+        for path, mtime, text in batch:
+            try:
+                rows.append((path, CLASSIFIER_MODEL.predict([text])[0], mtime))
+            except Exception:
+                logger.warning(f"Skipping file {path} due to processing error.", exc_info=True)
+    conn.executemany("INSERT OR REPLACE INTO classified_files (path, tag, modified_time) VALUES (?, ?, ?)", rows)
+    conn.commit()
 
 def run_classification_task(search_path: str):
     """
     Scans a directory, classifies files using a loaded ML model, and stores
-    results in an SQLite database. This function remains unchanged.
+    results in an SQLite database. Text is extracted in a process pool (a
+    worker that crashes or exceeds `classifier_params.extraction_timeout` only
+    costs the files of its chunk), the model predicts whole batches at once
+    and each batch is written in a single transaction. Results are committed at least every `COMMIT_INTERVAL`,
+    and files whose stored mtime is unchanged are skipped, so an interrupted
+    run resumes where it stopped.
     """
     global classifier_status
     if CLASSIFIER_MODEL is None:
@@ -77,7 +125,12 @@ def run_classification_task(search_path: str):
 
     classifier_status = {"status": "running", "progress": 0, "total": 0, "current_file": "Initializing..."}
     logger.info(f"Starting classification task for path: {search_path}")
+    classifier_params = get_config("classifier_params") or {}
+    extraction_workers = classifier_params.get("extraction_workers") or os.cpu_count() or 1
+    predict_batch_size = max(1, classifier_params.get("predict_batch_size", PREDICT_BATCH_SIZE))
+    extraction_timeout = classifier_params.get("extraction_timeout") or DEFAULT_EXTRACTION_TIMEOUT
     conn = None
+    pool = None
     try:
         files_to_scan = [
             Path(dirpath) / filename
@@ -89,42 +142,121 @@ def run_classification_task(search_path: str):
         classifier_status['total'] = len(files_to_scan)
         logger.info(f"Found {len(files_to_scan)} files to classify.")
         conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        for i, file_path in enumerate(files_to_scan):
-            classifier_status['progress'] = i + 1
-            classifier_status['current_file'] = str(file_path.name)
+        classified_mtimes = _load_classified_mtimes(conn, search_path)
+        logger.info(f"Loaded {len(classified_mtimes)} previously classified files below the search path.")
 
+        done = 0
+        files_to_extract: List[Tuple[str, float]] = []
+        for file_path in files_to_scan:
             try:
                 mod_time = file_path.stat().st_mtime
-                cursor.execute("SELECT modified_time FROM classified_files WHERE path = ?", (str(file_path),))
-                result = cursor.fetchone()
-
-                if result and result[0] == mod_time:
+                if classified_mtimes.get(str(file_path)) == mod_time:
                     logger.debug(f"Skipping unmodified file: {file_path}")
+                    done += 1
                     continue
-
-                text = extract_text_from_file(file_path)
-                if text and len(text) > 50:
-                    prediction = CLASSIFIER_MODEL.predict([text])[0]
-                    cursor.execute("INSERT OR REPLACE INTO classified_files (path, tag, modified_time) VALUES (?, ?, ?)", (str(file_path), prediction, mod_time))
+                files_to_extract.append((str(file_path), mod_time))
             except Exception:
                 logger.warning(f"Skipping file {file_path} due to processing error.", exc_info=True)
-                continue
-        conn.commit()
+                done += 1
+        classifier_status['progress'] = done
+        logger.info(f"Extracting text from {len(files_to_extract)} new or modified files with {extraction_workers} workers.")
+
+        chunks: Deque[List[Tuple[str, float]]] = deque(
+            files_to_extract[start:start + EXTRACTION_CHUNK_SIZE]
+            for start in range(0, len(files_to_extract), EXTRACTION_CHUNK_SIZE)
+        )
+        pool = create_process_pool(extraction_workers)
+        in_flight: Dict[Future, Tuple[List[Tuple[str, float]], float]] = {}
+        batch: List[Tuple[str, float, str]] = []
+        failed = 0
+        broken = False
+        last_commit = time.monotonic()
+        while in_flight or chunks:
+            # One chunk per worker, so every chunk starts running as soon as it is submitted and its deadline holds.
+            while not broken and chunks and len(in_flight) < extraction_workers:
+                chunk = chunks.popleft()
+                try:
+                    future = pool.submit(extract_texts, [path for path, _ in chunk])
+                except BrokenProcessPool:
+                    # A worker died; the chunks in flight fail below, then the pool is replaced.
+                    chunks.appendleft(chunk)
+                    broken = True
+                    break
+                in_flight[future] = (chunk, time.monotonic() + extraction_timeout)
+            finished = set()
+            if in_flight:
+                next_deadline = min(deadline for _, deadline in in_flight.values())
+                finished, _ = wait(in_flight, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            completed: List[Tuple[List[Tuple[str, float]], List[str]]] = []
+            for future in finished:
+                chunk, _ = in_flight.pop(future)
+                try:
+                    completed.append((chunk, future.result()))
+                except BrokenProcessPool:
+                    broken = True
+                    logger.warning(f"An extraction process crashed; skipping {len(chunk)} files: {[path for path, _ in chunk]}")
+                    completed.append((chunk, None))
+                except Exception:
+                    logger.warning(f"Text extraction failed for {len(chunk)} files; skipping them.", exc_info=True)
+                    completed.append((chunk, None))
+
+            now = time.monotonic()
+            expired = [future for future, (_, deadline) in in_flight.items() if deadline <= now]
+            for future in expired:
+                chunk, _ = in_flight.pop(future)
+                logger.warning(
+                    f"Extracting {len(chunk)} files took longer than {extraction_timeout:g} seconds; "
+                    f"skipping them: {[path for path, _ in chunk]}"
+                )
+                completed.append((chunk, None))
+            if expired:
+                # A hung worker cannot be interrupted: replace the pool and resubmit the chunks it took down.
+                chunks.extendleft(reversed([chunk for chunk, _ in in_flight.values()]))
+                in_flight.clear()
+            if expired or (broken and not in_flight):
+                terminate_process_pool(pool)
+                pool = create_process_pool(extraction_workers)
+                broken = False
+
+            for chunk, texts in completed:
+                if texts is None:
+                    failed += len(chunk)
+                else:
+                    batch.extend(
+                        (path, mod_time, text) for (path, mod_time), text in zip(chunk, texts)
+                        if text and len(text) > MIN_TEXT_LENGTH
+                    )
+                done += len(chunk)
+                classifier_status['progress'] = done
+                classifier_status['current_file'] = os.path.basename(chunk[-1][0])
+            while len(batch) >= predict_batch_size:
+                _classify_batch(conn, batch[:predict_batch_size])
+                del batch[:predict_batch_size]
+                last_commit = time.monotonic()
+            # Slow extractions still commit regularly, so an interrupted run can resume where it stopped.
+            if batch and time.monotonic() - last_commit >= COMMIT_INTERVAL:
+                _classify_batch(conn, batch)
+                batch.clear()
+                last_commit = time.monotonic()
+        if batch:
+            _classify_batch(conn, batch)
+        if failed:
+            logger.warning(f"Text extraction failed or timed out for {failed} files; they were not classified.")
         logger.info("Classification task finished successfully.")
     except Exception:
         logger.exception("The main classifier task failed unexpectedly.")
         classifier_status['status'] = 'error'
         classifier_status['current_file'] = 'An error occurred during classification.'
     finally:
+        if pool:
+            terminate_process_pool(pool)
         if conn:
             conn.close()
         classifier_status['status'] = 'complete'
         classifier_status['current_file'] = 'Finished!'
 
 # --- REPLACED: The old, inefficient run_search function is replaced by this clean wrapper ---
-async def run_search(websocket, search_id: str, req):
+async def run_search(websocket, search_id: str, req, stop_event=None):
     """
     Delegates the classic file/folder search to the high-performance file engine.
     """
@@ -136,4 +268,4 @@ async def run_search(websocket, search_id: str, req):
 
     logger.info(f"Delegating classic search (ID: {search_id}) to high-performance engine.")
     # --- FIX: Call the correctly named instance ---
-    await FILE_SEARCH_ENGINE.run_search(websocket, search_id, req)
+    await FILE_SEARCH_ENGINE.run_search(websocket, search_id, req, stop_event)
@@ -17,10 +17,9 @@ The main function, `run_training_task`, orchestrates the following steps:
 1.  **Data Loading:** Scans a specified directory for training data, which is
     expected to be organized into subdirectories where each subdirectory's name
     represents a class label (e.g., 'Invoices', 'Contracts').
-2.  **Text Extraction:** Uses the `unstructured` library to robustly extract
-    text content from a wide variety of file formats found within the data
-    directories. It includes a fallback for plain text reading if `unstructured`
-    fails.
+2.  **Text Extraction:** Uses the shared `text_extraction` service, which
+    extracts text from a wide variety of file formats and caches it, so
+    documents already seen by the classifier or the indexer are not re-parsed.
 3.  **Data Splitting:** Divides the loaded documents and their corresponding
     labels into training and testing sets using scikit-learn's `train_test_split`.
 4.  **Model Training:** Defines and trains a scikit-learn `Pipeline`. This pipeline
@@ -45,32 +44,15 @@ from sklearn.metrics import accuracy_score
 import time
 import os
 from typing import Set
-from unstructured.partition.auto import partition
 from .config_manager import DATA_FOLDER
+from .text_extraction import get_document_text
 
 # 2. CONSTANTS & SETUP ##########################################################################################
 logger = logging.getLogger(__name__)
 
 CLASSIFIER_MODEL_PATH = os.path.join(DATA_FOLDER, "document_classifier.ml")
 
-# 3. HELPER FUNCTIONS ###########################################################################################
-def _extract_text(file_path: Path) -> str:
-    try:
-        if not file_path.is_file():
-            return ""
-        elements = partition(filename=str(file_path))
-        return "\n".join([str(el) for el in elements])
-    except Exception as e:
-        logger.warning(f"Unstructured failed on {file_path.name} during training: {e}. Falling back to text read.")
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
-        except Exception as fe:
-            logger.error(f"Fallback text read also failed for {file_path.name} during training: {fe}")
-            return ""
-
-
-# 4. MAIN TRAINING FUNCTION #####################################################################################
+# 3. MAIN TRAINING FUNCTION #####################################################################################
 def run_training_task(status_dict: dict, data_path: str, test_size: float, n_estimators: int, excluded_folders: Set[str]):
     """
     Main function to run the training process and report status.
@@ -105,7 +87,7 @@ def run_training_task(status_dict: dict, data_path: str, test_size: float, n_est
 
             for file_path in category_dir.rglob("*"):
                 if file_path.is_file():
-                    content = _extract_text(file_path)
+                    content = get_document_text(file_path)
                     if content:
                         texts.append(content)
                         labels.append(category)
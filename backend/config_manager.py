@@ -105,6 +105,28 @@ DEFAULT_CONFIG = {
         "default_temperature": 0.2,
         "default_max_tokens": 4096
     },
+    "classic_search_params": {
+        "enable_file_catalog": True,
+        "catalog_refresh_interval": 60,
+        "enable_content_index": False,
+        "content_index_max_file_size": 4194304,
+        "worker_pool_size": 0,
+        "io_parallelism": {},
+        "process_pool_size": 0
+    },
+    "text_extraction": {
+        "cache_max_mb": 1024,
+        "compression_level": 6
+    },
+    "classifier_params": {
+        "extraction_workers": 0,
+        "extraction_timeout": 600,
+        "predict_batch_size": 256
+    },
+    "indexing_params": {
+        "loader_workers": 0,
+        "load_timeout": 120
+    },
     "llm_config": {
         "api_key": "YOUR_LLM_API_KEY_HERE",
         "model_name": "meta-llama/llama-4-maverick-17b-128e-instruct",
@@ -120,7 +142,8 @@ DEFAULT_CONFIG = {
     },
     "embedding_model": {
         "model_name": "",
-        "device": "auto"
+        "device": "auto",
+        "cache_max_mb": 512
     },
     "reranker_model": {
         "model_name": "",
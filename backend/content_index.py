@@ -0,0 +1,330 @@
+# backend/content_index.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Optional persistent trigram index for `file_content` searches.
+
+Reading every candidate file is the dominant cost of a content search. This
+module keeps an inverted index from byte trigrams to the files that contain
+them (`content_index.db`), so that a search only has to open the few files
+that could possibly match.
+
+How it works:
+-   **Indexing:** Text is normalized the same way the content matcher reads
+    it (UTF-8 with invalid bytes dropped) and ASCII-lowercased, then every
+    three-byte window is recorded as an integer trigram for the file.
+-   **Query Planning (`build_trigram_query`):** The compiled search pattern is
+    parsed back into an AND/OR tree of the literal runs every match must
+    contain. Patterns that cannot be decomposed into literals of at least
+    three bytes produce no plan, and the search falls back to a full scan.
+-   **Incremental Maintenance:** Each entry remembers the size and mtime the
+    file had when it was indexed. Files whose metadata changed are re-read
+    during the search that first sees them and queued for re-indexing, so the
+    index converges without a separate build step. Worker processes read files
+    with `read_indexable_text` and hand back only the trigrams, which the
+    search thread then `record`s.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import os
+import re
+import sqlite3
+import threading
+import logging
+from re import _parser as sre_parse
+from re import _constants as sre_constants
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .config_manager import DATA_FOLDER
+from .content_matcher import is_binary_block, detect_non_utf8_encoding, BINARY_SNIFF_SIZE
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+CONTENT_INDEX_DB_FILE = os.path.join(DATA_FOLDER, "content_index.db")
+
+# Files larger than this are recorded as unindexed and always scanned.
+DEFAULT_MAX_INDEXED_FILE_SIZE = 4 * 1024 * 1024  # 4 MB
+# Pending trigram postings held in memory before they are written to disk.
+FLUSH_THRESHOLD = 2_000_000
+# Upper bound on trigrams looked up per literal; a subset only widens the candidates.
+MAX_TRIGRAMS_PER_LITERAL = 24
+# Stored as the database's user_version; indexes built by an older version are discarded and rebuilt.
+# Version 2: UTF-16/UTF-32 files are decoded by their byte-order mark instead of as UTF-8.
+INDEX_FORMAT_VERSION = 2
+
+_CONTENT_INDEX: Optional["ContentIndex"] = None
+
+# 3. TRIGRAM HELPERS ############################################################################################
+def extract_trigrams(data: bytes) -> Set[int]:
+    """Returns the set of integer-encoded trigrams contained in normalized bytes."""
+    return {int.from_bytes(data[i:i + 3], 'big') for i in range(len(data) - 2)}
+
+def text_trigrams(text: str) -> Set[int]:
+    """Returns the trigrams of decoded text, normalized the way the index stores them."""
+    return extract_trigrams(text.encode('utf-8').lower())
+
+def read_indexable_text(path: str, size: int, max_file_size: int) -> Optional[str]:
+    """
+    Reads and decodes a file for the index. Returns None for files that are too
+    large or binary (they are recorded as unindexed); raises OSError if the
+    file cannot be read.
+    """
+    if size > max_file_size:
+        return None
+    with open(path, 'rb') as f:
+        data = f.read(max_file_size + 1)
+    if len(data) > max_file_size or is_binary_block(data[:BINARY_SNIFF_SIZE]):
+        return None
+    # UTF-16/UTF-32 files are text too; trigrams are always taken from the UTF-8 form.
+    return data.decode(detect_non_utf8_encoding(data[:4]) or 'utf-8', errors='ignore')
+
+def _literal_trigrams(literal: str, ignore_case: bool) -> List[int]:
+    data = literal.encode('utf-8').lower()
+    trigrams = []
+    for i in range(len(data) - 2):
+        window = data[i:i + 3]
+        # Byte-level lowercasing cannot fold non-ASCII letters, so those windows are unusable.
+        if ignore_case and any(b > 0x7F for b in window):
+            continue
+        trigrams.append(int.from_bytes(window, 'big'))
+    return trigrams
+
+# 4. QUERY PLANNING #############################################################################################
+# A plan is a small tree: ("lit", [trigrams]), ("and", [plans]), ("or", [plans]) or None for "anything".
+
+def _plan_sequence(items: Iterable, ignore_case: bool) -> Optional[Tuple]:
+    required = []
+    run: List[str] = []
+
+    def close_run():
+        if run:
+            trigrams = _literal_trigrams("".join(run), ignore_case)
+            if trigrams:
+                required.append(("lit", trigrams))
+            run.clear()
+
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        close_run()
+        if op == sre_constants.BRANCH:
+            branches = [_plan_sequence(branch, ignore_case) for branch in av[1]]
+            if all(branch is not None for branch in branches):
+                required.append(("or", branches))
+        elif op == sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, sub_items = av
+            sub_ignore_case = (ignore_case or bool(add_flags & re.IGNORECASE)) and not (del_flags & re.IGNORECASE)
+            sub_plan = _plan_sequence(sub_items, sub_ignore_case)
+            if sub_plan is not None:
+                required.append(sub_plan)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT):
+            min_count, _, sub_items = av
+            if min_count >= 1:
+                sub_plan = _plan_sequence(sub_items, ignore_case)
+                if sub_plan is not None:
+                    required.append(sub_plan)
+        # Every other construct (classes, anchors, backreferences...) is unconstrained.
+    close_run()
+
+    if not required:
+        return None
+    return required[0] if len(required) == 1 else ("and", required)
+
+def build_trigram_query(pattern: re.Pattern) -> Optional[Tuple]:
+    """
+    Decomposes a compiled pattern into a trigram plan, or returns None if the
+    pattern has no required literals and must be answered with a full scan.
+    """
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    ignore_case = bool((pattern.flags | parsed.state.flags) & re.IGNORECASE)
+    return _plan_sequence(parsed, ignore_case)
+
+# 5. PER-SEARCH VIEW ############################################################################################
+class IndexedSearch:
+    """
+    Snapshot of the index for a single search: the stored file states below the
+    search path and the set of file ids that can possibly match the pattern.
+    """
+    def __init__(self, index: "ContentIndex", states: Dict[str, Tuple[int, int, float, bool]], candidates: Optional[Set[int]]):
+        self.index = index
+        self.states = states
+        self.candidates = candidates
+
+    def is_fresh(self, path: str, size: int, mtime: float) -> bool:
+        state = self.states.get(path)
+        return state is not None and state[1] == size and state[2] == mtime
+
+    def can_skip(self, path: str, size: int, mtime: float) -> bool:
+        """True when the index proves that a fresh, fully indexed file cannot match."""
+        if self.candidates is None:
+            return False
+        state = self.states.get(path)
+        if state is None or state[1] != size or state[2] != mtime or not state[3]:
+            return False
+        return state[0] not in self.candidates
+
+# 6. CONTENT INDEX CLASS ########################################################################################
+class ContentIndex:
+    """
+    Persistent trigram inverted index over the text files seen by content searches.
+    """
+    def __init__(self, db_file: str = CONTENT_INDEX_DB_FILE, max_file_size: int = DEFAULT_MAX_INDEXED_FILE_SIZE):
+        self.db_file = db_file
+        self.max_file_size = max_file_size
+        self._pending: List[Tuple[str, int, float, bool, Set[int]]] = []
+        self._pending_postings = 0
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        """Creates the index tables if they don't exist."""
+        try:
+            with sqlite3.connect(self.db_file) as conn:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS indexed_files (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        path TEXT NOT NULL UNIQUE,
+                        size INTEGER NOT NULL,
+                        mtime REAL NOT NULL,
+                        complete INTEGER NOT NULL
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS postings (
+                        trigram INTEGER NOT NULL,
+                        file_id INTEGER NOT NULL,
+                        PRIMARY KEY (trigram, file_id)
+                    ) WITHOUT ROWID
+                ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_postings_file ON postings (file_id)")
+                if cursor.execute("PRAGMA user_version").fetchone()[0] < INDEX_FORMAT_VERSION:
+                    cursor.execute("DELETE FROM postings")
+                    cursor.execute("DELETE FROM indexed_files")
+                    cursor.execute(f"PRAGMA user_version = {INDEX_FORMAT_VERSION}")
+                conn.commit()
+            logger.debug(f"Content index database initialized successfully at: {self.db_file}")
+        except Exception:
+            logger.exception("Failed to initialize the content index database.")
+
+    def prepare_search(self, search_path: str, pattern: re.Pattern) -> IndexedSearch:
+        """Loads the file states below `search_path` and evaluates the pattern's trigram plan."""
+        plan = build_trigram_query(pattern)
+        prefix = os.path.join(os.path.abspath(search_path), "")
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        with sqlite3.connect(self.db_file, timeout=30) as conn:
+            rows = conn.execute(
+                "SELECT path, id, size, mtime, complete FROM indexed_files WHERE path >= ? AND path < ?", (prefix, upper)
+            ).fetchall()
+            states = {path: (file_id, size, mtime, bool(complete)) for path, file_id, size, mtime, complete in rows}
+            candidates = self._evaluate(conn, plan) if plan is not None else None
+
+        if plan is None:
+            logger.debug("Pattern cannot be decomposed into trigrams; the content index will not narrow this search.")
+        else:
+            logger.debug(f"Content index narrowed the search to {len(candidates)} candidate files.")
+        return IndexedSearch(self, states, candidates)
+
+    def _evaluate(self, conn: sqlite3.Connection, plan: Optional[Tuple]) -> Optional[Set[int]]:
+        """Evaluates a plan to a set of file ids; None means every file is a candidate."""
+        if plan is None:
+            return None
+        kind, children = plan
+        if kind == "lit":
+            result = None
+            for trigram in sorted(set(children))[:MAX_TRIGRAMS_PER_LITERAL]:
+                ids = {row[0] for row in conn.execute("SELECT file_id FROM postings WHERE trigram = ?", (trigram,))}
+                result = ids if result is None else result & ids
+                if not result:
+                    break
+            return result
+        sets = [self._evaluate(conn, child) for child in children]
+        if kind == "and":
+            constrained = [s for s in sets if s is not None]
+            if not constrained:
+                return None
+            return set.intersection(*sorted(constrained, key=len))
+        if any(s is None for s in sets):
+            return None
+        return set().union(*sets)
+
+    def index_file(self, path: str, size: int, mtime: float) -> Optional[str]:
+        """
+        Reads a text file once, queues its trigrams for indexing and returns the
+        decoded text so the caller can match it without a second read. Files that
+        are too large or binary are recorded as unindexed and None is returned.
+        """
+        try:
+            text = read_indexable_text(path, size, self.max_file_size)
+        except OSError as e:
+            logger.debug(f"Could not read '{path}' for the content index: {e}")
+            return None
+        self.record(path, size, mtime, None if text is None else text_trigrams(text))
+        return text
+
+    def record(self, path: str, size: int, mtime: float, trigrams: Optional[Set[int]]):
+        """Queues an index update for a file read elsewhere; None records it as unindexed."""
+        self._queue(path, size, mtime, trigrams is not None, trigrams or set())
+
+    def _queue(self, path: str, size: int, mtime: float, complete: bool, trigrams: Set[int]):
+        with self._pending_lock:
+            self._pending.append((path, size, mtime, complete, trigrams))
+            self._pending_postings += len(trigrams)
+            should_flush = self._pending_postings >= FLUSH_THRESHOLD
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Writes all queued index updates in a single transaction."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+            self._pending_postings = 0
+        if not pending:
+            return
+
+        with self._write_lock:
+            try:
+                with sqlite3.connect(self.db_file, timeout=30) as conn:
+                    cursor = conn.cursor()
+                    for path, size, mtime, complete, trigrams in pending:
+                        row = cursor.execute("SELECT id FROM indexed_files WHERE path = ?", (path,)).fetchone()
+                        if row:
+                            file_id = row[0]
+                            cursor.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                            cursor.execute(
+                                "UPDATE indexed_files SET size = ?, mtime = ?, complete = ? WHERE id = ?",
+                                (size, mtime, int(complete), file_id)
+                            )
+                        else:
+                            cursor.execute(
+                                "INSERT INTO indexed_files (path, size, mtime, complete) VALUES (?, ?, ?, ?)",
+                                (path, size, mtime, int(complete))
+                            )
+                            file_id = cursor.lastrowid
+                        cursor.executemany(
+                            "INSERT OR IGNORE INTO postings (trigram, file_id) VALUES (?, ?)",
+                            ((trigram, file_id) for trigram in trigrams)
+                        )
+                    conn.commit()
+                logger.debug(f"Content index updated with {len(pending)} files.")
+            except Exception:
+                logger.exception("Failed to write updates to the content index.")
+
+# 7. SINGLETON ACCESS ###########################################################################################
+def get_content_index(max_file_size: int = DEFAULT_MAX_INDEXED_FILE_SIZE) -> ContentIndex:
+    """Returns the process-wide content index using a singleton pattern."""
+    global _CONTENT_INDEX
+    if _CONTENT_INDEX is None:
+        _CONTENT_INDEX = ContentIndex(max_file_size=max_file_size)
+    return _CONTENT_INDEX
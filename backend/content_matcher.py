@@ -0,0 +1,407 @@
+# backend/content_matcher.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Bytes-level content matching for `file_content` searches.
+
+Decoding every file to text before running the search regex costs far more
+than the search itself. `ContentMatcher` works on raw bytes instead:
+
+-   **Literal Prefilter:** Plain (non-regex) keywords are searched with
+    `bytes.find`, which runs at memory speed. Case-insensitive ASCII keywords
+    are matched against an ASCII-lowercased copy of the data.
+-   **Bytes Regex:** Regex keywords are compiled to a bytes pattern and run
+    over the whole file at once, so matches can no longer be missed at chunk
+    boundaries and no strings are concatenated.
+-   **Memory Mapping:** Files above `MMAP_THRESHOLD` are memory-mapped instead
+    of read, letting the OS page data in on demand.
+-   **Text Fallback:** Files with a UTF-16/UTF-32 byte-order mark, and
+    patterns whose semantics differ between bytes and text (non-ASCII regexes
+    or case-insensitive non-ASCII keywords), use the chunked text decoder.
+-   **Keyword Automaton:** Large lists of plain keywords (at least
+    `AUTOMATON_KEYWORD_THRESHOLD`) are matched with an Aho-Corasick automaton
+    instead of one `find` per keyword, and the matched keywords are reported.
+-   **Match Snippets:** When requested, the first N matching lines (line
+    number, offset and surrounding text) are collected from the same buffer
+    or decoded chunks the match ran on, so files are never read twice.
+-   **Binary Sniffing (`is_binary_block`):** The first block of every file is
+    checked for NUL bytes and a high ratio of control characters. Binary
+    files are either skipped before the rest of the file is read, or searched
+    with the raw bytes matcher only, never through the text decoder.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import codecs
+import mmap
+import re
+import logging
+from re import _parser as sre_parse
+from re import _constants as sre_constants
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .keyword_automaton import KeywordAutomaton
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 256 * 1024  # 256 KB
+# Window size used when a memory-mapped file has to be lowercased piecewise.
+LOWERCASE_WINDOW = 4 * 1024 * 1024  # 4 MB
+# Size of the leading block used to decide whether a file is binary.
+BINARY_SNIFF_SIZE = 8 * 1024  # 8 KB
+# Share of non-text control bytes above which a block is considered binary.
+BINARY_CONTROL_RATIO = 0.30
+# Number of plain keywords from which the Aho-Corasick automaton replaces per-keyword scans.
+AUTOMATON_KEYWORD_THRESHOLD = 200
+# Characters of context kept on each side of a match in a snippet.
+SNIPPET_CONTEXT_CHARS = 80
+# Chunk size and overlap for the text-decoder fallback.
+TEXT_CHUNK_SIZE = 32 * 1024  # 32 KB
+TEXT_CHUNK_OVERLAP = 1024
+
+_NON_UTF8_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+# Bytes that commonly occur in text: printable ASCII, all high bytes, and \a \b \t \n \f \r ESC.
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+
+class FileMatch(NamedTuple):
+    """
+    Outcome of matching one file. `keywords` is only set when the automaton is in
+    use, `snippets` only when snippets were requested and the file is text.
+    """
+    matched: bool
+    is_binary: bool = False
+    keywords: Optional[List[str]] = None
+    snippets: Optional[List[Dict[str, Any]]] = None
+
+NO_MATCH = FileMatch(False)
+
+# 3. HELPER FUNCTIONS ###########################################################################################
+def is_binary_block(block: bytes) -> bool:
+    """
+    Classifies the leading block of a file. A NUL byte, or more than
+    `BINARY_CONTROL_RATIO` of non-text control bytes, marks the file as binary.
+    Blocks with a UTF-16/UTF-32 byte-order mark are always text.
+    """
+    if not block or detect_non_utf8_encoding(block[:4]):
+        return False
+    if b'\x00' in block:
+        return True
+    control_bytes = len(block.translate(None, _TEXT_BYTES))
+    return control_bytes / len(block) > BINARY_CONTROL_RATIO
+
+def detect_non_utf8_encoding(head: bytes) -> Optional[str]:
+    """Returns the codec for a UTF-16/UTF-32 byte-order mark, or None for UTF-8 compatible data."""
+    for bom, encoding in _NON_UTF8_BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+def is_bytes_safe_pattern(pattern: re.Pattern) -> bool:
+    """
+    True if matching the UTF-8 bytes of a text gives the same result as
+    matching the text. Constructs that match one character (`.`, negated
+    classes, `\\w`/`\\d`/`\\s` categories, word boundaries) would match one
+    byte of a multi-byte character in bytes mode, so they make a pattern unsafe,
+    as do literals outside ASCII.
+    """
+    def safe(parsed) -> bool:
+        for op, av in parsed:
+            if op is sre_constants.LITERAL:
+                if av >= 0x80:
+                    return False
+            elif op is sre_constants.IN:
+                for item_op, item_av in av:
+                    if item_op is sre_constants.LITERAL and item_av < 0x80:
+                        continue
+                    if item_op is sre_constants.RANGE and item_av[1] < 0x80:
+                        continue
+                    return False
+            elif op is sre_constants.AT:
+                if av in (sre_constants.AT_BOUNDARY, sre_constants.AT_NON_BOUNDARY):
+                    return False
+            elif op in _REPEATS:
+                if not safe(av[2]):
+                    return False
+            elif op is sre_constants.SUBPATTERN:
+                if not safe(av[-1]):
+                    return False
+            elif op is sre_constants.BRANCH:
+                if not all(safe(branch) for branch in av[1]):
+                    return False
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                if not safe(av[1]):
+                    return False
+            elif op is sre_constants.ATOMIC_GROUP:
+                if not safe(av):
+                    return False
+            elif op is sre_constants.GROUPREF_EXISTS:
+                if not safe(av[1]) or (av[2] is not None and not safe(av[2])):
+                    return False
+            elif op is not sre_constants.GROUPREF:
+                return False
+        return True
+
+    if not pattern.pattern.isascii():
+        return False
+    try:
+        return safe(sre_parse.parse(pattern.pattern, pattern.flags))
+    except (re.error, RecursionError, ValueError):
+        return False
+
+def _snippet_at(buffer, start: int, end: int, line_number: int, offset: int) -> Dict[str, Any]:
+    """
+    Builds a snippet for the match at `buffer[start:end]` (bytes, mmap or str):
+    the match plus up to `SNIPPET_CONTEXT_CHARS` of its line on either side.
+    """
+    newline = '\n' if isinstance(buffer, str) else b'\n'
+    line_start = buffer.rfind(newline, 0, start) + 1
+    line_end = buffer.find(newline, end)
+    if line_end == -1:
+        line_end = len(buffer)
+    end = min(end, start + 2 * SNIPPET_CONTEXT_CHARS)
+    parts = (
+        buffer[max(line_start, start - SNIPPET_CONTEXT_CHARS):start],
+        buffer[start:end],
+        buffer[end:max(end, min(line_end, end + SNIPPET_CONTEXT_CHARS))],
+    )
+    if not isinstance(buffer, str):
+        parts = tuple(part.decode('utf-8', errors='replace') for part in parts)
+    before, match, after = parts
+    return {"line": line_number, "offset": offset, "before": before, "match": match, "after": after.rstrip('\r')}
+
+def collect_snippets(buffer, pattern: re.Pattern, limit: int) -> List[Dict[str, Any]]:
+    """
+    Returns snippets for the first `limit` lines of an in-memory or memory-mapped
+    buffer that contain a match. Offsets are positions in the buffer.
+    """
+    newline = '\n' if isinstance(buffer, str) else b'\n'
+    snippets: List[Dict[str, Any]] = []
+    line_number, counted_to, line_end = 1, 0, -1
+    for match in pattern.finditer(buffer):
+        start = match.start()
+        if start <= line_end:
+            continue  # Same line as the previous snippet.
+        line_number += buffer[counted_to:start].count(newline)
+        counted_to = start
+        snippets.append(_snippet_at(buffer, start, match.end(), line_number, start))
+        line_end = buffer.find(newline, match.end())
+        if len(snippets) >= limit or line_end == -1:
+            break
+    return snippets
+
+def _match_text_chunked(file_path: str, pattern: re.Pattern, encoding: str = 'utf-8',
+                        max_snippets: int = 0) -> Tuple[bool, List[Dict[str, Any]]]:
+    """
+    Reads a file through the text decoder in chunks and checks whether any chunk
+    (plus the tail of the previous one) matches the regex pattern. Snippets are
+    collected in the same pass; their offsets are character offsets.
+    """
+    snippets: List[Dict[str, Any]] = []
+    matched = False
+    try:
+        with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
+            tail = ""
+            chars_read = newlines_read = 0
+            line_end = -1  # Absolute end of the last line a snippet was taken from.
+            while chunk := f.read(TEXT_CHUNK_SIZE):
+                window = tail + chunk if tail else chunk
+                window_start = chars_read - len(tail)
+                lines_before = newlines_read - tail.count('\n')
+                for match in pattern.finditer(window):
+                    matched = True
+                    if not max_snippets:
+                        return True, snippets
+                    start = window_start + match.start()
+                    if start <= line_end:
+                        continue
+                    line_number = lines_before + window.count('\n', 0, match.start()) + 1
+                    snippets.append(_snippet_at(window, match.start(), match.end(), line_number, start))
+                    if len(snippets) >= max_snippets:
+                        return True, snippets
+                    next_newline = window.find('\n', match.end())
+                    line_end = window_start + (next_newline if next_newline != -1 else len(window))
+                chars_read += len(chunk)
+                newlines_read += chunk.count('\n')
+                tail = chunk[-TEXT_CHUNK_OVERLAP:]
+    except Exception as e:
+        logger.debug(f"Could not read content from {file_path}: {e}")
+    return matched, snippets
+
+# 4. CONTENT MATCHER CLASS ######################################################################################
+class ContentMatcher:
+    """
+    Matches file contents against the search keywords, preferring raw-bytes
+    strategies and falling back to the text decoder only when required.
+    """
+    def __init__(self, keywords: List[str], use_regex: bool, case_sensitive: bool, text_pattern: re.Pattern,
+                 use_automaton: Optional[bool] = None, max_snippets: int = 0):
+        self.text_pattern = text_pattern
+        self.case_sensitive = case_sensitive
+        self.max_snippets = max(0, max_snippets)
+        self.literals: Optional[List[bytes]] = None
+        self.bytes_pattern: Optional[re.Pattern] = None
+        self.automaton: Optional[KeywordAutomaton] = None
+        self._raw_bytes_pattern: Optional[re.Pattern] = None
+        self._literals_pattern: Optional[re.Pattern] = None
+
+        if not use_regex and (case_sensitive or all(k.isascii() for k in keywords)):
+            encoded = [k.encode('utf-8') for k in keywords]
+            self.literals = encoded if case_sensitive else [k.lower() for k in encoded]
+            if use_automaton is None:
+                use_automaton = len(self.literals) >= AUTOMATON_KEYWORD_THRESHOLD
+            if use_automaton:
+                self.automaton = KeywordAutomaton(self.literals)
+                self._keyword_names = list(keywords)
+        elif is_bytes_safe_pattern(text_pattern):
+            # Bytes patterns reject the UNICODE flag that every str pattern carries.
+            self.bytes_pattern = re.compile(text_pattern.pattern.encode('utf-8'), text_pattern.flags & ~re.UNICODE)
+
+    @property
+    def uses_bytes(self) -> bool:
+        return self.literals is not None or self.bytes_pattern is not None
+
+    def matches_text(self, text: str) -> bool:
+        return self.text_pattern.search(text) is not None
+
+    def match_text(self, text: str) -> FileMatch:
+        """Matches already-decoded text, reporting keywords and snippets as configured."""
+        if self.automaton is not None:
+            match = self._match_automaton(text.encode('utf-8'))
+            if match.matched and self.max_snippets:
+                match = match._replace(snippets=collect_snippets(text, self._keywords_pattern(match.keywords), self.max_snippets))
+            return match
+        if not self.max_snippets:
+            return FileMatch(self.matches_text(text))
+        snippets = collect_snippets(text, self.text_pattern, self.max_snippets)
+        return FileMatch(bool(snippets), snippets=snippets or None)
+
+    def matches_bytes(self, data) -> bool:
+        """Searches a bytes-like object or an mmap for the keywords."""
+        if self.literals is None:
+            return self.bytes_pattern.search(data) is not None
+        if self.case_sensitive:
+            return any(data.find(literal) != -1 for literal in self.literals)
+        if isinstance(data, bytes):
+            lowered = data.lower()
+            return any(lowered.find(literal) != -1 for literal in self.literals)
+
+        # Lowercase a memory-mapped file piecewise, overlapping windows by the longest keyword.
+        return any(
+            any(window.find(literal) != -1 for literal in self.literals)
+            for window in self._lowered_windows(data)
+        )
+
+    def match_file(self, file_path: str, size: int, skip_binary: bool = True) -> FileMatch:
+        """
+        Checks whether a file's contents match. The first block is sniffed before
+        anything else is read; binary files are skipped when `skip_binary` is set
+        and searched as raw bytes otherwise. Small files are read at once, large
+        ones are memory-mapped, and non-UTF-8 text files use the text decoder.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(BINARY_SNIFF_SIZE)
+                is_binary = is_binary_block(head)
+                if is_binary and skip_binary:
+                    return FileMatch(False, True)
+
+                encoding = None if is_binary else detect_non_utf8_encoding(head[:4])
+                if encoding or (not self.uses_bytes and not is_binary):
+                    matched, snippets = _match_text_chunked(file_path, self.text_pattern, encoding or 'utf-8', self.max_snippets)
+                    return FileMatch(matched, snippets=snippets or None)
+
+                # Binary data never goes through the text decoder; it is searched as raw bytes.
+                if size < MMAP_THRESHOLD:
+                    return self._match_data(self._read_rest(f, head), is_binary)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._match_data(mm, is_binary)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read content from {file_path}: {e}")
+            return NO_MATCH
+
+    def _match_data(self, data, is_binary: bool) -> FileMatch:
+        if self.automaton is not None:
+            match = self._match_automaton(data)._replace(is_binary=is_binary)
+            if match.matched and self.max_snippets and not is_binary:
+                keywords_pattern = self._keywords_pattern(match.keywords, as_bytes=True)
+                match = match._replace(snippets=collect_snippets(data, keywords_pattern, self.max_snippets))
+            return match
+
+        if self.uses_bytes:
+            matched = self.matches_bytes(data)
+            snippet_pattern = self.bytes_pattern or self._literals_pattern
+        else:
+            matched = self._matches_raw_bytes(data)
+            snippet_pattern = self._raw_bytes_pattern
+        if not (matched and self.max_snippets and not is_binary):
+            return FileMatch(matched, is_binary)
+        if snippet_pattern is None:
+            snippet_pattern = self._literals_pattern = self._keywords_pattern(self.literals, as_bytes=True)
+        return FileMatch(matched, is_binary, snippets=collect_snippets(data, snippet_pattern, self.max_snippets))
+
+    def _keywords_pattern(self, keywords: List, as_bytes: bool = False) -> re.Pattern:
+        """Compiles an alternation of literal keywords, used only to locate snippets."""
+        if as_bytes:
+            keywords = [k if isinstance(k, bytes) else k.encode('utf-8') for k in keywords]
+        return re.compile((b'|' if as_bytes else '|').join(map(re.escape, keywords)), 0 if self.case_sensitive else re.IGNORECASE)
+
+    def _match_automaton(self, data) -> FileMatch:
+        """Runs the keyword automaton over the data and reports every keyword found."""
+        found = set()
+        if isinstance(data, bytes) and (self.case_sensitive or len(data) <= LOWERCASE_WINDOW):
+            found = self.automaton.find_all(data if self.case_sensitive else data.lower())
+        else:
+            windows = self._lowered_windows(data) if not self.case_sensitive else self._windows(data)
+            for window in windows:
+                found |= self.automaton.find_all(window)
+                if len(found) == len(self.literals):
+                    break
+        if not found:
+            return NO_MATCH
+        return FileMatch(True, keywords=[self._keyword_names[i] for i in sorted(found)])
+
+    def _windows(self, data):
+        """Yields `LOWERCASE_WINDOW`-sized slices that overlap by the longest keyword."""
+        overlap = max((len(literal) for literal in self.literals), default=1) - 1
+        start, size = 0, len(data)
+        while start < size:
+            yield data[start:start + LOWERCASE_WINDOW]
+            if start + LOWERCASE_WINDOW >= size:
+                break
+            start += LOWERCASE_WINDOW - overlap
+
+    def _lowered_windows(self, data):
+        for window in self._windows(data):
+            yield window.lower()
+
+    @staticmethod
+    def _read_rest(f, head: bytes) -> bytes:
+        return head + f.read() if len(head) == BINARY_SNIFF_SIZE else head
+
+    def _matches_raw_bytes(self, data) -> bool:
+        """Searches binary data with the bytes form of a pattern that has no exact bytes equivalent."""
+        if self._raw_bytes_pattern is None:
+            self._raw_bytes_pattern = re.compile(self.text_pattern.pattern.encode('utf-8'), self.text_pattern.flags & ~re.UNICODE)
+        return self._raw_bytes_pattern.search(data) is not None
+
+# 5. MODULE HELPERS #############################################################################################
+def sniff_binary(file_path: str) -> bool:
+    """Reads only the first block of a file and classifies it as binary or text."""
+    try:
+        with open(file_path, 'rb') as f:
+            return is_binary_block(f.read(BINARY_SNIFF_SIZE))
+    except OSError:
+        return False
@@ -0,0 +1,201 @@
+# backend/embedding_cache.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Persistent cache of chunk embeddings for semantic indexing.
+
+Embedding is the most expensive step of semantic indexing, and most of the
+chunks of a re-indexed file are usually the same text as before (an edited
+footer, a touch from a backup tool, a chunk that merely moved). `EmbeddingCache`
+remembers the vector of every chunk it has seen:
+
+-   **Content Keys:** Vectors are stored in SQLite (`embedding_cache.db`) under
+    the embedding model's name and the BLAKE2b hash of the chunk text, so any
+    chunk whose text was embedded before never reaches the model again.
+-   **Model Invalidation:** The cache records the model it was filled with and
+    is emptied as soon as it is opened with a different `embedding_model.model_name`.
+-   **Compact Storage:** Vectors are stored as packed float32 arrays.
+-   **LRU Eviction:** Entries remember when they were last used; once the
+    stored vectors exceed `embedding_model.cache_max_mb`, the least recently
+    used ones are evicted.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+import logging
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from .config_manager import get_config, DATA_FOLDER
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_DB_FILE = os.path.join(DATA_FOLDER, "embedding_cache.db")
+
+DEFAULT_CACHE_MAX_MB = 512
+# Eviction trims the cache to this fraction of its limit, so it does not run on every insert.
+EVICTION_TARGET_RATIO = 0.9
+# A cache hit refreshes the entry's LRU timestamp at most this often.
+TOUCH_INTERVAL = 300  # seconds
+# Hashes per lookup query, well below SQLite's bound-parameter limit.
+LOOKUP_BATCH_SIZE = 500
+
+_EMBEDDING_CACHE: Optional["EmbeddingCache"] = None
+
+def hash_chunk(text: str) -> str:
+    """Returns the cache key for a chunk's text."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=20).hexdigest()
+
+# 3. EMBEDDING CACHE CLASS ######################################################################################
+class EmbeddingCache:
+    """
+    Persistent cache of chunk vectors for one embedding model, with LRU
+    eviction. Safe to use from several threads at once.
+    """
+    def __init__(self, model_name: str, db_file: str = EMBEDDING_CACHE_DB_FILE,
+                 max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        self.model_name = model_name
+        self.db_file = db_file
+        self.max_bytes = max_bytes
+        self._write_lock = threading.Lock()
+        self._stored_bytes = 0
+        self._init_db()
+
+    def _init_db(self):
+        """Creates the cache tables if they don't exist and drops vectors of any other model."""
+        try:
+            with sqlite3.connect(self.db_file) as conn:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        model_name TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        last_used REAL NOT NULL,
+                        PRIMARY KEY (model_name, content_hash)
+                    )
+                ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+                cursor.execute("CREATE TABLE IF NOT EXISTS cache_info (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                row = cursor.execute("SELECT value FROM cache_info WHERE key = 'model_name'").fetchone()
+                if row is None or row[0] != self.model_name:
+                    if row is not None:
+                        logger.info(f"Embedding model changed from '{row[0]}' to '{self.model_name}'; clearing the embedding cache.")
+                    cursor.execute("DELETE FROM embeddings")
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO cache_info (key, value) VALUES ('model_name', ?)", (self.model_name,)
+                    )
+                conn.commit()
+                self._stored_bytes = cursor.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+                if row is not None and row[0] != self.model_name:
+                    conn.execute("VACUUM")
+            logger.debug(f"Embedding cache initialized successfully at: {self.db_file}")
+        except Exception:
+            logger.exception("Failed to initialize the embedding cache database.")
+
+    def lookup(self, content_hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """Returns the cached vectors of the given chunk hashes; misses are simply absent."""
+        found: Dict[str, List[float]] = {}
+        stale = []
+        touch_before = time.time() - TOUCH_INTERVAL
+        unique = list(dict.fromkeys(content_hashes))
+        try:
+            with sqlite3.connect(self.db_file, timeout=30) as conn:
+                for start in range(0, len(unique), LOOKUP_BATCH_SIZE):
+                    part = unique[start:start + LOOKUP_BATCH_SIZE]
+                    rows = conn.execute(
+                        f"SELECT content_hash, vector, last_used FROM embeddings "
+                        f"WHERE model_name = ? AND content_hash IN ({','.join('?' * len(part))})",
+                        (self.model_name, *part)
+                    )
+                    for content_hash, blob, last_used in rows:
+                        found[content_hash] = array('f', blob).tolist()
+                        if last_used < touch_before:
+                            stale.append((time.time(), self.model_name, content_hash))
+                if stale:
+                    with self._write_lock:
+                        conn.executemany(
+                            "UPDATE embeddings SET last_used = ? WHERE model_name = ? AND content_hash = ?", stale
+                        )
+                        conn.commit()
+        except sqlite3.Error:
+            logger.warning("Embedding cache lookup failed.", exc_info=True)
+        return found
+
+    def store(self, vectors: Dict[str, Sequence[float]]):
+        """Stores the vectors of the given chunk hashes, evicting old entries if the cache is full."""
+        if not vectors:
+            return
+        now = time.time()
+        rows = [(self.model_name, content_hash, array('f', vector).tobytes(), now) for content_hash, vector in vectors.items()]
+        with self._write_lock:
+            try:
+                with sqlite3.connect(self.db_file, timeout=30) as conn:
+                    before = conn.total_changes
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO embeddings (model_name, content_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                        rows
+                    )
+                    # All vectors of one model have the same size.
+                    self._stored_bytes += (conn.total_changes - before) * len(rows[0][2])
+                    conn.commit()
+                    if self._stored_bytes > self.max_bytes:
+                        self._evict(conn)
+            except sqlite3.Error:
+                logger.warning("Could not store vectors in the embedding cache.", exc_info=True)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Deletes least recently used vectors until the cache is below its target size. Holds the write lock."""
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+        evicted = []
+        for content_hash, size in conn.execute(
+            "SELECT content_hash, LENGTH(vector) FROM embeddings WHERE model_name = ? ORDER BY last_used", (self.model_name,)
+        ):
+            if total <= target:
+                break
+            evicted.append((self.model_name, content_hash))
+            total -= size
+        conn.executemany("DELETE FROM embeddings WHERE model_name = ? AND content_hash = ?", evicted)
+        conn.commit()
+        self._stored_bytes = total
+        logger.info(f"Evicted {len(evicted)} entries from the embedding cache.")
+
+    def embed_documents(self, embeddings: Any, texts: List[str]) -> List[List[float]]:
+        """
+        Returns one vector per text, in order. Only texts whose hash is not in
+        the cache are passed to `embeddings.embed_documents`, each at most once.
+        """
+        hashes = [hash_chunk(text) for text in texts]
+        vectors = self.lookup(hashes)
+        missing = {content_hash: text for content_hash, text in zip(hashes, texts) if content_hash not in vectors}
+        if missing:
+            new_vectors = dict(zip(missing, embeddings.embed_documents(list(missing.values()))))
+            self.store(new_vectors)
+            vectors.update(new_vectors)
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)} of {len(texts)} chunks served from the cache.")
+        return [vectors[content_hash] for content_hash in hashes]
+
+# 4. SINGLETON ACCESS ###########################################################################################
+def get_embedding_cache(model_name: str) -> EmbeddingCache:
+    """
+    Returns the process-wide embedding cache for `model_name` using a
+    singleton pattern; asking for another model re-opens (and so clears) it.
+    """
+    global _EMBEDDING_CACHE
+    if _EMBEDDING_CACHE is None or _EMBEDDING_CACHE.model_name != model_name:
+        params = get_config("embedding_model") or {}
+        _EMBEDDING_CACHE = EmbeddingCache(
+            model_name, max_bytes=int(params.get("cache_max_mb", DEFAULT_CACHE_MAX_MB) * 1024 * 1024)
+        )
+    return _EMBEDDING_CACHE
@@ -0,0 +1,459 @@
+# backend/file_catalog.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Maintains a persistent catalog of file-system metadata for classic searches.
+
+Walking a large directory tree is by far the most expensive part of a name,
+extension, category or folder search. This module keeps an SQLite catalog
+(`file_catalog.db`) of every file and directory below the roots that have been
+searched before, so that later searches can be answered with a single indexed
+query instead of a fresh walk.
+
+How it works:
+-   **Scoped Roots:** Each catalogued root is stored together with its "scope"
+    (the excluded folder names and the dot-folder setting it was built with).
+    A search can only be served by a root with an identical scope that
+    contains the search path.
+-   **Incremental Refresh (`refresh`):** Adding, removing or renaming an entry
+    updates its parent directory's modification time. A refresh therefore
+    performs one `stat()` per directory and only re-lists the directories whose
+    mtime changed, deleting the subtrees of directories that disappeared. A
+    refresh can be limited to one subtree of a root.
+-   **Fresh Answers (`prepare_search`):** Before a search reads the catalog,
+    the searched subtree is refreshed. If a refresh covering it is already
+    running, the search waits for that one instead of starting another, and
+    a subtree refreshed moments ago is not checked again.
+-   **Live Metadata:** File sizes and mtimes in the catalog are not updated
+    when a file is edited in place (its directory's mtime does not change),
+    so callers must filter on a fresh `stat()` rather than on stored values.
+-   **Symbolic Links:** Like the disk walk, the catalog lists symlinked
+    directories (they can match folder searches) but never descends into
+    them. Search paths that pass through such a link are not served from the
+    catalog.
+-   **Cold Fallback:** Until a root's first refresh has completed it is
+    considered "cold" and callers fall back to walking the disk themselves,
+    while `schedule_refresh` builds the catalog in a background thread.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from typing import Iterable, Iterator, Optional, Set, Tuple, Dict, List
+
+from .config_manager import DATA_FOLDER
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+CATALOG_DB_FILE = os.path.join(DATA_FOLDER, "file_catalog.db")
+
+# Number of directories written between commits during a refresh.
+REFRESH_COMMIT_INTERVAL = 500
+# Number of rows pulled from SQLite per round-trip when iterating the catalog.
+QUERY_FETCH_SIZE = 5000
+# A subtree refreshed less than this many seconds ago is searched without another refresh, so bursts of
+# searches stat each directory once; entries created within the window may be missed until it ends.
+SEARCH_FRESHNESS_WINDOW = 1.0
+
+_FILE_CATALOG: Optional["FileCatalog"] = None
+
+# 3. HELPER FUNCTIONS ###########################################################################################
+def _is_pruned(name: str, excluded_folders: Set[str], include_dot_folders: bool) -> bool:
+    """Applies the same directory pruning rule as the classic `os.walk` searches."""
+    return name in excluded_folders or (not include_dot_folders and name.startswith('.'))
+
+def _prefix_bounds(path: str) -> Tuple[str, str]:
+    """
+    Returns the half-open string range [lower, upper) that contains every path
+    strictly below `path`, so subtree lookups can use the primary-key index.
+    """
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+def _is_within(path: str, root: str) -> bool:
+    """Checks whether `path` is `root` itself or located below it."""
+    if path == root:
+        return True
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    return path.startswith(prefix)
+
+# 4. FILE CATALOG CLASS #########################################################################################
+class FileCatalog:
+    """
+    Persistent, incrementally refreshed catalog of files and directories.
+    """
+    def __init__(self, db_file: str = CATALOG_DB_FILE):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._active_refreshes: Dict[Tuple[str, str], threading.Event] = {}
+        self._finished_refreshes: Dict[Tuple[str, str], float] = {}
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self):
+        """Creates the catalog tables and indexes if they don't exist."""
+        try:
+            with sqlite3.connect(self.db_file) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS catalog_roots (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        root TEXT NOT NULL,
+                        scope TEXT NOT NULL,
+                        refreshed_at REAL,
+                        UNIQUE (root, scope)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS directories (
+                        root_id INTEGER NOT NULL,
+                        path TEXT NOT NULL,
+                        parent TEXT,
+                        name TEXT NOT NULL,
+                        mtime REAL NOT NULL,
+                        is_link INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (root_id, path)
+                    ) WITHOUT ROWID
+                ''')
+                columns = {row[1] for row in cursor.execute("PRAGMA table_info(directories)")}
+                if "is_link" not in columns:
+                    cursor.execute("ALTER TABLE directories ADD COLUMN is_link INTEGER NOT NULL DEFAULT 0")
+                    # Older catalogs skipped symlinked directories; force every directory to be re-listed once.
+                    cursor.execute("UPDATE directories SET mtime = -1")
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS files (
+                        root_id INTEGER NOT NULL,
+                        path TEXT NOT NULL,
+                        dir TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        extension TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        mtime REAL NOT NULL,
+                        inode INTEGER,
+                        PRIMARY KEY (root_id, path)
+                    ) WITHOUT ROWID
+                ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_dir ON files (root_id, dir)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_extension ON files (root_id, extension)")
+                conn.commit()
+            logger.debug(f"File catalog database initialized successfully at: {self.db_file}")
+        except Exception:
+            logger.exception("Failed to initialize the file catalog database.")
+
+    @staticmethod
+    def scope_key(excluded_folders: Iterable[str], include_dot_folders: bool) -> str:
+        """Serializes the pruning settings a catalog root was built with."""
+        return json.dumps({"excluded_folders": sorted(excluded_folders), "include_dot_folders": bool(include_dot_folders)})
+
+    # --- Lookup ---------------------------------------------------------------------------------------------------
+    def find_root(self, search_path: str, excluded_folders: Set[str], include_dot_folders: bool) -> Optional[Tuple[int, str, float]]:
+        """
+        Returns `(root_id, root, refreshed_at)` for a warm catalog root that covers
+        `search_path` under the given scope, or None if the catalog is cold.
+        """
+        search_path = os.path.abspath(search_path)
+        scope = self.scope_key(excluded_folders, include_dot_folders)
+        try:
+            with sqlite3.connect(self.db_file, timeout=30) as conn:
+                rows = conn.execute(
+                    "SELECT id, root, refreshed_at FROM catalog_roots WHERE scope = ? AND refreshed_at IS NOT NULL", (scope,)
+                ).fetchall()
+        except sqlite3.Error:
+            logger.warning("Could not read catalog roots; falling back to a disk walk.", exc_info=True)
+            return None
+
+        for root_id, root, refreshed_at in sorted(rows, key=lambda r: len(r[1]), reverse=True):
+            if not _is_within(search_path, root):
+                continue
+            # A search path inside a pruned folder was never catalogued under this root.
+            relative_parts = os.path.relpath(search_path, root).split(os.sep) if search_path != root else []
+            if any(_is_pruned(part, excluded_folders, include_dot_folders) for part in relative_parts):
+                continue
+            # Nor was anything below a symlinked directory.
+            if any(os.path.islink(os.path.join(root, *relative_parts[:depth])) for depth in range(1, len(relative_parts) + 1)):
+                continue
+            return root_id, root, refreshed_at
+        return None
+
+    def iter_files(
+        self, root_id: int, search_path: str, extensions: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, str, int, float]]:
+        """
+        Yields `(path, name, size, mtime)` for every catalogued file below
+        `search_path`, with the extension filter pushed down into SQL. The size
+        and mtime are those of the last listing and may be stale.
+        """
+        lower, upper = _prefix_bounds(os.path.abspath(search_path))
+        query = "SELECT path, name, size, mtime FROM files WHERE root_id = ? AND path >= ? AND path < ?"
+        params: List = [root_id, lower, upper]
+        if extensions:
+            extensions = list(extensions)
+            query += f" AND extension IN ({','.join('?' for _ in extensions)})"
+            params.extend(ext.lower() for ext in extensions)
+        yield from self._iter_query(query, params)
+
+    def iter_directories(self, root_id: int, search_path: str) -> Iterator[Tuple[str, str, float]]:
+        """Yields `(path, name, mtime)` for every catalogued directory below `search_path`."""
+        lower, upper = _prefix_bounds(os.path.abspath(search_path))
+        yield from self._iter_query(
+            "SELECT path, name, mtime FROM directories WHERE root_id = ? AND path >= ? AND path < ?",
+            [root_id, lower, upper]
+        )
+
+    def _iter_query(self, query: str, params: List) -> Iterator[Tuple]:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            cursor = conn.execute(query, params)
+            while rows := cursor.fetchmany(QUERY_FETCH_SIZE):
+                yield from rows
+        finally:
+            conn.close()
+
+    def prepare_search(self, search_path: str, excluded_folders: Set[str], include_dot_folders: bool) -> Optional[Tuple[int, str]]:
+        """
+        Returns `(root_id, root)` of the warm root covering `search_path` once the
+        catalog below `search_path` is up to date, or None if the caller should
+        walk the disk instead. A refresh already running for the subtree (or a
+        directory above it) is waited for rather than duplicated.
+        """
+        covering = self.find_root(search_path, excluded_folders, include_dot_folders)
+        if covering is None:
+            return None
+        root_id, root, _ = covering
+        search_path = os.path.abspath(search_path)
+        scope = self.scope_key(excluded_folders, include_dot_folders)
+
+        running = self._covering_refresh(search_path, scope)
+        if running is None:
+            if self.refresh(root, excluded_folders, include_dot_folders, subtree=search_path) is not None:
+                return root_id, root
+            # Skipped because a covering refresh started in the meantime, or failed.
+            running = self._covering_refresh(search_path, scope)
+            if running is None:
+                return None
+        if running is not True:
+            running.wait()
+        return root_id, root
+
+    def _covering_refresh(self, search_path: str, scope: str):
+        """
+        Returns the completion event of a running refresh that covers `search_path`,
+        True if one finished within `SEARCH_FRESHNESS_WINDOW`, or None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for (start, key_scope), event in self._active_refreshes.items():
+                if key_scope == scope and _is_within(search_path, start):
+                    return event
+            for (start, key_scope), finished in self._finished_refreshes.items():
+                if key_scope == scope and now - finished < SEARCH_FRESHNESS_WINDOW and _is_within(search_path, start):
+                    return True
+        return None
+
+    # --- Refresh --------------------------------------------------------------------------------------------------
+    def schedule_refresh(self, root: str, excluded_folders: Set[str], include_dot_folders: bool, min_interval: float = 0.0):
+        """
+        Refreshes a root in a background thread unless a refresh for the same root
+        and scope is already running or finished less than `min_interval` seconds ago.
+        """
+        root = os.path.abspath(root)
+        if min_interval > 0:
+            covering = self.find_root(root, excluded_folders, include_dot_folders)
+            if covering and covering[1] == root and time.time() - covering[2] < min_interval:
+                return
+        thread = threading.Thread(
+            target=self.refresh, args=(root, set(excluded_folders), include_dot_folders),
+            name="file-catalog-refresh", daemon=True
+        )
+        thread.start()
+
+    def refresh(self, root: str, excluded_folders: Set[str], include_dot_folders: bool, full: bool = False,
+                subtree: Optional[str] = None) -> Optional[Dict[str, int]]:
+        """
+        Brings the catalog for `root` up to date, or only the part below
+        `subtree` (a directory inside `root`). Only directories whose mtime
+        changed since the last refresh are re-listed unless `full` is True.
+        Returns refresh statistics, or None if the refresh was skipped.
+        """
+        root = os.path.abspath(root)
+        start = os.path.abspath(subtree) if subtree else root
+        scope = self.scope_key(excluded_folders, include_dot_folders)
+        key = (start, scope)
+        with self._lock:
+            if key in self._active_refreshes:
+                logger.debug(f"Catalog refresh for '{start}' is already running; skipping.")
+                return None
+            self._active_refreshes[key] = threading.Event()
+
+        start_time = time.monotonic()
+        stats = {"directories": 0, "relisted": 0, "files": 0, "removed_directories": 0}
+        conn = None
+        try:
+            if not os.path.isdir(start):
+                logger.warning(f"Catalog root '{start}' does not exist or is not a directory.")
+                return None
+
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR IGNORE INTO catalog_roots (root, scope, refreshed_at) VALUES (?, ?, NULL)", (root, scope))
+            root_id = cursor.execute("SELECT id FROM catalog_roots WHERE root = ? AND scope = ?", (root, scope)).fetchone()[0]
+
+            known_mtimes: Dict[str, float] = {}
+            known_children: Dict[str, List[str]] = {}
+            known_links: Dict[str, List[str]] = {}
+            lower, upper = _prefix_bounds(start)
+            for path, parent, mtime, is_link in cursor.execute(
+                "SELECT path, parent, mtime, is_link FROM directories WHERE root_id = ? AND (path = ? OR (path >= ? AND path < ?))",
+                (root_id, start, lower, upper)
+            ):
+                if is_link:
+                    known_links.setdefault(parent, []).append(path)
+                    continue
+                known_mtimes[path] = mtime
+                if parent is not None:
+                    known_children.setdefault(parent, []).append(path)
+
+            stack = [(start, None if start == root else os.path.dirname(start))]
+            pending_dirs = 0
+            while stack:
+                dirpath, parent = stack.pop()
+                try:
+                    dir_mtime = os.stat(dirpath).st_mtime
+                except OSError:
+                    continue
+                stats["directories"] += 1
+
+                if not full and known_mtimes.get(dirpath) == dir_mtime:
+                    stack.extend((child, dirpath) for child in known_children.get(dirpath, []))
+                    continue
+
+                subdirs, link_rows, file_rows = self._list_directory(dirpath, root_id, excluded_folders, include_dot_folders)
+                stats["relisted"] += 1
+                stats["files"] += len(file_rows)
+
+                for vanished in set(known_children.get(dirpath, [])) - set(subdirs):
+                    self._delete_subtree(cursor, root_id, vanished)
+                    stats["removed_directories"] += 1
+                cursor.executemany(
+                    "DELETE FROM directories WHERE root_id = ? AND path = ? AND is_link = 1",
+                    [(root_id, path) for path in known_links.get(dirpath, [])]
+                )
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO directories (root_id, path, parent, name, mtime, is_link) VALUES (?, ?, ?, ?, ?, 1)",
+                    link_rows
+                )
+
+                cursor.execute("DELETE FROM files WHERE root_id = ? AND dir = ?", (root_id, dirpath))
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO files (root_id, path, dir, name, extension, size, mtime, inode) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    file_rows
+                )
+                cursor.execute(
+                    "INSERT OR REPLACE INTO directories (root_id, path, parent, name, mtime) VALUES (?, ?, ?, ?, ?)",
+                    (root_id, dirpath, parent, os.path.basename(dirpath), dir_mtime)
+                )
+                stack.extend((child, dirpath) for child in subdirs)
+
+                pending_dirs += 1
+                if pending_dirs >= REFRESH_COMMIT_INTERVAL:
+                    conn.commit()
+                    pending_dirs = 0
+
+            if start == root:
+                cursor.execute("UPDATE catalog_roots SET refreshed_at = ? WHERE id = ?", (time.time(), root_id))
+                self._drop_nested_roots(cursor, root_id, root, scope)
+            conn.commit()
+
+            with self._lock:
+                now = time.monotonic()
+                self._finished_refreshes = {
+                    other: finished for other, finished in self._finished_refreshes.items()
+                    if now - finished < SEARCH_FRESHNESS_WINDOW
+                }
+                self._finished_refreshes[key] = now
+            duration = time.monotonic() - start_time
+            logger.info(
+                f"Catalog refresh for '{start}' finished in {duration:.2f} seconds. Checked {stats['directories']} "
+                f"directories, re-listed {stats['relisted']} and removed {stats['removed_directories']}."
+            )
+            return stats
+        except Exception:
+            logger.exception(f"Catalog refresh for '{start}' failed.")
+            return None
+        finally:
+            if conn:
+                conn.close()
+            with self._lock:
+                self._active_refreshes.pop(key).set()
+
+    @staticmethod
+    def _list_directory(
+        dirpath: str, root_id: int, excluded_folders: Set[str], include_dot_folders: bool
+    ) -> Tuple[List[str], List[Tuple], List[Tuple]]:
+        """
+        Lists one directory, returning its non-pruned subdirectories, the rows of
+        its non-pruned symlinked directories (listed but never descended into,
+        as in the disk walk) and its file rows.
+        """
+        subdirs, link_rows, file_rows = [], [], []
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if _is_pruned(entry.name, excluded_folders, include_dot_folders):
+                                continue
+                            if entry.is_symlink():
+                                link_rows.append((root_id, entry.path, dirpath, entry.name, entry.stat(follow_symlinks=False).st_mtime))
+                            else:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            file_rows.append((
+                                root_id, entry.path, dirpath, entry.name, os.path.splitext(entry.name)[1].lower(),
+                                st.st_size, st.st_mtime, entry.inode()
+                            ))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Could not list directory '{dirpath}' for the catalog: {e}")
+        return subdirs, link_rows, file_rows
+
+    @staticmethod
+    def _delete_subtree(cursor: sqlite3.Cursor, root_id: int, dirpath: str):
+        lower, upper = _prefix_bounds(dirpath)
+        cursor.execute("DELETE FROM files WHERE root_id = ? AND (dir = ? OR (path >= ? AND path < ?))", (root_id, dirpath, lower, upper))
+        cursor.execute("DELETE FROM directories WHERE root_id = ? AND (path = ? OR (path >= ? AND path < ?))", (root_id, dirpath, lower, upper))
+
+    @staticmethod
+    def _drop_nested_roots(cursor: sqlite3.Cursor, root_id: int, root: str, scope: str):
+        """Removes roots of the same scope that are now fully covered by `root`."""
+        rows = cursor.execute("SELECT id, root FROM catalog_roots WHERE scope = ? AND id != ?", (scope, root_id)).fetchall()
+        for nested_id, nested_root in rows:
+            if _is_within(nested_root, root):
+                cursor.execute("DELETE FROM files WHERE root_id = ?", (nested_id,))
+                cursor.execute("DELETE FROM directories WHERE root_id = ?", (nested_id,))
+                cursor.execute("DELETE FROM catalog_roots WHERE id = ?", (nested_id,))
+                logger.debug(f"Dropped nested catalog root '{nested_root}' now covered by '{root}'.")
+
+# 5. SINGLETON ACCESS ###########################################################################################
+def get_file_catalog() -> FileCatalog:
+    """Returns the process-wide file catalog using a singleton pattern."""
+    global _FILE_CATALOG
+    if _FILE_CATALOG is None:
+        _FILE_CATALOG = FileCatalog()
+    return _FILE_CATALOG
@@ -10,11 +10,19 @@ High-performance, concurrent file engine module.
 
 This module implements the principles of the High-Performance Concurrent
 File-Search Checklist to provide maximum search speed and efficiency. It uses a
-producer-consumer model with a ThreadPoolExecutor to parallelize file system
-I/O and content processing.
+bounded producer-consumer pipeline (`search_pipeline.SearchPipeline`) fed by a
+parallel directory crawler to parallelize file system I/O and content processing.
+
+Name, category and folder searches are answered from a persistent file
+catalog when it is warm, and content searches can narrow their candidates with
+an optional trigram index. Content is matched at the bytes level behind a
+literal prefilter, with binary files recognised once per path and snippets
+collected in the same pass. All searches share one long-lived worker pool, which
+can hand CPU-bound regex matching to worker processes, and stream their
+results in batched frames up to an optional result limit.
 
 Key Features:
-- Concurrent file discovery and processing.
+- Concurrent file discovery and processing with constant memory.
 - Memory-efficient chunked file reading for content search.
 - Single-pass multi-keyword searching using compiled regex.
 - Intelligent pre-filtering of files by metadata before processing content.
@@ -28,54 +36,36 @@ import re
 import asyncio
 import time
 import logging
-from pathlib import Path
-from typing import List, Set, Any, Dict
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import List, Set, Any, Dict, Optional, Tuple
 from functools import partial
-from unstructured.partition.auto import partition
+
+from .config_manager import get_config
+from .file_catalog import get_file_catalog
+from .content_index import get_content_index, IndexedSearch
+from .fs_crawler import ParallelCrawler
+from .content_matcher import ContentMatcher, FileMatch
+from .search_pipeline import SearchPipeline
+from .result_collector import ResultCollector, SORT_MTIME_DESC
+from .search_events import SearchEventStream
+from .worker_pool import WorkerPool
+from .process_search import (
+    SearchSpec, PROCESS_MODE_COMPLEXITY, create_process_pool, match_paths, pattern_complexity, terminate_process_pool
+)
+from .text_extraction import get_extracted_text_cache, is_document
 
 # 2. SETUP & CONSTANTS ##########################################################################################
 logger = logging.getLogger(__name__)
 
-# Optimal chunk size for reading files, balancing memory and I/O calls
-CONTENT_CHUNK_SIZE = 32 * 1024  # 32 KB
+# Maximum number of per-path binary/text verdicts remembered between searches.
+BINARY_VERDICT_CACHE_SIZE = 200_000
+# Number of result paths sent per `scan_results` message at the end of a search.
+RESULTS_PAGE_SIZE = 1000
 
 # 3. CORE HELPER FUNCTIONS ######################################################################################
 
-def extract_text_from_file(file_path: Path) -> str:
-    """
-    Extracts text content from a file using 'unstructured' with a fallback.
-    """
-    try:
-        if not file_path.is_file():
-            return ""
-        elements = partition(filename=str(file_path))
-        return "\n".join([str(el) for el in elements])
-    except Exception as e:
-        logger.warning(f"Unstructured failed on {file_path.name}: {e}. Falling back to text read.")
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
-        except Exception as fe:
-            logger.error(f"Fallback text read also failed for {file_path.name}: {fe}")
-            return ""
-
-def _is_match_content_chunked(file_path: Path, pattern: re.Pattern) -> bool:
-    """
-    Reads a file in chunks and checks if any chunk matches the regex pattern.
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            overlap = 1024
-            buffer = ""
-            while chunk := f.read(CONTENT_CHUNK_SIZE):
-                if pattern.search(buffer + chunk):
-                    return True
-                buffer = chunk[-overlap:]
-    except Exception as e:
-        logger.debug(f"Could not read content from {file_path}: {e}")
-    return False
-
 # --- NEW HELPER FUNCTION TO FIX THE REGEX BUG ---
 def _translate_wildcard_to_regex(pattern: str) -> str:
     """
@@ -109,9 +99,31 @@ class FileSearchEngine:
             "Compressed": [".zip", ".rar", ".7z", ".tar", ".gz", ".bz2"],
             "Executable": [".exe", ".msi", ".bat", ".sh", ".app", ".jar", ".com"]
         }
+        search_params = get_config("classic_search_params") or {}
         cpu_cores = os.cpu_count() or 1
-        self.max_workers = min(32, cpu_cores + 4)
-        logger.info(f"FileSearchEngine initialized with max_workers={self.max_workers}")
+        # One pool with a global budget serves every search; storage roots may cap their own I/O parallelism.
+        self.max_workers = search_params.get("worker_pool_size") or min(32, cpu_cores + 4)
+        self.io_parallelism = {
+            os.path.normcase(os.path.abspath(root)): max(1, int(limit))
+            for root, limit in (search_params.get("io_parallelism") or {}).items()
+        }
+        self.worker_pool = WorkerPool(self.max_workers, group_limits=self.io_parallelism)
+        self.process_pool_size = search_params.get("process_pool_size") or cpu_cores
+        self._process_pool = None
+        self._process_pool_lock = threading.Lock()
+        self._binary_verdicts: "OrderedDict[str, Tuple[int, float, bool]]" = OrderedDict()
+        self._binary_verdicts_lock = threading.Lock()
+        self.text_cache = get_extracted_text_cache()
+        self.catalog = get_file_catalog() if search_params.get("enable_file_catalog", True) else None
+        self.catalog_refresh_interval = search_params.get("catalog_refresh_interval", 60)
+        self.content_index = (
+            get_content_index(search_params.get("content_index_max_file_size", 4 * 1024 * 1024))
+            if search_params.get("enable_content_index", False) else None
+        )
+        logger.info(
+            f"FileSearchEngine initialized with max_workers={self.max_workers}, "
+            f"catalog={'on' if self.catalog else 'off'}, content_index={'on' if self.content_index else 'off'}"
+        )
 
     # --- MODIFIED LOGIC TO USE THE NEW HELPER FUNCTION ---
     def _compile_search_pattern(self, keywords: List[str], use_regex: bool, case_sensitive: bool) -> re.Pattern:
@@ -132,111 +144,393 @@ class FileSearchEngine:
         return re.compile(pattern_str, flags)
     # --- END OF MODIFICATION ---
 
+    def _storage_root(self, search_path: str) -> Optional[str]:
+        """Returns the most specific configured storage root containing `search_path`, if any."""
+        path = os.path.normcase(os.path.abspath(search_path))
+        matches = [root for root in self.io_parallelism if path == root or path.startswith(root.rstrip(os.sep) + os.sep)]
+        return max(matches, key=len) if matches else None
+
     def _get_file_extensions(self, req: Any) -> tuple:
         """Get file extensions tuple based on search request."""
         if req.search_type.value == "file_category":
             return tuple(self.file_categories.get(req.file_category, []))
         return tuple(req.file_extensions or self.default_file_extensions)
 
-    def _process_file(self, file_path_str: str, req: Any, pattern: re.Pattern, extensions: tuple) -> Dict[str, Any]:
+    def _check_metadata(self, file_entry: os.DirEntry, req: Any, extensions: tuple):
+        """
+        Applies the extension and size filters. Returns `(skip_result, stat_info)`,
+        where `skip_result` is None if the file should be processed further.
+        """
+        if req.search_type.value in ["file_content", "file_category"] and extensions:
+            if os.path.splitext(file_entry.name)[1].lower() not in extensions:
+                return {"status": "skipped_extension"}, None
+
+        stat_info = file_entry.stat()
+        if (req.min_size is not None and stat_info.st_size < req.min_size) or \
+           (req.max_size is not None and stat_info.st_size > req.max_size):
+            return {"status": "skipped_size"}, stat_info
+        return None, stat_info
+
+    @staticmethod
+    def _found_result(path: str, mtime: float, content_match: Optional[FileMatch] = None) -> Dict[str, Any]:
+        result = {"status": "found", "path": path, "mtime": mtime}
+        if content_match is not None:
+            if content_match.keywords is not None:
+                result["keywords"] = content_match.keywords
+            if content_match.snippets:
+                result["snippets"] = content_match.snippets
+        return result
+
+    def _process_file(self, file_entry: os.DirEntry, req: Any, pattern: re.Pattern, extensions: tuple,
+                      matcher: ContentMatcher = None, indexed_search: IndexedSearch = None) -> Dict[str, Any]:
         """
         Self-contained worker function to process a single file in a thread pool.
+        The crawler's `DirEntry` supplies the stat data, so no extra `stat()` is issued.
+        When a content index view is supplied, files it rules out are never opened.
         """
-        file_path = Path(file_path_str)
+        file_path_str = file_entry.path
 
         try:
-            if req.search_type.value in ["file_content", "file_category"] and extensions:
-                if file_path.suffix.lower() not in extensions:
-                    return {"status": "skipped_extension"}
+            skip_result, stat_info = self._check_metadata(file_entry, req, extensions)
+            if skip_result is not None:
+                return skip_result
 
-            stat_info = file_path.stat()
-            if (req.min_size is not None and stat_info.st_size < req.min_size) or \
-               (req.max_size is not None and stat_info.st_size > req.max_size):
-                return {"status": "skipped_size"}
-
-            match_found = False
             if req.search_type.value in ["file_name", "file_category"]:
-                if pattern.search(file_path.name):
-                    match_found = True
+                if pattern.search(file_entry.name):
+                    return self._found_result(file_path_str, stat_info.st_mtime)
             elif req.search_type.value == "file_content":
-                if _is_match_content_chunked(file_path, pattern):
-                    match_found = True
-
-            if match_found:
-                return {"status": "found", "path": file_path_str, "mtime": stat_info.st_mtime}
+                status, content_match = self._match_content(file_path_str, stat_info.st_size, stat_info.st_mtime, req, matcher, indexed_search)
+                if status != "found":
+                    return {"status": status}
+                return self._found_result(file_path_str, stat_info.st_mtime, content_match)
 
             return {"status": "no_match"}
         except Exception:
             return {"status": "error_processing"}
 
-    async def run_search(self, websocket: Any, search_id: str, req: Any):
+    def _process_files_in_processes(self, file_entries: List[os.DirEntry], req: Any, pattern: re.Pattern, extensions: tuple,
+                                    spec: SearchSpec, matcher: ContentMatcher, indexed_search: IndexedSearch = None) -> List[Dict[str, Any]]:
+        """
+        Chunk worker for the process backend. Metadata filters, cached binary
+        verdicts and the content index are applied in this thread, as is matching
+        against cached document text; the remaining files go to a worker process
+        as one batch. Files the content index holds no fresh entry for are read
+        for it there, and their trigrams are queued for the index here.
+        """
+        results: List[Dict[str, Any]] = []
+        pending: List[Tuple[str, int, float, bool]] = []
+        for file_entry in file_entries:
+            try:
+                skip_result, stat_info = self._check_metadata(file_entry, req, extensions)
+            except OSError:
+                skip_result = {"status": "error_processing"}
+            if skip_result is not None:
+                results.append(skip_result)
+                continue
+            path, size, mtime = file_entry.path, stat_info.st_size, stat_info.st_mtime
+            is_binary = self._get_binary_verdict(path, size, mtime)
+            if req.search_document_text and is_document(path):
+                results.append(self._process_file(file_entry, req, pattern, extensions, matcher))
+            elif req.skip_binary_files and is_binary:
+                results.append({"status": "skipped_binary"})
+            elif indexed_search is not None and indexed_search.can_skip(path, size, mtime):
+                results.append({"status": "skipped_index"})
+            else:
+                stale = indexed_search is not None and not is_binary and not indexed_search.is_fresh(path, size, mtime)
+                pending.append((path, size, mtime, stale))
+        if not pending:
+            return results
+
+        index_max_size = indexed_search.index.max_file_size if indexed_search is not None else 0
+        try:
+            outcomes = self._get_process_pool().submit(match_paths, spec, pending, index_max_size).result()
+        except Exception:
+            logger.warning("Process-pool content search failed; resetting the pool.", exc_info=True)
+            self._reset_process_pool()
+            return results + [{"status": "error_processing"}] * len(pending)
+
+        for (path, size, mtime, _), outcome in zip(pending, outcomes):
+            if outcome is None:
+                self._set_binary_verdict(path, size, mtime, False)
+                results.append({"status": "no_match"})
+                continue
+            match = FileMatch(*outcome[:4])
+            if outcome[4]:
+                indexed_search.index.record(path, size, mtime, outcome[5])
+            self._set_binary_verdict(path, size, mtime, match.is_binary)
+            if match.is_binary and req.skip_binary_files:
+                results.append({"status": "skipped_binary"})
+            elif match.matched:
+                results.append(self._found_result(path, mtime, match))
+            else:
+                results.append({"status": "no_match"})
+        return results
+
+    def _use_processes(self, req: Any, pattern: re.Pattern) -> bool:
+        """Decides between the thread and the process backend for a content search."""
+        mode = req.execution_mode.value if req.execution_mode else "auto"
+        if req.search_type.value != "file_content" or mode == "threads":
+            return False
+        if mode == "processes":
+            return True
+        return req.use_regex and self.process_pool_size > 1 and pattern_complexity(pattern) >= PROCESS_MODE_COMPLEXITY
+
+    def _get_process_pool(self):
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = create_process_pool(self.process_pool_size)
+                logger.info(f"Started content-search process pool with {self.process_pool_size} workers.")
+            return self._process_pool
+
+    def _reset_process_pool(self):
+        with self._process_pool_lock:
+            pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            terminate_process_pool(pool)
+
+    def _match_content(self, path: str, size: int, mtime: float, req: Any, matcher: ContentMatcher,
+                       indexed_search: IndexedSearch) -> Tuple[str, Optional[FileMatch]]:
+        """
+        Runs a content match for one file, consulting the binary verdict cache and
+        the content index first. Returns the status ('found', 'no_match',
+        'skipped_binary' or 'skipped_index') and, when the file was read, its `FileMatch`.
+        Documents are matched against their extracted text when the request asks for it.
+        """
+        if req.search_document_text and is_document(path):
+            match = matcher.match_text(self.text_cache.get_text(path, size, mtime))
+            return ("found" if match.matched else "no_match"), match
+
+        is_binary = self._get_binary_verdict(path, size, mtime)
+        if is_binary and req.skip_binary_files:
+            return "skipped_binary", None
+
+        if indexed_search is not None:
+            if indexed_search.can_skip(path, size, mtime):
+                return "skipped_index", None
+            if not is_binary and not indexed_search.is_fresh(path, size, mtime):
+                # Stale or unseen file: read it once to both match and (re)index it.
+                text = indexed_search.index.index_file(path, size, mtime)
+                if text is not None:
+                    self._set_binary_verdict(path, size, mtime, False)
+                    match = matcher.match_text(text)
+                    return ("found" if match.matched else "no_match"), match
+
+        match = matcher.match_file(path, size, skip_binary=req.skip_binary_files)
+        self._set_binary_verdict(path, size, mtime, match.is_binary)
+        if match.is_binary and req.skip_binary_files:
+            return "skipped_binary", match
+        return ("found" if match.matched else "no_match"), match
+
+    def _get_binary_verdict(self, path: str, size: int, mtime: float) -> Optional[bool]:
+        """Returns the cached binary/text verdict for an unchanged file, or None if unknown."""
+        with self._binary_verdicts_lock:
+            verdict = self._binary_verdicts.get(path)
+            if verdict is None or verdict[0] != size or verdict[1] != mtime:
+                return None
+            self._binary_verdicts.move_to_end(path)
+            return verdict[2]
+
+    def _set_binary_verdict(self, path: str, size: int, mtime: float, is_binary: bool):
+        with self._binary_verdicts_lock:
+            self._binary_verdicts[path] = (size, mtime, is_binary)
+            self._binary_verdicts.move_to_end(path)
+            if len(self._binary_verdicts) > BINARY_VERDICT_CACHE_SIZE:
+                self._binary_verdicts.popitem(last=False)
+
+    def _search_catalog(self, req: Any, pattern: re.Pattern, extensions: tuple, excluded: Set[str], collector: ResultCollector,
+                        stop_event: threading.Event):
+        """
+        Answers name, category and folder searches from the persistent file catalog,
+        adding verified hits to `collector` and stopping once it is full or cancelled.
+        Returns `(items_scanned, catalog_root)`, or None if the catalog is cold.
+        """
+        prepared = self.catalog.prepare_search(req.search_path, excluded, req.include_dot_folders)
+        if prepared is None:
+            return None
+        root_id, catalog_root = prepared
+
+        if req.search_type.value == "folder_name":
+            entries = ((path, name) for path, name, _ in self.catalog.iter_directories(root_id, req.search_path))
+        else:
+            ext_filter = extensions if req.search_type.value == "file_category" and extensions else None
+            entries = (
+                (path, name) for path, name, _, _ in
+                self.catalog.iter_files(root_id, req.search_path, ext_filter)
+            )
+
+        items_scanned = 0
+        for path, name in entries:
+            items_scanned += 1
+            if stop_event.is_set():
+                break
+            if not pattern.search(name):
+                continue
+            # Sizes in the catalog go stale when files are edited in place, so size filters use this fresh stat.
+            try:
+                stat_info = os.stat(path)
+            except OSError:
+                continue
+            if req.search_type.value != "folder_name" and (
+                (req.min_size is not None and stat_info.st_size < req.min_size) or
+                (req.max_size is not None and stat_info.st_size > req.max_size)
+            ):
+                continue
+            collector.add({"path": path, "mtime": stat_info.st_mtime})
+            if collector.is_full:
+                break
+        return items_scanned, catalog_root
+
+    def _process_folder(self, dir_entry: os.DirEntry, pattern: re.Pattern) -> Dict[str, Any]:
+        """Worker function for folder-name searches."""
+        try:
+            if pattern.search(dir_entry.name):
+                return {"status": "found", "path": dir_entry.path, "mtime": dir_entry.stat().st_mtime}
+            return {"status": "no_match"}
+        except OSError:
+            return {"status": "error_processing"}
+
+    async def _walk_and_search(self, events: SearchEventStream, req: Any, pattern: re.Pattern, excluded: Set[str], process_func,
+                               collector: ResultCollector, stop_event: threading.Event, process_chunk_func=None) -> int:
+        """
+        Crawls the search path on disk through a bounded walker/worker/consumer
+        pipeline, streaming matches as they are found. In a sorted, limited search
+        matches pushed out of the top K are withdrawn again. The walk stops early
+        once an unsorted search has collected `max_results` matches.
+        Returns the number of items scanned.
+        """
+        items_scanned = 0
+        is_folder_search = req.search_type.value == "folder_name"
+        if is_folder_search:
+            process_func = partial(self._process_folder, pattern=pattern)
+
+        storage_root = self._storage_root(req.search_path)
+        parallelism = self.io_parallelism[storage_root] if storage_root else self.max_workers
+        crawler = ParallelCrawler(
+            excluded, req.include_dot_folders, max_workers=parallelism, stop_event=stop_event,
+            executor=self.worker_pool.client(parallelism, storage_root, name="crawl")
+        )
+        pipeline = SearchPipeline(
+            crawler, req.search_path, process_func, self.worker_pool.client(parallelism, storage_root, name="search"),
+            max_pending_chunks=parallelism * 4, select_directories=is_folder_search,
+            process_chunk_func=None if is_folder_search else process_chunk_func
+        )
+
+        async with aclosing(pipeline.batches()) as batches:
+            async for batch in batches:
+                items_scanned += len(batch)
+                for result in batch:
+                    if result["status"] != "found" or collector.is_full:
+                        continue
+                    if collector.add(result):
+                        item = {"path": result["path"]}
+                        for detail in ("keywords", "snippets"):
+                            if detail in result:
+                                item[detail] = result[detail]
+                        await events.item(item)
+                        evicted = collector.take_evicted()
+                        if evicted:
+                            await events.evict(evicted)
+                await events.progress(items_scanned, collector.total_found)
+                if collector.is_full:
+                    logger.info(f"Result limit of {collector.max_results} reached; stopping the walk early.")
+                    pipeline.stop()
+                    break
+
+        return items_scanned
+
+    async def run_search(self, websocket: Any, search_id: str, req: Any, stop_event: Optional[threading.Event] = None):
         """
         Performs a high-performance, concurrent file search and streams results.
+        Name, category and folder searches are served from the file catalog when it is warm.
+        Setting `stop_event` cancels the search; the crawler and workers watch it directly.
         """
+        stop_event = stop_event or threading.Event()
         start_time = time.monotonic()
-        found_items = []
+        events = SearchEventStream(websocket, search_id)
+        collector = ResultCollector(req.max_results, req.sort.value if req.sort else SORT_MTIME_DESC)
         items_scanned = 0
 
         try:
             pattern = self._compile_search_pattern(req.keywords, req.use_regex, req.case_sensitive)
         except re.error as e:
-            await websocket.send_json({"type": "error", "message": f"Invalid Regex: {e}"})
+            await websocket.send_json({"type": "error", "task_id": search_id, "message": f"Invalid Regex: {e}"})
             return
 
         extensions = self._get_file_extensions(req)
         excluded = set(req.excluded_folders or self.default_excluded_folders)
 
         loop = asyncio.get_running_loop()
-        process_func = partial(self._process_file, req=req, pattern=pattern, extensions=extensions)
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            if req.search_type.value == "folder_name":
-                for dirpath, dirnames, _ in os.walk(req.search_path, topdown=True):
-                    dirnames[:] = [d for d in dirnames if d not in excluded and (req.include_dot_folders or not d.startswith('.'))]
-                    for dirname in dirnames:
-                        items_scanned += 1
-                        if pattern.search(dirname):
-                            try:
-                                path = os.path.join(dirpath, dirname)
-                                found_items.append({"path": path, "mtime": os.path.getmtime(path)})
-                                await websocket.send_json({"type": "item_found", "path": path})
-                            except OSError:
-                                continue
-                    await websocket.send_json({"type": "scan_progress", "progress": {"scanned": items_scanned, "found": len(found_items)}})
-                    await asyncio.sleep(0)
-            else:
-                futures = []
-                for dirpath, dirnames, filenames in os.walk(req.search_path, topdown=True):
-                    dirnames[:] = [d for d in dirnames if d not in excluded and (req.include_dot_folders or not d.startswith('.'))]
-                    for filename in filenames:
-                        file_path = os.path.join(dirpath, filename)
-                        futures.append(loop.run_in_executor(executor, process_func, file_path))
-
-                    if len(futures) >= self.max_workers * 5:
-                        for future in asyncio.as_completed(futures):
-                            result = await future
-                            items_scanned += 1
-                            if result["status"] == "found":
-                                found_items.append(result)
-                                await websocket.send_json({"type": "item_found", "path": result["path"]})
-                        futures.clear()
-                        await websocket.send_json({"type": "scan_progress", "progress": {"scanned": items_scanned, "found": len(found_items)}})
-
-                for future in asyncio.as_completed(futures):
-                    result = await future
-                    items_scanned += 1
-                    if result["status"] == "found":
-                        found_items.append(result)
-                        await websocket.send_json({"type": "item_found", "path": result["path"]})
-
-        found_items.sort(key=lambda x: x["mtime"], reverse=True)
-        sorted_paths = [item["path"] for item in found_items]
+        matcher = None
+        if req.search_type.value == "file_content":
+            matcher = ContentMatcher(
+                req.keywords, req.use_regex, req.case_sensitive, pattern, max_snippets=req.max_snippets_per_file
+            )
+        indexed_search = None
+        if self.content_index and req.search_type.value == "file_content":
+            try:
+                indexed_search = await loop.run_in_executor(None, self.content_index.prepare_search, req.search_path, pattern)
+            except Exception:
+                logger.warning("Content index is unavailable; falling back to a full content scan.", exc_info=True)
+        process_func = partial(
+            self._process_file, req=req, pattern=pattern, extensions=extensions, matcher=matcher, indexed_search=indexed_search
+        )
+        process_chunk_func = None
+        if self._use_processes(req, pattern):
+            spec = SearchSpec(
+                tuple(req.keywords), req.use_regex, req.case_sensitive, pattern.pattern, pattern.flags,
+                max(0, req.max_snippets_per_file), req.skip_binary_files
+            )
+            process_chunk_func = partial(
+                self._process_files_in_processes, req=req, pattern=pattern, extensions=extensions, spec=spec,
+                matcher=matcher, indexed_search=indexed_search
+            )
+            logger.info(f"Search {search_id} runs content matching in worker processes.")
+
+        catalog_result = None
+        if self.catalog and req.search_type.value != "file_content":
+            catalog_result = await loop.run_in_executor(
+                None, self._search_catalog, req, pattern, extensions, excluded, collector, stop_event
+            )
+
+        if catalog_result is not None:
+            items_scanned, catalog_root = catalog_result
+            # Only the final top K is streamed, so nothing sent here is evicted later.
+            for path in collector.paths():
+                await events.item({"path": path})
+            await events.progress(items_scanned, collector.total_found)
+            self.catalog.schedule_refresh(catalog_root, excluded, req.include_dot_folders, self.catalog_refresh_interval)
+        else:
+            items_scanned = await self._walk_and_search(
+                events, req, pattern, excluded, process_func, collector, stop_event, process_chunk_func
+            )
+            if self.catalog and req.search_type.value != "file_content":
+                self.catalog.schedule_refresh(req.search_path, excluded, req.include_dot_folders)
+            if indexed_search is not None:
+                await loop.run_in_executor(None, self.content_index.flush)
+
+        # Early termination also sets the stop event; only a stop without a full collector is a cancellation.
+        if stop_event.is_set() and not collector.is_full:
+            await events.flush()
+            logger.info(f"Search {search_id} cancelled after scanning {items_scanned} items.")
+            await events.send({"type": "scan_cancelled", "task_id": search_id, "scanned": items_scanned})
+            return
 
+        result_paths = collector.paths()
         duration = time.monotonic() - start_time
         item_type = "folders" if req.search_type.value == "folder_name" else "files"
-        summary = f"Search complete in {duration:.2f} seconds. Scanned {items_scanned} items and found {len(found_items)} matching {item_type}."
+        summary = f"Search complete in {duration:.2f} seconds. Scanned {items_scanned} items and found {collector.total_found} matching {item_type}."
+        if collector.truncated or collector.is_full:
+            summary += f" Results limited to {len(result_paths)}."
         logger.info(summary)
 
-        await websocket.send_json({
-            "type": "scan_complete", "task_id": search_id, "results": sorted_paths, "summary": summary
+        await events.flush()
+        pages = max(1, -(-len(result_paths) // RESULTS_PAGE_SIZE))
+        for page in range(pages):
+            await events.send({
+                "type": "scan_results", "task_id": search_id, "page": page + 1, "pages": pages,
+                "results": result_paths[page * RESULTS_PAGE_SIZE:(page + 1) * RESULTS_PAGE_SIZE]
+            })
+        await events.send({
+            "type": "scan_complete", "task_id": search_id, "summary": summary,
+            "total": len(result_paths), "truncated": collector.truncated or collector.is_full
         })
@@ -0,0 +1,132 @@
+# backend/keyword_automaton.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Aho-Corasick automaton for matching many literal keywords in one pass.
+
+A regex alternation of N literals is tried branch by branch at every position
+of the input, so its cost grows with the number of keywords. An Aho-Corasick
+automaton reads each input byte once regardless of how many keywords it holds,
+which keeps searches with thousands of terms (e.g. compliance term lists)
+practical.
+
+Key Features:
+-   **Bytes Semantics:** Keywords and input are raw bytes, matching the
+    bytes-level strategy of `ContentMatcher`.
+-   **Keyword Reporting:** `find_all` returns the indexes of every keyword
+    that occurs in the input, not just whether any did.
+-   **Optional Accelerator:** When the `pyahocorasick` package is installed (the
+    `fast` extra: `pip install -e ".[fast]"`) its C implementation is used;
+    otherwise a pure-Python automaton is built, which is several times slower.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import logging
+from collections import deque
+from typing import Dict, List, Set
+
+try:
+    import ahocorasick  # Optional C accelerator (pyahocorasick).
+except ImportError:
+    ahocorasick = None
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+# 3. AUTOMATON CLASS ############################################################################################
+class KeywordAutomaton:
+    """
+    Finds which of a fixed set of byte-string keywords occur in a block of data.
+    Keyword indexes refer to positions in the list passed to the constructor.
+    """
+    def __init__(self, keywords: List[bytes]):
+        self.keywords = list(keywords)
+        self.max_length = max((len(k) for k in self.keywords), default=0)
+        self._native = None
+        if ahocorasick is not None:
+            self._native = self._build_native()
+        else:
+            self._build_python()
+        logger.debug(
+            f"Built keyword automaton for {len(self.keywords)} keywords "
+            f"({'pyahocorasick' if self._native is not None else 'pure Python'})."
+        )
+
+    @property
+    def backend(self) -> str:
+        return "pyahocorasick" if self._native is not None else "python"
+
+    def _build_native(self):
+        # The default pyahocorasick build works on str; latin-1 maps every byte to one code point.
+        automaton = ahocorasick.Automaton()
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            key = keyword.decode('latin-1')
+            existing = automaton.get(key, None)
+            automaton.add_word(key, (existing or ()) + (index,))
+        automaton.make_automaton()
+        return automaton
+
+    def _build_python(self):
+        # Trie: one transition dict per state; state 0 is the root.
+        self._goto: List[Dict[int, int]] = [{}]
+        self._outputs: List[List[int]] = [[]]
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for byte in keyword:
+                next_state = self._goto[state].get(byte)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][byte] = next_state
+                    self._goto.append({})
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append(index)
+
+        # Failure links, built breadth-first; outputs are merged along them so
+        # that every state lists all keywords ending at it.
+        self._fail = [0] * len(self._goto)
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for byte, child in self._goto[state].items():
+                pending.append(child)
+                fallback = self._fail[state]
+                while fallback and byte not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(byte, 0)
+                if self._outputs[self._fail[child]]:
+                    self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def find_all(self, data: bytes) -> Set[int]:
+        """Returns the indexes of all keywords that occur in `data`."""
+        if self._native is not None:
+            found: Set[int] = set()
+            for _, indexes in self._native.iter(data.decode('latin-1')):
+                found.update(indexes)
+            return found
+
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set()
+        total = len(self.keywords)
+        state = 0
+        for byte in data:
+            transitions = goto[state]
+            while byte not in transitions:
+                if not state:
+                    break
+                state = fail[state]
+                transitions = goto[state]
+            state = transitions.get(byte, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+                if len(found) == total:
+                    break
+        return found
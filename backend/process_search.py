@@ -0,0 +1,172 @@
+# backend/process_search.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Process-pool backend for CPU-bound content searches.
+
+Complex regular expressions turn content matching into pure CPU work, and
+under the GIL a thread pool cannot use more than about one core for it. This
+module runs the matching in worker processes instead:
+
+-   **Batched Work:** Workers receive batches of `(path, size, mtime)` tuples,
+    never single files, so inter-process overhead is paid once per batch.
+-   **Per-Worker Compilation:** Each worker builds a `ContentMatcher` once per
+    search specification and keeps a few of them cached, so patterns are not
+    recompiled for every batch.
+-   **Compact Results:** Only files that matched, turned out to be binary or
+    were read for the content index produce a result tuple; everything else
+    is reported as `None`.
+-   **Index Maintenance:** Files the search thread flags as stale in the
+    trigram content index are read once, matched against the decoded text and
+    returned with their trigrams, so process searches keep the index current.
+-   **Complexity Heuristic:** `pattern_complexity()` scores a regex by its
+    unbounded repeats, alternations, lookarounds and backreferences, which
+    lets the engine choose the process backend automatically.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import os
+import re
+import sys
+import multiprocessing
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from re import _parser as sre_parse
+from re import _constants as sre_constants
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from .content_index import read_indexable_text, text_trigrams
+from .content_matcher import ContentMatcher
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+# Pattern complexity from which `execution_mode="auto"` switches to worker processes.
+PROCESS_MODE_COMPLEXITY = 4
+# Matchers each worker process keeps compiled (one per distinct search specification).
+MATCHER_CACHE_SIZE = 4
+
+# Modules the fork server imports before forking workers. Only what the worker functions need: preloading the
+# app (`__main__`) would run its model loading in the fork server and hand every worker a multi-GB image.
+FORKSERVER_PRELOAD = ["backend.process_search", "backend.text_extraction"]
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+class SearchSpec(NamedTuple):
+    """Everything a worker process needs to rebuild the search's `ContentMatcher`."""
+    keywords: Tuple[str, ...]
+    use_regex: bool
+    case_sensitive: bool
+    pattern: str
+    flags: int
+    max_snippets: int
+    skip_binary: bool
+
+# Per-process cache of compiled matchers, keyed by `SearchSpec`.
+_matchers: "OrderedDict[SearchSpec, ContentMatcher]" = OrderedDict()
+
+# 3. HELPER FUNCTIONS ###########################################################################################
+def pattern_complexity(pattern: re.Pattern) -> int:
+    """
+    Scores how CPU-heavy a regex is likely to be: unbounded repeats count 2,
+    bounded repeats and extra alternation branches 1, lookarounds 2 and
+    backreferences 3. Returns 0 if the pattern cannot be parsed.
+    """
+    def score(parsed) -> int:
+        total = 0
+        for op, av in parsed:
+            if op in _REPEATS:
+                low, high, sub = av
+                total += (2 if high == sre_constants.MAXREPEAT else 1) + score(sub)
+            elif op == sre_constants.BRANCH:
+                total += len(av[1]) - 1 + sum(score(sub) for sub in av[1])
+            elif op == sre_constants.SUBPATTERN:
+                total += score(av[-1])
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                total += 2 + score(av[1])
+            elif op == sre_constants.GROUPREF:
+                total += 3
+        return total
+
+    try:
+        return score(sre_parse.parse(pattern.pattern, pattern.flags))
+    except (re.error, RecursionError, ValueError):
+        return 0
+
+def create_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Creates a worker-process pool. The server is multithreaded, so workers are
+    never plain forks of it (a child could inherit a lock another thread held).
+    POSIX systems use `forkserver`: the worker modules are imported once into
+    the fork server, so workers start quickly without re-importing them.
+    Windows uses `spawn`.
+    """
+    if sys.platform == "win32":
+        context = multiprocessing.get_context("spawn")
+    else:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(FORKSERVER_PRELOAD)
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, mp_context=context)
+
+def terminate_process_pool(pool: ProcessPoolExecutor):
+    """
+    Shuts a pool down without waiting for running tasks: queued tasks are
+    cancelled and the worker processes are killed, so a task that hangs
+    cannot keep its worker busy forever.
+    """
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+# 4. WORKER FUNCTIONS ###########################################################################################
+def _matcher_for(spec: SearchSpec) -> ContentMatcher:
+    matcher = _matchers.get(spec)
+    if matcher is None:
+        text_pattern = re.compile(spec.pattern, spec.flags)
+        matcher = ContentMatcher(
+            list(spec.keywords), spec.use_regex, spec.case_sensitive, text_pattern, max_snippets=spec.max_snippets
+        )
+        _matchers[spec] = matcher
+        if len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    else:
+        _matchers.move_to_end(spec)
+    return matcher
+
+def match_paths(spec: SearchSpec, files: List[Tuple[str, int, float, bool]],
+                index_max_size: int = 0) -> List[Optional[Tuple[Any, ...]]]:
+    """
+    Runs in a worker process. Files whose last flag is set are read for the
+    content index (up to `index_max_size` bytes). Returns one entry per input
+    file: None for a text file without a match that was not indexed, else
+    `(matched, is_binary, keywords, snippets, indexed, trigrams)`, where
+    `trigrams` is None for an indexed file that cannot be indexed.
+    """
+    matcher = _matcher_for(spec)
+    results: List[Optional[Tuple[Any, ...]]] = []
+    for path, size, _, index in files:
+        indexed = False
+        if index:
+            try:
+                text = read_indexable_text(path, size, index_max_size)
+            except OSError:
+                text = None
+            else:
+                indexed = True
+            if text is not None:
+                match = matcher.match_text(text)
+                results.append((match.matched, False, match.keywords, match.snippets, True, text_trigrams(text)))
+                continue
+        match = matcher.match_file(path, size, skip_binary=spec.skip_binary)
+        if match.matched or match.is_binary or indexed:
+            results.append((match.matched, match.is_binary, match.keywords, match.snippets, indexed, None))
+        else:
+            results.append(None)
+    return results
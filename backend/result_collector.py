@@ -0,0 +1,97 @@
+# backend/result_collector.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Bounded result collection for classic searches.
+
+Collecting every match and sorting the full list at the end makes a broad
+search (e.g. `*` on a file name) hold millions of result dicts in memory.
+`ResultCollector` keeps only what the request asks for:
+
+-   **Top-K by mtime:** With `max_results` and an mtime sort, results are kept
+    in a bounded heap of K entries, so memory is O(K) however many files match.
+-   **Early Termination:** With `max_results` and no sort, the collector
+    reports `is_full` after K results so the caller can stop the walk.
+-   **Compact Entries:** Only `(mtime, path)` pairs are stored, not the
+    per-file result dicts.
+-   **Eviction Reporting:** Paths pushed out of the top-K heap by a better
+    match are reported by `take_evicted`, so matches already streamed to the
+    client can be withdrawn.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+SORT_NONE = "none"
+SORT_MTIME_DESC = "mtime_desc"
+SORT_MTIME_ASC = "mtime_asc"
+
+# 3. COLLECTOR CLASS ############################################################################################
+class ResultCollector:
+    """
+    Accumulates search matches according to a result limit and a sort order.
+    Not thread-safe; results are added from the event loop only.
+    """
+    def __init__(self, max_results: Optional[int] = None, sort: str = SORT_MTIME_DESC):
+        self.max_results = max_results if max_results and max_results > 0 else None
+        self.sort = sort
+        self.total_found = 0
+        self._counter = itertools.count()
+        # Unsorted: a plain list. Sorted: a heap whose root is the entry evicted first.
+        self._entries: List[Tuple[float, int, str]] = []
+        self._evicted: List[str] = []
+
+    @property
+    def is_full(self) -> bool:
+        """True once an unsorted search has collected `max_results` items."""
+        return self.sort == SORT_NONE and self.max_results is not None and len(self._entries) >= self.max_results
+
+    @property
+    def truncated(self) -> bool:
+        return self.max_results is not None and self.total_found > len(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, item: Dict[str, Any]) -> bool:
+        """
+        Offers a match (a dict with `path` and `mtime`). Returns True if it is
+        currently kept, False if it was dropped by the limit. A previously kept
+        entry it displaces is reported by `take_evicted`.
+        """
+        self.total_found += 1
+        if self.sort == SORT_NONE:
+            if self.is_full:
+                return False
+            self._entries.append((item.get("mtime", 0.0), next(self._counter), item["path"]))
+            return True
+
+        # Key the heap so that the entry that would be dropped first sits at the root.
+        key = item.get("mtime", 0.0) if self.sort == SORT_MTIME_DESC else -item.get("mtime", 0.0)
+        entry = (key, next(self._counter), item["path"])
+        if self.max_results is None or len(self._entries) < self.max_results:
+            heapq.heappush(self._entries, entry)
+            return True
+        dropped = heapq.heappushpop(self._entries, entry)
+        if dropped is entry:
+            return False
+        self._evicted.append(dropped[2])
+        return True
+
+    def take_evicted(self) -> List[str]:
+        """Returns and clears the paths evicted from the kept set since the last call."""
+        evicted, self._evicted = self._evicted, []
+        return evicted
+
+    def paths(self) -> List[str]:
+        """Returns the kept paths in their final order."""
+        if self.sort == SORT_NONE:
+            return [path for _, _, path in self._entries]
+        return [path for _, _, path in sorted(self._entries, key=lambda entry: (entry[0], -entry[1]), reverse=True)]
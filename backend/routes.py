@@ -36,7 +36,6 @@ import shutil
 import sys
 import subprocess
 import uuid
-import asyncio
 import sqlite3
 import json
 import logging
@@ -54,13 +53,13 @@ from .classifier_trainer import run_training_task
 from .config_manager import get_config, set_config, reset_to_defaults
 from .semantic_search import (
     run_indexing_task,
+    compact_index,
     perform_semantic_search,
     is_index_ready,
     STATUS_FILE as SEMANTIC_STATUS_FILE,
     RETRIEVAL_CONFIG
 )
 from .ai_search import run_ai_search
-from .file_engine import FileSearchEngine
 from .ai_search import summarize_results_with_llm
 
 logger = logging.getLogger(__name__)
@@ -74,6 +73,16 @@ class SearchType(str, Enum):
     FOLDER_NAME = "folder_name"
     FILE_CATEGORY = "file_category"
 
+class ResultSort(str, Enum):
+    NONE = "none"
+    MTIME_DESC = "mtime_desc"
+    MTIME_ASC = "mtime_asc"
+
+class ExecutionMode(str, Enum):
+    AUTO = "auto"
+    THREADS = "threads"
+    PROCESSES = "processes"
+
 class SearchRequest(BaseModel):
     search_path: str
     keywords: List[str]
@@ -86,6 +95,12 @@ class SearchRequest(BaseModel):
     file_category: Optional[str] = None
     min_size: Optional[int] = None
     max_size: Optional[int] = None
+    skip_binary_files: bool = False
+    search_document_text: bool = False
+    max_snippets_per_file: int = 0
+    max_results: Optional[int] = None
+    sort: ResultSort = ResultSort.MTIME_DESC
+    execution_mode: ExecutionMode = ExecutionMode.AUTO
 
 class OpenRequest(BaseModel):
     path: str
@@ -314,8 +329,8 @@ async def get_training_status():
     return JSONResponse(content=app_logic.trainer_status)
 
 # 5. SEMANTIC SEARCH API ENDPOINTS ##############################################################################
-@router.post("/api/semantic/start-indexing")
-async def start_indexing(req: IndexRequest, background_tasks: BackgroundTasks):
+def _ensure_semantic_task_idle():
+    """Raises 409 if an indexing or compaction task is already running."""
     try:
         if Path(SEMANTIC_STATUS_FILE).exists():
             with open(SEMANTIC_STATUS_FILE, "r") as f:
@@ -324,6 +339,10 @@ async def start_indexing(req: IndexRequest, background_tasks: BackgroundTasks):
     except (FileNotFoundError, json.JSONDecodeError):
         pass
 
+@router.post("/api/semantic/start-indexing")
+async def start_indexing(req: IndexRequest, background_tasks: BackgroundTasks):
+    _ensure_semantic_task_idle()
+
     if not os.path.isdir(req.search_path):
         raise HTTPException(status_code=404, detail="The specified directory does not exist.")
 
@@ -331,6 +350,13 @@ async def start_indexing(req: IndexRequest, background_tasks: BackgroundTasks):
     background_tasks.add_task(run_indexing_task, req.search_path, app_logic.DEFAULT_EXCLUDED_FOLDERS, app_logic.DEFAULT_FILE_EXTENSIONS, req.include_dot_folders)
     return JSONResponse(content={"status": "success", "message": "Semantic indexing started."})
 
+@router.post("/api/semantic/compact")
+async def start_compaction(background_tasks: BackgroundTasks):
+    _ensure_semantic_task_idle()
+    logger.info("Starting semantic index compaction.")
+    background_tasks.add_task(compact_index)
+    return JSONResponse(content={"status": "success", "message": "Index compaction started."})
+
 @router.get("/api/semantic/status")
 async def get_indexing_status():
     try:
@@ -502,11 +528,17 @@ async def reset_config():
 # 8. WEBSOCKET ENDPOINT #########################################################################################
 @router.websocket("/ws/search")
 async def websocket_search_endpoint(websocket: WebSocket):
+    """
+    Classic search protocol. The client may send any number of `start_search`
+    messages; each is answered with `scan_start` carrying its `task_id`, then
+    `items_found` (batched matches), `items_evicted` (matches a sorted, limited
+    search has dropped again) and `scan_progress` frames, followed by
+    `scan_results` pages and `scan_complete`. Every frame carries the `task_id`.
+    A `cancel_search` message with a `task_id` stops that search, which then
+    reports `scan_cancelled`. Searches still running on disconnect are cancelled.
+    """
     await websocket.accept()
-    search_task = None
     try:
-        temp_engine = FileSearchEngine(app_logic.DEFAULT_EXCLUDED_FOLDERS, app_logic.DEFAULT_FILE_EXTENSIONS)
-
         await websocket.send_json({
             "type": "config",
             "defaults": {
@@ -519,23 +551,38 @@ async def websocket_search_endpoint(websocket: WebSocket):
                 "reranker_model": get_config("reranker_model"),
                 "vectordb": get_config("vectordb"),
             },
-            "file_categories": list(temp_engine.file_categories.keys())
+            "file_categories": list(app_logic.FILE_CATEGORIES.keys())
         })
-        data = await websocket.receive_json()
-        if data.get("type") == "start_search":
-            req = SearchRequest(**data['payload'])
-            search_id = str(uuid.uuid4())
-            logger.info(f"Starting classic search (ID: {search_id}) for path: {req.search_path}")
-            await websocket.send_json({"type": "scan_start", "task_id": search_id})
-            search_task = asyncio.create_task(app_logic.FILE_SEARCH_ENGINE.run_search(websocket, search_id, req))
-            await search_task
+        while True:
+            data = await websocket.receive_json()
+            message_type = data.get("type")
+            if message_type == "start_search":
+                try:
+                    req = SearchRequest(**data['payload'])
+                except (KeyError, TypeError, ValueError) as e:
+                    await websocket.send_json({"type": "error", "message": f"Invalid search request: {e}"})
+                    continue
+                search_id = str(uuid.uuid4())
+                logger.info(f"Starting classic search (ID: {search_id}) for path: {req.search_path}")
+                await websocket.send_json({"type": "scan_start", "task_id": search_id})
+                app_logic.SEARCH_JOBS.start(
+                    search_id, websocket,
+                    lambda stop_event, search_id=search_id, req=req: app_logic.run_search(websocket, search_id, req, stop_event)
+                )
+            elif message_type == "cancel_search":
+                task_id = data.get("task_id")
+                if not app_logic.SEARCH_JOBS.cancel(task_id, owner=websocket):
+                    await websocket.send_json({"type": "error", "task_id": task_id, "message": "No running search with this task id."})
+            else:
+                await websocket.send_json({"type": "error", "message": f"Unknown message type: {message_type}"})
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected by client.")
-        if search_task and not search_task.done():
-            search_task.cancel()
     except Exception:
         logger.exception("An exception occurred in the WebSocket endpoint.")
     finally:
+        cancelled = app_logic.SEARCH_JOBS.cancel_all(websocket, force=True)
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} running search(es) for the closed connection.")
         if not websocket.client_state.name == 'DISCONNECTED':
             try:
                 await websocket.close()
@@ -0,0 +1,118 @@
+# backend/search_events.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Batched websocket event streaming for classic searches.
+
+Sending one websocket frame per match and one per progress update means that,
+on large trees, JSON encoding and socket writes cost more than the search
+itself. `SearchEventStream` sits between the search engine and the websocket:
+
+-   **Item Batching:** Matches are buffered and sent as one `items_found`
+    frame once `ITEM_BATCH_SIZE` items are pending or `ITEM_BATCH_INTERVAL`
+    has passed since the last frame.
+-   **Evictions:** Matches that a sorted, limited search later drops are
+    removed from the pending batch, or withdrawn with an `items_evicted`
+    frame if they were already sent.
+-   **Coalesced Progress:** Progress updates only record the latest counters;
+    a `scan_progress` frame is sent at most every `PROGRESS_INTERVAL`.
+-   **Fast Serializer:** When `orjson` is installed it is used to encode
+    frames, otherwise the standard `json` module is used.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson  # Optional, faster JSON encoder.
+except ImportError:
+    orjson = None
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+# Maximum number of matches sent in one `items_found` frame.
+ITEM_BATCH_SIZE = 256
+# Maximum time a match waits before its batch is sent anyway.
+ITEM_BATCH_INTERVAL = 0.1  # seconds
+# Minimum time between two `scan_progress` frames.
+PROGRESS_INTERVAL = 0.25  # seconds
+
+# 3. HELPER FUNCTIONS ###########################################################################################
+def dumps(data: Dict[str, Any]) -> str:
+    """Serializes a websocket message, preferring orjson when it is available."""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+# 4. EVENT STREAM CLASS #########################################################################################
+class SearchEventStream:
+    """
+    Buffers `item_found`-style events and progress updates for one search and
+    writes them to the websocket as batched frames.
+    """
+    def __init__(self, websocket: Any, task_id: str):
+        self.websocket = websocket
+        self.task_id = task_id
+        self._items: List[Dict[str, Any]] = []
+        self._evicted: List[str] = []
+        self._progress: Optional[Dict[str, int]] = None
+        self._last_items_sent = time.monotonic()
+        self._last_progress_sent = 0.0
+
+    async def send(self, message: Dict[str, Any]):
+        """Sends a single message immediately."""
+        await self.websocket.send_text(dumps(message))
+
+    async def item(self, item: Dict[str, Any]):
+        """Queues one match and sends the batch if it is due."""
+        self._items.append(item)
+        if len(self._items) >= ITEM_BATCH_SIZE or time.monotonic() - self._last_items_sent >= ITEM_BATCH_INTERVAL:
+            await self._send_items()
+
+    async def evict(self, paths: List[str]):
+        """Withdraws matches that are no longer part of the result set."""
+        pending = {item["path"] for item in self._items}
+        if pending.intersection(paths):
+            dropped = set(paths)
+            self._items = [item for item in self._items if item["path"] not in dropped]
+        # Paths that are no longer pending have already been sent to the client.
+        self._evicted.extend(path for path in paths if path not in pending)
+
+    async def progress(self, scanned: int, found: int):
+        """Records the latest counters and sends them if the progress interval has passed."""
+        self._progress = {"scanned": scanned, "found": found}
+        now = time.monotonic()
+        if now - self._last_progress_sent >= PROGRESS_INTERVAL:
+            await self._send_items()
+            await self._send_progress(now)
+        elif self._items and now - self._last_items_sent >= ITEM_BATCH_INTERVAL:
+            await self._send_items()
+
+    async def flush(self):
+        """Sends all pending items, evictions and the latest progress, e.g. before the final results."""
+        await self._send_items()
+        if self._progress is not None:
+            await self._send_progress(time.monotonic())
+
+    async def _send_items(self):
+        self._last_items_sent = time.monotonic()
+        if self._evicted:
+            evicted, self._evicted = self._evicted, []
+            await self.send({"type": "items_evicted", "task_id": self.task_id, "paths": evicted})
+        if not self._items:
+            return
+        items, self._items = self._items, []
+        await self.send({"type": "items_found", "task_id": self.task_id, "items": items})
+
+    async def _send_progress(self, now: float):
+        progress, self._progress = self._progress, None
+        self._last_progress_sent = now
+        await self.send({"type": "scan_progress", "task_id": self.task_id, "progress": progress})
@@ -0,0 +1,85 @@
+# backend/search_jobs.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Registry of running classic searches.
+
+Each search started over a websocket is registered as a job with its asyncio
+task and a `threading.Event` shared with the crawler and the worker threads.
+Cancelling a job sets that event, so the walker and the workers stop within
+one poll interval instead of running on after the client has lost interest.
+
+Key Features:
+-   **Multiple Searches per Socket:** Jobs are keyed by task id and grouped
+    by owner (the websocket), so one connection can run several searches.
+-   **Cooperative Cancellation:** `cancel()` sets the job's stop event; the
+    engine notices it, winds the pipeline down and reports `scan_cancelled`.
+-   **Cleanup:** Finished jobs remove themselves; `cancel_all()` stops every
+    job of an owner, e.g. when its websocket disconnects.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import asyncio
+import threading
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+# 3. JOB CLASSES ################################################################################################
+class SearchJob:
+    """A running search: its task, its stop event and the connection that owns it."""
+    def __init__(self, task_id: str, owner: Any, stop_event: threading.Event):
+        self.task_id = task_id
+        self.owner = owner
+        self.stop_event = stop_event
+        self.task: Optional[asyncio.Task] = None
+
+    def cancel(self, force: bool = False):
+        """Requests a cooperative stop; `force` also cancels the asyncio task."""
+        self.stop_event.set()
+        if force and self.task is not None and not self.task.done():
+            self.task.cancel()
+
+class SearchJobRegistry:
+    """Starts, tracks and cancels search jobs. Used from the event loop only."""
+    def __init__(self):
+        self._jobs: Dict[str, SearchJob] = {}
+
+    def start(self, task_id: str, owner: Any, run: Callable[[threading.Event], Awaitable[Any]]) -> SearchJob:
+        """Runs `run(stop_event)` as a new task and registers it under `task_id`."""
+        job = SearchJob(task_id, owner, threading.Event())
+        job.task = asyncio.create_task(run(job.stop_event))
+        job.task.add_done_callback(lambda _: self._finish(task_id))
+        self._jobs[task_id] = job
+        logger.debug(f"Search job {task_id} started ({len(self._jobs)} running).")
+        return job
+
+    def _finish(self, task_id: str):
+        job = self._jobs.pop(task_id, None)
+        if job is not None and not job.task.cancelled() and job.task.exception() is not None:
+            logger.error(f"Search job {task_id} failed.", exc_info=job.task.exception())
+
+    def cancel(self, task_id: str, owner: Any = None) -> bool:
+        """Cancels a job if it exists (and, when given, belongs to `owner`)."""
+        job = self._jobs.get(task_id)
+        if job is None or (owner is not None and job.owner is not owner):
+            return False
+        logger.info(f"Cancelling search job {task_id}.")
+        job.cancel()
+        return True
+
+    def cancel_all(self, owner: Any, force: bool = False) -> int:
+        """Cancels every job of `owner` and returns how many there were."""
+        jobs = [job for job in self._jobs.values() if job.owner is owner]
+        for job in jobs:
+            job.cancel(force)
+        return len(jobs)
+
+    def active(self, owner: Any = None) -> List[str]:
+        return [task_id for task_id, job in self._jobs.items() if owner is None or job.owner is owner]
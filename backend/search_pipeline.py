@@ -0,0 +1,166 @@
+# backend/search_pipeline.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Bounded producer/consumer pipeline for classic searches.
+
+The pipeline connects three stages:
+
+1.  **Walker:** A single thread that pulls directory listings from the
+    `ParallelCrawler` and submits the selected entries (files, or directories
+    for folder searches) to an executor in chunks of `WORK_CHUNK_SIZE`.
+2.  **Workers:** The executor's threads, normally a `PoolClient` of the
+    engine's shared `WorkerPool`, run the per-entry processing function over
+    each chunk and hand the results to the event loop.
+3.  **Consumer:** An async generator on the event loop (`batches()`) that
+    yields the results of every chunk that has completed.
+
+The number of chunks that are submitted but not yet consumed is bounded, so a
+slow consumer throttles the walker (backpressure) and memory stays constant no
+matter how many files a directory contains. Workers never block on the
+consumer, so a slow search cannot hold threads of the shared pool hostage.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .fs_crawler import ParallelCrawler
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+# Maximum number of entries processed by one executor task.
+WORK_CHUNK_SIZE = 64
+# How often blocked threads and the consumer re-check the stop flag.
+POLL_INTERVAL = 0.02  # seconds
+
+class _WalkDone:
+    """Posted by the walker once every chunk has been submitted."""
+    def __init__(self, chunks: int):
+        self.chunks = chunks
+
+# 3. PIPELINE CLASS #############################################################################################
+class SearchPipeline:
+    """
+    Runs `process_func` over every entry found by a crawler on `executor` and
+    streams the results to the event loop in batches. The pipeline owns the
+    executor and shuts it down (cancelling queued chunks) when it finishes.
+    """
+    def __init__(self, crawler: ParallelCrawler, root: str, process_func: Callable[[Any], Dict[str, Any]],
+                 executor: Any, max_pending_chunks: int, select_directories: bool = False,
+                 process_chunk_func: Optional[Callable[[List[Any]], List[Dict[str, Any]]]] = None):
+        self.crawler = crawler
+        self.root = root
+        self.process_func = process_func
+        # Optional replacement for per-entry processing that handles a whole chunk at once.
+        self.process_chunk_func = process_chunk_func
+        self.executor = executor
+        self.select_directories = select_directories
+        self.stop_event = crawler.stop_event
+        self._slots = threading.Semaphore(max(1, max_pending_chunks))
+        self.results: asyncio.Queue = None
+        self.loop: asyncio.AbstractEventLoop = None
+
+    def stop(self):
+        """Asks the walker and the workers to finish as soon as possible."""
+        self.stop_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Thread side ----------------------------------------------------------------------------------------------
+    def _post(self, item: Any) -> bool:
+        try:
+            self.loop.call_soon_threadsafe(self.results.put_nowait, item)
+            return True
+        except RuntimeError:
+            # The event loop has already been closed; nobody is listening anymore.
+            return False
+
+    def _acquire_slot(self) -> bool:
+        while not self.stop_event.is_set():
+            if self._slots.acquire(timeout=POLL_INTERVAL):
+                return True
+        return False
+
+    def _process_chunk(self, entries: List[Any]) -> List[Dict[str, Any]]:
+        if self.process_chunk_func is not None:
+            return [] if self.stop_event.is_set() else self.process_chunk_func(entries)
+        results = []
+        for entry in entries:
+            if self.stop_event.is_set():
+                break
+            try:
+                results.append(self.process_func(entry))
+            except Exception:
+                results.append({"status": "error_processing"})
+        return results
+
+    def _chunk_done(self, future: Future):
+        # Every submitted chunk posts exactly once, even if it was cancelled, so the consumer can count them.
+        failed = future.cancelled() or future.exception() is not None
+        self._post([] if failed else future.result())
+
+    def _walker(self):
+        listings = self.crawler.crawl(self.root)
+        submitted = 0
+        try:
+            for _, dir_entries, file_entries in listings:
+                entries = dir_entries if self.select_directories else file_entries
+                for start in range(0, len(entries), WORK_CHUNK_SIZE):
+                    if not self._acquire_slot():
+                        return
+                    try:
+                        future = self.executor.submit(self._process_chunk, entries[start:start + WORK_CHUNK_SIZE])
+                    except RuntimeError:
+                        return  # The executor was shut down by stop().
+                    submitted += 1
+                    future.add_done_callback(self._chunk_done)
+        except Exception:
+            logger.exception(f"Directory crawl of '{self.root}' failed.")
+        finally:
+            listings.close()
+            self._post(_WalkDone(submitted))
+
+    # --- Event-loop side ------------------------------------------------------------------------------------------
+    async def batches(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Starts the pipeline and yields result batches until every chunk has been processed."""
+        self.loop = asyncio.get_running_loop()
+        self.results = asyncio.Queue()
+        threading.Thread(target=self._walker, name="search-walker", daemon=True).start()
+
+        expected, received = None, 0
+        try:
+            while expected is None or received < expected:
+                try:
+                    item = await asyncio.wait_for(self.results.get(), POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    if self.stop_event.is_set():
+                        break
+                    continue
+                # Merge everything that is already waiting into one batch.
+                batch: List[Dict[str, Any]] = []
+                while True:
+                    if isinstance(item, _WalkDone):
+                        expected = item.chunks
+                    else:
+                        received += 1
+                        self._slots.release()
+                        batch.extend(item)
+                    if self.results.empty():
+                        break
+                    item = self.results.get_nowait()
+                if batch:
+                    yield batch
+        finally:
+            if expected is None or received < expected:
+                self.stop()
+            else:
+                # Finished normally: release the executor but leave the (shared) stop flag alone.
+                self.executor.shutdown(wait=False, cancel_futures=True)
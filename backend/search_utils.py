@@ -15,7 +15,9 @@ strategy is chosen.
 
 The main function, `perform_classic_search`, uses wildcard matching (`fnmatch`)
 to efficiently find items that match a given pattern within a directory tree,
-respecting configured exclusion rules.
+respecting configured exclusion rules. When the persistent file catalog already
+covers the search path, the searched subtree of the catalog is brought up to
+date and the items are read from it instead of walking the disk.
 """
 
 # 1. IMPORTS & SETUP ############################################################################################
@@ -25,18 +27,21 @@ import fnmatch
 import logging
 from typing import List, Set
 from .config_manager import get_config
+from .file_catalog import get_file_catalog
+from .fs_crawler import ParallelCrawler
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_EXCLUDED_FOLDERS: Set[str] = set(get_config("excluded_folders"))
+CLASSIC_SEARCH_PARAMS = get_config("classic_search_params") or {}
 
 # 2. CORE SEARCH FUNCTION #######################################################################################
 async def perform_classic_search(search_path: str, keywords: List[str], search_type: str, case_sensitive: bool = False) -> List[str]:
     """
     Performs a classic file/folder search using wildcard matching.
 
-    This is an asynchronous function that runs the blocking `os.walk` in a separate
-    thread to avoid blocking the event loop.
+    This is an asynchronous function that runs the blocking catalog query or
+    parallel directory crawl in a separate thread to avoid blocking the event loop.
 
     Args:
         search_path: The root directory to start the search from.
@@ -61,23 +66,46 @@ async def perform_classic_search(search_path: str, keywords: List[str], search_t
         else:
             return fnmatch.fnmatch(text, pattern)
 
+    catalog = get_file_catalog() if CLASSIC_SEARCH_PARAMS.get("enable_file_catalog", True) else None
+
+    def search_catalog() -> bool:
+        prepared = catalog.prepare_search(search_path, DEFAULT_EXCLUDED_FOLDERS, False)
+        if prepared is None:
+            return False
+        root_id, catalog_root = prepared
+        if search_type == "folder_name":
+            items = ((path, name) for path, name, _ in catalog.iter_directories(root_id, search_path))
+        else:
+            items = ((path, name) for path, name, _, _ in catalog.iter_files(root_id, search_path))
+        for path, name in items:
+            if is_match_sync(name) and os.path.exists(path):
+                found_items.append(path)
+        catalog.schedule_refresh(
+            catalog_root, DEFAULT_EXCLUDED_FOLDERS, False, CLASSIC_SEARCH_PARAMS.get("catalog_refresh_interval", 60)
+        )
+        return True
+
     loop = asyncio.get_event_loop()
     def walk_and_search():
         if not os.path.isdir(search_path):
             logger.warning(f"Classic search path '{search_path}' does not exist or is not a directory.")
             return
 
-        for dirpath, dirnames, filenames in os.walk(search_path, topdown=True):
-            dirnames[:] = [d for d in dirnames if d not in DEFAULT_EXCLUDED_FOLDERS and not d.startswith('.')]
+        if catalog and search_type in ("file_name", "folder_name"):
+            if search_catalog():
+                return
+            catalog.schedule_refresh(search_path, DEFAULT_EXCLUDED_FOLDERS, False)
 
+        crawler = ParallelCrawler(DEFAULT_EXCLUDED_FOLDERS, include_dot_folders=False)
+        for _, dir_entries, file_entries in crawler.crawl(search_path):
             if search_type == "folder_name":
-                for dirname in dirnames:
-                    if is_match_sync(dirname):
-                        found_items.append(os.path.join(dirpath, dirname))
+                for dir_entry in dir_entries:
+                    if is_match_sync(dir_entry.name):
+                        found_items.append(dir_entry.path)
             elif search_type == "file_name":
-                for filename in filenames:
-                    if is_match_sync(filename):
-                        found_items.append(os.path.join(dirpath, filename))
+                for file_entry in file_entries:
+                    if is_match_sync(file_entry.name):
+                        found_items.append(file_entry.path)
 
     await loop.run_in_executor(None, walk_and_search)
     logger.info(f"Classic search found {len(found_items)} items for pattern '{pattern}'.")
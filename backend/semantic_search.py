@@ -15,8 +15,9 @@ Retrieval-Augmented Generation (RAG) pipeline with embeddings, a vector database
 
 Key functionalities include:
 - **Indexing (`run_indexing_task`):** Scans a specified directory, loads supported
-  documents. It uses PyMuPDF for fast, self-contained PDF parsing and falls back
-  to `unstructured` for other file types. It then splits documents into parent/child
+  documents in a pool of worker processes through the shared, cached
+  `text_extraction` service (PyMuPDF for PDFs, `unstructured` for other file
+  types), skipping any file that takes longer than `indexing_params.load_timeout`. It then splits documents into parent/child
   chunks, generates embeddings, and upserts them into a Qdrant vector store.
 - **Document Storage:** Implements a persistent document store using an SQLite
   database (`docstore.db`). This stores the larger parent chunks, which are
@@ -32,25 +33,37 @@ Key functionalities include:
   they are ready for use.
 - **State Management:** Manages the status of the indexing process through a
   JSON file, allowing the frontend to monitor progress.
-- **File Change Tracking:** Tracks file modification times to avoid re-indexing
-  unchanged files.
+- **File Change Tracking:** Tracks each file's modification time, size and
+  content hash. A file is only re-indexed when its content changed; the hash is
+  only computed when the modification time changed but the size did not, so
+  touched or restored files are skipped cheaply. The docstore and the vector store are maintained
+  incrementally per source file: re-indexing a file replaces its parent chunks
+  and vectors (via a payload index on `source`). Files a run no longer finds
+  (deleted, moved into an excluded folder or of a deselected extension) are
+  removed, as are modified files that no longer yield any text. Chunk ids are deterministic, so chunks that did not change keep
+  their vectors and are not re-embedded, and the persistent `embedding_cache`
+  serves any chunk text that was embedded before. `compact_index` cleans up what older
+  runs left behind.
 """
 
 # 1. IMPORTS & SETUP ############################################################################################
 import json
 import uuid
+import hashlib
 import sqlite3
 import os
+import time
 import logging
+from collections import deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Set, Dict, Any, Tuple
+from typing import Deque, Iterable, Iterator, List, NamedTuple, Optional, Set, Dict, Any, Tuple
 
-import fitz
 from langchain_core.documents import Document
 
 from qdrant_client import QdrantClient, models
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_unstructured import UnstructuredLoader
 from .rag_pipeline import (
     initialize_embedding_model,
     initialize_reranker_model,
@@ -59,6 +72,9 @@ from .rag_pipeline import (
 )
 from .config_manager import get_config, DATA_FOLDER
 from .security_utils import validate_and_resolve_path
+from .text_extraction import extract_text_and_hash, file_digest
+from .process_search import create_process_pool, terminate_process_pool
+from .embedding_cache import get_embedding_cache
 
 
 # 2. CONFIGURATION & GLOBAL STATE ###############################################################################
@@ -66,6 +82,16 @@ logger = logging.getLogger(__name__)
 
 STATUS_FILE = os.path.join(DATA_FOLDER, "semantic_status.json")
 DOCSTORE_DB_FILE = os.path.join(DATA_FOLDER, "docstore.db")
+# Child chunks embedded and upserted per micro-batch; bounds the memory used by indexing.
+INDEX_BATCH_SIZE = 256
+# Source paths per path-scoped Qdrant delete request.
+DELETE_BATCH_SIZE = 256
+# Points read per scroll request when listing or compacting the collection.
+SCROLL_BATCH_SIZE = 1000
+# Seconds a loader process may spend on one file before the file is skipped and the process replaced.
+DEFAULT_LOAD_TIMEOUT = 120
+# Namespace of the deterministic (uuid5) parent and child chunk ids.
+CHUNK_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "precision-file-search/chunks")
 
 EMBEDDING_CONFIG = get_config("embedding_model")
 RERANKER_CONFIG = get_config("reranker_model")
@@ -128,54 +154,84 @@ def init_docstore_db():
                     source_path TEXT
                 )
             ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_parent_documents_source ON parent_documents (source_path)")
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS file_state (
                     file_path TEXT PRIMARY KEY,
-                    modified_time REAL NOT NULL
+                    modified_time REAL NOT NULL,
+                    size INTEGER,
+                    content_hash TEXT
                 )
             ''')
+            # Databases created before content-hash change detection only have the modification time.
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(file_state)")}
+            for column, column_type in (("size", "INTEGER"), ("content_hash", "TEXT")):
+                if column not in columns:
+                    cursor.execute(f"ALTER TABLE file_state ADD COLUMN {column} {column_type}")
             conn.commit()
         logger.debug("Docstore database initialized successfully.")
     except Exception:
         logger.exception("Failed to initialize the docstore SQLite database.")
 
 
-def _save_docstore_to_db(parent_docs_to_save: List[Tuple[str, str, str]]):
-    """Saves the provided parent documents to the SQLite database, replacing old ones."""
+def _save_docstore_to_db(parent_docs_to_save: List[Tuple[str, str, str]], source_paths: Iterable[str] = ()):
+    """
+    Replaces the parent documents of `source_paths` with the provided ones in a
+    single transaction. Parents of all other files are left untouched.
+    """
     try:
         with sqlite3.connect(DOCSTORE_DB_FILE) as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM parent_documents")
-            if parent_docs_to_save:
-                cursor.executemany("INSERT INTO parent_documents (id, content, source_path) VALUES (?, ?, ?)", parent_docs_to_save)
+            cursor.executemany("DELETE FROM parent_documents WHERE source_path = ?", [(path,) for path in source_paths])
+            cursor.executemany(
+                "INSERT OR REPLACE INTO parent_documents (id, content, source_path) VALUES (?, ?, ?)", parent_docs_to_save
+            )
             conn.commit()
-        logger.info(f"Successfully saved {len(parent_docs_to_save)} parent documents to the persistent cache.")
+        logger.debug(f"Saved {len(parent_docs_to_save)} parent documents to the persistent cache.")
     except Exception:
         logger.exception("Failed to save documents to the docstore database.")
+        raise
 
-def _save_file_state(file_states: Dict[str, float]):
-    """Saves file paths and their modification times to the SQLite database."""
+def _remove_files_from_docstore(file_paths: List[str]):
+    """Deletes the parent documents and file states of files that are no longer indexed."""
     try:
         with sqlite3.connect(DOCSTORE_DB_FILE) as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM file_state")
-            if file_states:
-                cursor.executemany(
-                    "INSERT INTO file_state (file_path, modified_time) VALUES (?, ?)",
-                    [(path, mtime) for path, mtime in file_states.items()]
-                )
+            rows = [(path,) for path in file_paths]
+            cursor.executemany("DELETE FROM parent_documents WHERE source_path = ?", rows)
+            cursor.executemany("DELETE FROM file_state WHERE file_path = ?", rows)
+            conn.commit()
+        logger.info(f"Removed {len(file_paths)} files from the docstore.")
+    except Exception:
+        logger.exception("Failed to remove files from the docstore database.")
+        raise
+
+def _save_file_state(file_states: Dict[str, "FileState"]):
+    """Records the states of indexed files, keeping the states of all other files."""
+    try:
+        with sqlite3.connect(DOCSTORE_DB_FILE) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT OR REPLACE INTO file_state (file_path, modified_time, size, content_hash) VALUES (?, ?, ?, ?)",
+                [(path, *state) for path, state in file_states.items()]
+            )
             conn.commit()
-        logger.info(f"Saved {len(file_states)} file states to the database.")
+        logger.debug(f"Saved {len(file_states)} file states to the database.")
     except Exception:
         logger.exception("Failed to save file states to the database.")
+        raise
 
-def _get_file_state() -> Dict[str, float]:
-    """Retrieves file paths and their modification times from the SQLite database."""
+def _get_file_state() -> Dict[str, "FileState"]:
+    """Retrieves file paths and their recorded states from the SQLite database."""
     try:
         with sqlite3.connect(DOCSTORE_DB_FILE) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT file_path, modified_time FROM file_state")
-            return {row[0]: row[1] for row in cursor.fetchall()}
+            cursor.execute("SELECT file_path, modified_time, size, content_hash FROM file_state")
+            # Hashes stored before file_state had its own digest carry an "<extractor version>:" prefix.
+            return {
+                path: FileState(mtime, size, content_hash.rpartition(":")[2] if content_hash else None)
+                for path, mtime, size, content_hash in cursor.fetchall()
+            }
     except Exception:
         logger.exception("Failed to retrieve file states from the database.")
         return {}
@@ -199,6 +255,53 @@ def _get_parent_chunks_from_db(parent_ids: List[str]) -> Dict[str, str]:
         return {}
 
 
+def _ensure_collection(client: QdrantClient, collection_name: str):
+    """Creates the collection if needed, with the keyword payload index on `source` used by path-scoped deletes."""
+    collection_exists = any(
+        coll.name == collection_name for coll in client.get_collections().collections
+    )
+    if not collection_exists:
+        client.recreate_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(size=EMBEDDING_DIMENSION, distance=models.Distance.COSINE)
+        )
+    try:
+        client.create_payload_index(
+            collection_name=collection_name, field_name="source", field_schema=models.PayloadSchemaType.KEYWORD, wait=True
+        )
+    except Exception:
+        logger.debug("Could not create the payload index on 'source'; it may already exist.", exc_info=True)
+
+def _delete_vectors_for_sources(client: QdrantClient, collection_name: str, source_paths: Iterable[str]):
+    """Deletes every child point whose `source` payload is one of `source_paths`."""
+    paths = list(source_paths)
+    for start in range(0, len(paths), DELETE_BATCH_SIZE):
+        client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(filter=models.Filter(must=[
+                models.FieldCondition(key="source", match=models.MatchAny(any=paths[start:start + DELETE_BATCH_SIZE]))
+            ])),
+            wait=True
+        )
+
+def _get_vector_ids_for_sources(client: QdrantClient, collection_name: str, source_paths: List[str]) -> Set[str]:
+    """Returns the ids of every child point whose `source` payload is one of `source_paths`."""
+    point_ids: Set[str] = set()
+    for start in range(0, len(source_paths), DELETE_BATCH_SIZE):
+        scroll_filter = models.Filter(must=[
+            models.FieldCondition(key="source", match=models.MatchAny(any=source_paths[start:start + DELETE_BATCH_SIZE]))
+        ])
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection_name, scroll_filter=scroll_filter, limit=SCROLL_BATCH_SIZE,
+                offset=offset, with_payload=False, with_vectors=False
+            )
+            point_ids.update(str(point.id) for point in points)
+            if offset is None:
+                break
+    return point_ids
+
 # 5. CORE INDEXING LOGIC ########################################################################################
 def is_index_ready():
     """Checks if the Qdrant vector store and the docstore DB are populated."""
@@ -221,15 +324,199 @@ def is_index_ready():
     except Exception:
         return False
 
-def _update_status(status: str, progress: int, total: int, current_file: str = ""):
+def _update_status(status: str, progress: int, total: int, current_file: str = "", skipped: int = 0):
     try:
         with open(STATUS_FILE, "w", encoding="utf-8") as f:
-            json.dump({"status": status, "progress": progress, "total": total, "current_file": current_file}, f)
+            json.dump({
+                "status": status, "progress": progress, "total": total, "current_file": current_file, "skipped": skipped
+            }, f)
     except Exception:
         logger.warning("Failed to update semantic status file.", exc_info=True)
 
+def _chunk_id(scope: str, ordinal: int, content: str) -> str:
+    """Derives a stable point/parent id from where a chunk sits and what it contains."""
+    content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{scope}\x00{ordinal}\x00{content_hash}"))
+
+class FileState(NamedTuple):
+    """What indexing remembers about a file to tell whether its content changed."""
+    modified_time: float
+    size: Optional[int]
+    content_hash: Optional[str]
+
+def _content_unchanged(file_path: Path, previous: FileState) -> Tuple[bool, Optional[FileState]]:
+    """
+    Compares a file against its recorded state. The content is only hashed
+    when the modification time changed but the size did not. Returns whether
+    the content is unchanged and, if the file had to be hashed, its new state
+    (with the size and mtime read before hashing).
+    """
+    stat_info = file_path.stat()
+    if stat_info.st_mtime == previous.modified_time:
+        if previous.size is None:
+            # Recorded before sizes and hashes were tracked: fill them in once.
+            return True, FileState(stat_info.st_mtime, stat_info.st_size, file_digest(str(file_path)))
+        if stat_info.st_size == previous.size:
+            return True, None
+    if stat_info.st_size != previous.size or previous.content_hash is None:
+        return False, None
+    state = FileState(stat_info.st_mtime, stat_info.st_size, file_digest(str(file_path)))
+    return state.content_hash == previous.content_hash, state
+
+def _load_documents(files: List[Tuple[Path, Optional[FileState]]], workers: int,
+                    timeout: float) -> Iterator[List[Tuple[Path, Optional[Document], Optional[FileState]]]]:
+    """
+    Loads files in a process pool, one file per task and at most `workers`
+    at a time, and yields the files that finished since the last batch as
+    `(path, document, state)`. A file's state comes from the stat taken before
+    it was read; a digest in its known state (from change detection) is reused
+    if the file was not modified since. The document and state are None for files
+    that failed, timed out or contain no text. A file still running after
+    `timeout` seconds is skipped; as a worker cannot be interrupted, the pool
+    is replaced and the other files in flight are submitted again. If a
+    worker crashes, the files that were in flight are skipped and the pool
+    is replaced as well.
+    """
+    queued: Deque[Tuple[Path, Optional[FileState]]] = deque(files)
+    in_flight: Dict[Future, Tuple[Path, Optional[FileState], float]] = {}
+    pool = create_process_pool(workers)
+    broken = False
+    try:
+        while queued or in_flight:
+            while not broken and queued and len(in_flight) < workers:
+                file_path, known_state = queued.popleft()
+                known = (known_state.content_hash, known_state.size, known_state.modified_time) if known_state else ()
+                try:
+                    future = pool.submit(extract_text_and_hash, str(file_path), *known)
+                except BrokenProcessPool:
+                    # A worker died; the files in flight fail below, then the pool is replaced.
+                    queued.appendleft((file_path, known_state))
+                    broken = True
+                    break
+                in_flight[future] = (file_path, known_state, time.monotonic() + timeout)
+            finished = set()
+            if in_flight:
+                next_deadline = min(deadline for _, _, deadline in in_flight.values())
+                finished, _ = wait(in_flight, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+
+            loaded: List[Tuple[Path, Optional[Document], Optional[FileState]]] = []
+            for future in finished:
+                file_path, _, _ = in_flight.pop(future)
+                try:
+                    text, content_hash, size, mtime = future.result()
+                    if text.strip():
+                        doc = Document(page_content=text, metadata={'source': str(file_path)})
+                        loaded.append((file_path, doc, FileState(mtime, size, content_hash)))
+                        continue
+                    logger.info(
+                        f"Skipping file '{file_path.name}' as it contains no extractable text. "
+                        "It might be a scanned or image-only document."
+                    )
+                except BrokenProcessPool:
+                    broken = True
+                    logger.warning(f"A loader process crashed while '{file_path}' was in flight; skipping it.")
+                except Exception as e:
+                    logger.warning(f"Could not load file '{file_path}'. Error: {e}", exc_info=True)
+                loaded.append((file_path, None, None))
+
+            now = time.monotonic()
+            expired = [future for future, (_, _, deadline) in in_flight.items() if deadline <= now]
+            if expired:
+                for future in expired:
+                    file_path, _, _ = in_flight.pop(future)
+                    logger.warning(f"Loading '{file_path}' took longer than {timeout:g} seconds; skipping it.")
+                    loaded.append((file_path, None, None))
+                queued.extendleft(reversed([(file_path, known_state) for file_path, known_state, _ in in_flight.values()]))
+                in_flight.clear()
+            if expired or (broken and not in_flight):
+                terminate_process_pool(pool)
+                pool = create_process_pool(workers)
+                broken = False
+            if loaded:
+                yield loaded
+    finally:
+        terminate_process_pool(pool)
+
+class _IndexBatch:
+    """Parent rows, child chunks and file states of one indexing micro-batch."""
+    def __init__(self):
+        self.parent_rows: List[Tuple[str, str, str]] = []
+        self.child_docs: List[Document] = []
+        self.child_ids: List[str] = []
+        self.file_states: Dict[str, FileState] = {}
+        # Files of this batch that were indexed before and may already have points.
+        self.reindexed_sources: List[str] = []
+
+    def add_document(self, doc: Document, parent_splitter, child_splitter):
+        """
+        Splits a loaded document into parent chunks and their child chunks. Ids
+        are derived from the source path, the chunk's ordinal and its content,
+        so identical chunks always get identical ids.
+        """
+        source_path = doc.metadata.get('source', '')
+        for parent_ordinal, parent_doc in enumerate(parent_splitter.split_documents([doc])):
+            parent_id = _chunk_id(source_path, parent_ordinal, parent_doc.page_content)
+            self.parent_rows.append((parent_id, parent_doc.page_content, source_path))
+
+            for child_ordinal, chunk in enumerate(child_splitter.split_documents([parent_doc])):
+                chunk.metadata = parent_doc.metadata.copy()
+                chunk.metadata["parent_id"] = parent_id
+                self.child_docs.append(chunk)
+                self.child_ids.append(_chunk_id(parent_id, child_ordinal, chunk.page_content))
+
+def _flush_index_batch(client: QdrantClient, collection_name: str, batch: _IndexBatch, totals: Dict[str, int]):
+    """
+    Brings the vectors of a micro-batch's files up to date, then persists its
+    parents and file states. Points whose deterministic id already exists are
+    kept as they are, so only new or changed chunks are upserted (and embedded
+    unless the embedding cache already knows their text), and points of
+    re-indexed files that no longer exist are deleted. Vectors are written
+    first, so a file is only marked as indexed once all of its chunks are
+    searchable.
+    """
+    if not batch.file_states:
+        return
+    existing_ids = _get_vector_ids_for_sources(client, collection_name, batch.reindexed_sources)
+    stale_ids = list(existing_ids.difference(batch.child_ids))
+    for start in range(0, len(stale_ids), DELETE_BATCH_SIZE):
+        client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=stale_ids[start:start + DELETE_BATCH_SIZE]),
+            wait=True
+        )
+
+    embedding_cache = get_embedding_cache(EMBEDDING_CONFIG["model_name"])
+    pending = [(point_id, doc) for point_id, doc in zip(batch.child_ids, batch.child_docs) if point_id not in existing_ids]
+    for start in range(0, len(pending), INDEX_BATCH_SIZE):
+        chunk_points = pending[start:start + INDEX_BATCH_SIZE]
+        vectors = embedding_cache.embed_documents(EMBEDDINGS, [doc.page_content for _, doc in chunk_points])
+        client.upsert(
+            collection_name=collection_name,
+            points=[
+                models.PointStruct(id=point_id, vector=vector, payload=doc.metadata)
+                for (point_id, doc), vector in zip(chunk_points, vectors)
+            ],
+            wait=True
+        )
+    _save_docstore_to_db(batch.parent_rows, batch.file_states)
+    _save_file_state(batch.file_states)
+    totals["files"] += len(batch.file_states)
+    totals["parents"] += len(batch.parent_rows)
+    totals["children"] += len(batch.child_docs)
+    totals["unchanged"] += len(batch.child_docs) - len(pending)
+    logger.debug(
+        f"Indexed a batch of {len(batch.file_states)} files: {len(pending)} chunks embedded, "
+        f"{len(batch.child_docs) - len(pending)} unchanged, {len(stale_ids)} stale points deleted."
+    )
+
 def run_indexing_task(search_path: str, excluded_folders: Set[str], file_extensions: List[str], include_dot_folders: bool):
-    """Scans, splits, and indexes documents into a persistent Qdrant vector store."""
+    """
+    Scans, splits, and indexes documents into a persistent Qdrant vector store.
+    Files are loaded in a process pool (`indexing_params.loader_workers`) and
+    stream through split, embed and upsert in micro-batches of about
+    `INDEX_BATCH_SIZE` child chunks, so memory stays bounded regardless of corpus
+    size and every completed batch survives a failure later in the run.
+    """
     try:
         validated_path = validate_and_resolve_path(search_path)
         logger.info(f"Starting semantic indexing task for validated path: {validated_path}")
@@ -262,122 +549,113 @@ def run_indexing_task(search_path: str, excluded_folders: Set[str], file_extensi
             (include_dot_folders or not any(part.startswith('.') for part in p.parts))
         ]
 
-        files_to_process = []
+        # Files whose mtime changed but whose content did not (touch, rsync, restores) are skipped; only
+        # their recorded mtime is refreshed. Hashes computed here are reused when the file is indexed.
+        files_to_process: List[Tuple[Path, Optional[FileState]]] = []
+        touched_states: Dict[str, FileState] = {}
+        backfilled_states: Dict[str, FileState] = {}
         for file_path in all_filepaths:
-            current_mtime = file_path.stat().st_mtime
-            previous_mtime = previous_file_states.get(str(file_path))
-            if previous_mtime is None or current_mtime != previous_mtime:
-                files_to_process.append(file_path)
+            previous_state = previous_file_states.get(str(file_path))
+            if previous_state is None:
+                files_to_process.append((file_path, None))
+                continue
+            unchanged, current_state = _content_unchanged(file_path, previous_state)
+            if not unchanged:
+                files_to_process.append((file_path, current_state))
+            elif current_state is not None and current_state.modified_time == previous_state.modified_time:
+                backfilled_states[str(file_path)] = current_state
+            elif current_state is not None:
+                touched_states[str(file_path)] = current_state
+        skipped = len(touched_states)
+        if touched_states:
+            logger.info(f"Skipping {skipped} files whose modification time changed but whose content did not.")
+        if touched_states or backfilled_states:
+            _save_file_state({**touched_states, **backfilled_states})
+
+        logger.info(f"Phase 2: Setting up vector collection '{collection_name}' and removing files no longer in scope...")
+        _update_status("running", 0, 0, "Setting up vector collection...")
+        _ensure_collection(client, collection_name)
+
+        # Files indexed under this root earlier that this scan did not find: deleted from disk, now inside an
+        # excluded or dot folder, or of an extension that is no longer selected.
+        root_prefix = os.path.join(validated_path, "")
+        scanned_paths = {str(file_path) for file_path in all_filepaths}
+        removed_files = [
+            path for path in previous_file_states if path.startswith(root_prefix) and path not in scanned_paths
+        ]
+        if removed_files:
+            _update_status("running", 0, 0, f"Removing {len(removed_files)} files from the index...")
+            _delete_vectors_for_sources(client, collection_name, removed_files)
+            _remove_files_from_docstore(removed_files)
 
         files_to_index = len(files_to_process)
         if files_to_index == 0:
             logger.info("No new or modified files to index.")
-            _update_status("complete", len(all_filepaths), len(all_filepaths), "No changes detected.")
-            return
-
-        logger.info(f"Phase 2: Loading and processing {files_to_index} new/modified documents...")
-        _update_status("running", 0, files_to_index, f"Found {files_to_index} changed files, starting processing...")
-        docs = []
-        processed_file_states = {}
-
-        for i, file_path in enumerate(files_to_process):
-            _update_status("running", i + 1, files_to_index, f"Loading: {file_path.name}")
-            try:
-                loaded_content = False
-                if file_path.suffix.lower() == ".pdf":
-                    with fitz.open(file_path) as pdf_doc:
-                        full_text = "".join(page.get_text() for page in pdf_doc)
-
-                    if full_text.strip():
-                        metadata = {'source': str(file_path)}
-                        doc = Document(page_content=full_text, metadata=metadata)
-                        docs.append(doc)
-                        loaded_content = True
-                    else:
-                        logger.info(
-                            f"Skipping PDF file '{file_path.name}' as it contains no extractable digital text. "
-                            "It might be a scanned or image-only document."
-                        )
-
-                else:
-                    loader = UnstructuredLoader(str(file_path), mode="elements")
-                    loaded_docs = loader.load()
-                    if loaded_docs:
-                        for doc in loaded_docs:
-                            doc.metadata['source'] = str(file_path)
-                        docs.extend(loaded_docs)
-                        loaded_content = True
-
-                if loaded_content:
-                    processed_file_states[str(file_path)] = file_path.stat().st_mtime
-
-            except Exception as e:
-                logger.warning(f"Could not load file '{file_path}'. Error: {e}", exc_info=True)
-
-        if not docs:
-            _update_status("complete", files_to_index, files_to_index, "No processable documents found.")
-            logger.warning("File discovery found files, but none could be processed by the loader.")
+            message = "No changes detected."
+            if skipped:
+                message += f" Skipped {skipped} touched files with unchanged content."
+            if removed_files:
+                message += f" Removed {len(removed_files)} deleted or excluded files."
+            _update_status("complete", len(all_filepaths), len(all_filepaths), message, skipped)
             return
 
-        logger.info("Phase 3: Splitting documents into parent/child chunks...")
-        _update_status("running", files_to_index, files_to_index, "Splitting documents...")
+        indexing_params = get_config("indexing_params") or {}
+        loader_workers = max(1, min(indexing_params.get("loader_workers") or os.cpu_count() or 1, files_to_index))
+        load_timeout = indexing_params.get("load_timeout") or DEFAULT_LOAD_TIMEOUT
+        logger.info(
+            f"Phase 3: Streaming {files_to_index} new/modified documents through load, split, embed and upsert "
+            f"with {loader_workers} loader processes..."
+        )
+        _update_status("running", 0, files_to_index, f"Found {files_to_index} changed files, starting processing...", skipped)
         parent_splitter = RecursiveCharacterTextSplitter(chunk_size=2000, chunk_overlap=200)
         child_splitter = RecursiveCharacterTextSplitter(chunk_size=400, chunk_overlap=50)
-
-        parent_docs = parent_splitter.split_documents(docs)
-        child_docs_to_index = []
-        parent_docs_to_save = []
-
-        for parent_doc in parent_docs:
-            parent_id = str(uuid.uuid4())
-            source_path = parent_doc.metadata.get('source', '')
-            parent_docs_to_save.append((parent_id, parent_doc.page_content, source_path))
-
-            child_chunks = child_splitter.split_documents([parent_doc])
-            for chunk in child_chunks:
-                chunk.metadata = parent_doc.metadata.copy()
-                chunk.metadata["parent_id"] = parent_id
-                child_docs_to_index.append(chunk)
-        logger.info(f"Created {len(parent_docs)} parent and {len(child_docs_to_index)} child chunks.")
-
-        if not child_docs_to_index:
-            _update_status("complete", files_to_index, files_to_index, "Could not split documents into chunks.")
-            logger.warning("Documents were loaded but could not be split into indexable chunks.")
+        batch = _IndexBatch()
+        totals = {"files": 0, "parents": 0, "children": 0, "unchanged": 0}
+
+        done = 0
+        # Modified files that were indexed before but now fail to load or contain no text.
+        unloadable_files: List[str] = []
+        for loaded in _load_documents(files_to_process, loader_workers, load_timeout):
+            for file_path, doc, state in loaded:
+                done += 1
+                if doc is None:
+                    if str(file_path) in previous_file_states:
+                        unloadable_files.append(str(file_path))
+                    continue
+                batch.add_document(doc, parent_splitter, child_splitter)
+                batch.file_states[str(file_path)] = state
+                if str(file_path) in previous_file_states:
+                    batch.reindexed_sources.append(str(file_path))
+            _update_status("running", done, files_to_index, f"Loaded: {loaded[-1][0].name}", skipped)
+
+            if len(batch.child_docs) >= INDEX_BATCH_SIZE:
+                _update_status("running", done, files_to_index, f"Embedding {len(batch.child_docs)} chunks...", skipped)
+                _flush_index_batch(client, collection_name, batch, totals)
+                batch = _IndexBatch()
+
+        _flush_index_batch(client, collection_name, batch, totals)
+
+        if unloadable_files:
+            # Their old vectors describe content the files no longer have; they are retried on the next run.
+            logger.info(f"Removing {len(unloadable_files)} modified files without loadable text from the index.")
+            _delete_vectors_for_sources(client, collection_name, unloadable_files)
+            _remove_files_from_docstore(unloadable_files)
+
+        if totals["files"] == 0:
+            _update_status("complete", files_to_index, files_to_index, "No processable documents found.", skipped)
+            logger.warning("File discovery found files, but none could be processed by the loader.")
             return
 
-        logger.info(f"Phase 4: Indexing {len(child_docs_to_index)} child chunks into Qdrant collection '{collection_name}'.")
-        _update_status("running", files_to_index, files_to_index, "Setting up vector collection...")
-
-        collection_exists = any(
-            coll.name == collection_name for coll in client.get_collections().collections
+        logger.info(
+            f"Indexed {totals['files']} files as {totals['parents']} parent and {totals['children']} child chunks "
+            f"({totals['unchanged']} unchanged chunks were not re-embedded)."
         )
-        if not collection_exists:
-            client.recreate_collection(
-                collection_name=collection_name,
-                vectors_config=models.VectorParams(size=EMBEDDING_DIMENSION, distance=models.Distance.COSINE)
-            )
-
-        _update_status("running", files_to_index, files_to_index, f"Embedding {len(child_docs_to_index)} chunks...")
-        contents_to_embed = [doc.page_content for doc in child_docs_to_index]
-        vectors = EMBEDDINGS.embed_documents(contents_to_embed)
-
-        _update_status("running", files_to_index, files_to_index, "Uploading to vector database...")
-        client.upsert(
-            collection_name=collection_name,
-            points=[
-                models.PointStruct(id=str(uuid.uuid4()), vector=vector, payload=doc.metadata)
-                for doc, vector in zip(child_docs_to_index, vectors)
-            ],
-            wait=True
-        )
-
-        logger.info("Phase 5: Persisting document store and file states to disk...")
-        _save_docstore_to_db(parent_docs_to_save)
-        master_file_state = _get_file_state()
-        master_file_state.update(processed_file_states)
-        _save_file_state(master_file_state)
-
-        _update_status("complete", files_to_index, files_to_index, "Indexing complete.")
+        message = "Indexing complete."
+        if totals["unchanged"]:
+            message += f" {totals['unchanged']} unchanged chunks reused."
+        if skipped:
+            message += f" Skipped {skipped} touched files with unchanged content."
+        _update_status("complete", files_to_index, files_to_index, message, skipped)
         logger.info("Qdrant indexing task finished successfully.")
 
     except Exception:
@@ -385,6 +663,64 @@ def run_indexing_task(search_path: str, excluded_folders: Set[str], file_extensi
         _update_status("error", 0, 0, error_message)
         logger.exception(error_message)
 
+def compact_index() -> Dict[str, int]:
+    """
+    Reclaims space left behind by earlier index runs. Deletes parent documents
+    of files that are no longer tracked, then every vector whose file is not
+    tracked or whose parent chunk is gone, and finally VACUUMs the docstore.
+    Returns the number of parents and vectors removed.
+    """
+    client = get_qdrant_client()
+    collection_name = QDRANT_CONFIG["collection_name"]
+    _update_status("running", 0, 0, "Compacting index...")
+    removed = {"parents": 0, "vectors": 0}
+    try:
+        with sqlite3.connect(DOCSTORE_DB_FILE) as conn:
+            removed["parents"] = conn.execute(
+                "DELETE FROM parent_documents WHERE source_path IS NULL "
+                "OR source_path NOT IN (SELECT file_path FROM file_state)"
+            ).rowcount
+            conn.commit()
+            parent_ids = {row[0] for row in conn.execute("SELECT id FROM parent_documents")}
+        tracked_files = _get_file_state()
+
+        if any(coll.name == collection_name for coll in client.get_collections().collections):
+            stale_ids = []
+            offset = None
+            while True:
+                points, offset = client.scroll(
+                    collection_name=collection_name, limit=SCROLL_BATCH_SIZE, offset=offset,
+                    with_payload=["source", "parent_id"], with_vectors=False
+                )
+                for point in points:
+                    payload = point.payload or {}
+                    if payload.get("source") not in tracked_files or payload.get("parent_id") not in parent_ids:
+                        stale_ids.append(point.id)
+                if stale_ids and (offset is None or len(stale_ids) >= SCROLL_BATCH_SIZE):
+                    client.delete(
+                        collection_name=collection_name, points_selector=models.PointIdsList(points=stale_ids), wait=True
+                    )
+                    removed["vectors"] += len(stale_ids)
+                    stale_ids = []
+                if offset is None:
+                    break
+
+        # VACUUM cannot run inside a transaction.
+        conn = sqlite3.connect(DOCSTORE_DB_FILE, isolation_level=None)
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+        message = f"Compaction complete. Removed {removed['parents']} parent chunks and {removed['vectors']} vectors."
+        _update_status("complete", 0, 0, message)
+        logger.info(message)
+    except Exception:
+        error_message = "An unexpected error occurred while compacting the index."
+        _update_status("error", 0, 0, error_message)
+        logger.exception(error_message)
+    return removed
+
 # 6. CORE SEARCH LOGIC ##########################################################################################
 def perform_semantic_search(
     query: str,
@@ -0,0 +1,417 @@
+# backend/text_extraction.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Shared text-extraction service with a persistent, content-addressed cache.
+
+Parsing documents is the most expensive step of classification, training,
+semantic indexing and document-text search, and all of them used to parse the
+same files independently. Every one of them now goes through
+`get_document_text()`, which extracts a file at most once per content:
+
+-   **Loader Registry (`LOADERS`):** `extract_text` picks a loader by file
+    extension. Plain text and source code are read directly with encoding
+    detection, PDFs with PyMuPDF (much faster than a full partition), and
+    only the remaining formats (and PDFs without a text layer) go through
+    `unstructured`, which falls back to a plain text read.
+-   **Content-Addressed Cache:** Extracted text is stored zlib-compressed in
+    SQLite (`extracted_text.db`) under the BLAKE2b hash of the file's bytes,
+    so copies, renames and touched-but-unchanged files are never re-parsed.
+-   **Path Index:** A second table maps `(path, size, mtime)` to the content
+    hash, so the common case of an unchanged file costs one query and no
+    hashing at all.
+-   **Failures Are Not Cached:** Text that a loader could only produce by
+    falling back after an error is returned but never stored, so a locked
+    file or a missing optional dependency is retried next time.
+-   **LRU Eviction:** Entries remember when they were last used; once the
+    compressed texts exceed `text_extraction.cache_max_mb`, the least
+    recently used ones are evicted.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import os
+import time
+import zlib
+import codecs
+import hashlib
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import fitz
+from unstructured.partition.auto import partition
+
+from .config_manager import get_config, DATA_FOLDER
+from .content_matcher import detect_non_utf8_encoding
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+EXTRACTED_TEXT_DB_FILE = os.path.join(DATA_FOLDER, "extracted_text.db")
+
+# Formats whose text can only be found after extraction; other files are matched as raw bytes.
+DOCUMENT_EXTENSIONS = frozenset({
+    ".pdf", ".doc", ".docx", ".odt", ".rtf", ".epub", ".msg", ".eml",
+    ".xls", ".xlsx", ".ods", ".ppt", ".pptx", ".odp",
+})
+
+# Plain-text and source formats that are read directly instead of being partitioned.
+TEXT_EXTENSIONS = frozenset({
+    ".txt", ".md", ".rst", ".log", ".csv", ".tsv", ".json", ".xml", ".tex", ".svg",
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".java", ".c", ".cpp", ".h", ".hpp", ".cs", ".go", ".rb", ".rs",
+    ".swift", ".kt", ".scala", ".php", ".pl", ".vb", ".css", ".scss", ".sass", ".less", ".sql",
+    ".yaml", ".yml", ".ini", ".toml", ".conf", ".cfg", ".env", ".properties", ".sh", ".bash", ".ps1", ".bat",
+})
+# Tried in order for text files without a byte-order mark; latin-1 decodes any byte sequence.
+FALLBACK_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+# Part of every cache key; bump it whenever `extract_text` starts producing different output.
+EXTRACTOR_VERSION = 2
+DEFAULT_CACHE_MAX_MB = 1024
+DEFAULT_COMPRESSION_LEVEL = 6
+# Eviction trims the cache to this fraction of its limit, so it does not run on every insert.
+EVICTION_TARGET_RATIO = 0.9
+# A cache hit refreshes the entry's LRU timestamp at most this often.
+TOUCH_INTERVAL = 300  # seconds
+HASH_BLOCK_SIZE = 1024 * 1024
+
+_EXTRACTED_TEXT_CACHE: Optional["ExtractedTextCache"] = None
+
+# 3. EXTRACTION FUNCTIONS #######################################################################################
+def is_document(path: str) -> bool:
+    """True if `path` has an extension whose text must be extracted before matching."""
+    return os.path.splitext(path)[1].lower() in DOCUMENT_EXTENSIONS
+
+# Each loader has a "checked" form returning `(text, complete)`; `complete` is False when an exception
+# occurred and the text is a fallback, which may be empty or raw and must not be cached for the content.
+def _read_text_file(file_path: Path) -> Tuple[str, bool]:
+    try:
+        data = file_path.read_bytes()
+    except OSError as e:
+        logger.error(f"Text read failed for {file_path.name}: {e}")
+        return "", False
+    return _decode_text(data), True
+
+def read_text_file(file_path: Path) -> str:
+    """
+    Reads a plain-text file directly. UTF-16/UTF-32 files are recognised by
+    their byte-order mark; everything else is decoded with the first of
+    `FALLBACK_ENCODINGS` that fits.
+    """
+    return _read_text_file(file_path)[0]
+
+def _decode_text(data: bytes) -> str:
+    encoding = detect_non_utf8_encoding(data[:4])
+    if encoding:
+        return data.decode(encoding, errors='replace')
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('utf-8', errors='ignore')
+
+def _extract_text_from_file(file_path: Path) -> Tuple[str, bool]:
+    try:
+        if not file_path.is_file():
+            return "", False
+        elements = partition(filename=str(file_path))
+        return "\n".join([str(el) for el in elements]), True
+    except Exception as e:
+        logger.warning(f"Unstructured failed on {file_path.name}: {e}. Falling back to text read.")
+        return _read_text_file(file_path)[0], False
+
+def extract_text_from_file(file_path: Path) -> str:
+    """
+    Extracts text content from a file using 'unstructured' with a fallback.
+    """
+    return _extract_text_from_file(file_path)[0]
+
+def _extract_pdf_text(file_path: Path) -> Tuple[str, bool]:
+    try:
+        with fitz.open(file_path) as pdf_doc:
+            text = "".join(page.get_text() for page in pdf_doc)
+        if text.strip():
+            return text, True
+        logger.debug(f"'{file_path.name}' has no digital text layer; trying unstructured.")
+    except Exception as e:
+        logger.warning(f"PyMuPDF failed on {file_path.name}: {e}. Trying unstructured.")
+        return _extract_text_from_file(file_path)[0], False
+    return _extract_text_from_file(file_path)
+
+def extract_pdf_text(file_path: Path) -> str:
+    """Reads a PDF's text layer with PyMuPDF, using `unstructured` for PDFs without one."""
+    return _extract_pdf_text(file_path)[0]
+
+# Loader per lower-case extension; formats without an entry go through `extract_text_from_file`.
+LOADERS: Dict[str, Callable[[Path], str]] = {
+    ".pdf": extract_pdf_text,
+    **{extension: read_text_file for extension in TEXT_EXTENSIONS},
+}
+
+_CHECKED_LOADERS: Dict[Callable[[Path], str], Callable[[Path], Tuple[str, bool]]] = {
+    read_text_file: _read_text_file,
+    extract_text_from_file: _extract_text_from_file,
+    extract_pdf_text: _extract_pdf_text,
+}
+
+def extract_text(file_path: Path) -> str:
+    """Extracts a file's text without the cache, using the loader registered for its extension."""
+    return extract_text_checked(file_path)[0]
+
+def extract_text_checked(file_path: Path) -> Tuple[str, bool]:
+    """
+    Like `extract_text`, but also returns whether the extraction completed
+    without errors. Text read by a fallback after a loader failed (a locked
+    file, a missing optional dependency) is not complete.
+    """
+    loader = LOADERS.get(file_path.suffix.lower(), extract_text_from_file)
+    checked = _CHECKED_LOADERS.get(loader)
+    return checked(file_path) if checked else (loader(file_path), True)
+
+def file_digest(path: str) -> str:
+    """Returns the BLAKE2b digest of a file's bytes, independent of the extractor version."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_file(path: str) -> str:
+    """Returns the cache key for a file's current content."""
+    return f"{EXTRACTOR_VERSION}:{file_digest(path)}"
+
+# 4. EXTRACTED TEXT CACHE CLASS #################################################################################
+class ExtractedTextCache:
+    """
+    Persistent, compressed, content-addressed cache of extracted text with LRU
+    eviction. Safe to use from several threads and processes at once.
+    """
+    def __init__(self, db_file: str = EXTRACTED_TEXT_DB_FILE, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+                 compression_level: int = DEFAULT_COMPRESSION_LEVEL):
+        self.db_file = db_file
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self._write_lock = threading.Lock()
+        self._stored_bytes = 0
+        self._init_db()
+
+    def _init_db(self):
+        """Creates the cache tables if they don't exist."""
+        try:
+            with sqlite3.connect(self.db_file) as conn:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                # The first version of this cache was keyed by path only.
+                cursor.execute("DROP TABLE IF EXISTS extracted_text")
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS text_blobs (
+                        content_hash TEXT PRIMARY KEY,
+                        data BLOB NOT NULL,
+                        raw_size INTEGER NOT NULL,
+                        stored_size INTEGER NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_text_blobs_last_used ON text_blobs (last_used)")
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS path_index (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime REAL NOT NULL,
+                        content_hash TEXT NOT NULL
+                    )
+                ''')
+                # Eviction deletes path entries by content hash.
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_path_index_hash ON path_index (content_hash)")
+                conn.commit()
+                self._stored_bytes = cursor.execute("SELECT COALESCE(SUM(stored_size), 0) FROM text_blobs").fetchone()[0]
+            logger.debug(f"Extracted text cache initialized successfully at: {self.db_file}")
+        except Exception:
+            logger.exception("Failed to initialize the extracted text cache database.")
+
+    def _decode(self, data: bytes) -> str:
+        return zlib.decompress(data).decode('utf-8')
+
+    def _touch(self, conn: sqlite3.Connection, content_hash: str, last_used: float):
+        now = time.time()
+        if now - last_used >= TOUCH_INTERVAL:
+            with self._write_lock:
+                conn.execute("UPDATE text_blobs SET last_used = ? WHERE content_hash = ?", (now, content_hash))
+                conn.commit()
+
+    def lookup(self, path: str, size: int, mtime: float) -> Optional[Tuple[str, str]]:
+        """
+        Returns the cached text and content hash of a file whose size and mtime
+        are unchanged, or None on a miss. Entries of older extractor versions miss.
+        """
+        try:
+            with sqlite3.connect(self.db_file, timeout=30) as conn:
+                row = conn.execute('''
+                    SELECT b.content_hash, b.data, b.last_used FROM path_index p
+                    JOIN text_blobs b ON b.content_hash = p.content_hash
+                    WHERE p.path = ? AND p.size = ? AND p.mtime = ? AND p.content_hash LIKE ?
+                ''', (path, size, mtime, f"{EXTRACTOR_VERSION}:%")).fetchone()
+                if row is None:
+                    return None
+                self._touch(conn, row[0], row[2])
+                return self._decode(row[1]), row[0]
+        except (sqlite3.Error, zlib.error, UnicodeDecodeError):
+            logger.warning(f"Extracted text cache lookup failed for '{path}'.", exc_info=True)
+            return None
+
+    def _lookup_content(self, content_hash: str) -> Optional[str]:
+        try:
+            with sqlite3.connect(self.db_file, timeout=30) as conn:
+                row = conn.execute(
+                    "SELECT data, last_used FROM text_blobs WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._touch(conn, content_hash, row[1])
+                return self._decode(row[0])
+        except (sqlite3.Error, zlib.error, UnicodeDecodeError):
+            logger.warning(f"Extracted text cache lookup failed for content {content_hash}.", exc_info=True)
+            return None
+
+    def store(self, path: str, size: int, mtime: float, content_hash: str, text: Optional[str]):
+        """Records the path's content hash and, when `text` is given, the compressed text itself."""
+        blob: Optional[Tuple[bytes, int]] = None
+        if text is not None:
+            raw = text.encode('utf-8')
+            blob = (zlib.compress(raw, self.compression_level), len(raw))
+            if len(blob[0]) > self.max_bytes:
+                logger.debug(f"Extracted text of '{path}' exceeds the cache size limit; not caching it.")
+                return
+        with self._write_lock:
+            try:
+                with sqlite3.connect(self.db_file, timeout=30) as conn:
+                    if blob is not None:
+                        inserted = conn.execute(
+                            "INSERT OR IGNORE INTO text_blobs (content_hash, data, raw_size, stored_size, last_used) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (content_hash, blob[0], blob[1], len(blob[0]), time.time())
+                        ).rowcount
+                        self._stored_bytes += len(blob[0]) if inserted else 0
+                    conn.execute(
+                        "INSERT OR REPLACE INTO path_index (path, size, mtime, content_hash) VALUES (?, ?, ?, ?)",
+                        (path, size, mtime, content_hash)
+                    )
+                    conn.commit()
+                    if self._stored_bytes > self.max_bytes:
+                        self._evict(conn)
+            except sqlite3.Error:
+                logger.warning(f"Could not store extracted text for '{path}'.", exc_info=True)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Deletes least recently used texts until the cache is below its target size. Holds the write lock."""
+        # Other processes may have written too, so start from the real total.
+        total = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM text_blobs").fetchone()[0]
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+        evicted = []
+        for content_hash, stored_size in conn.execute("SELECT content_hash, stored_size FROM text_blobs ORDER BY last_used"):
+            if total <= target:
+                break
+            evicted.append((content_hash,))
+            total -= stored_size
+        conn.executemany("DELETE FROM text_blobs WHERE content_hash = ?", evicted)
+        conn.executemany("DELETE FROM path_index WHERE content_hash = ?", evicted)
+        conn.commit()
+        self._stored_bytes = total
+        logger.info(f"Evicted {len(evicted)} entries from the extracted text cache.")
+
+    def get_text(self, path: str, size: Optional[int] = None, mtime: Optional[float] = None) -> str:
+        """
+        Returns the text of a file, extracting it only if no file with the same
+        content has been extracted before. Missing or unreadable files yield "".
+        """
+        return self.get_text_and_hash(path, size, mtime)[0]
+
+    def get_text_and_hash(self, path: str, size: Optional[int] = None, mtime: Optional[float] = None,
+                          digest: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """
+        Like `get_text`, but also returns the cache key of the file's content
+        (None if it is unreadable). A `digest` the caller already computed for
+        the file's current content spares hashing it again on a miss.
+        """
+        try:
+            if size is None or mtime is None:
+                stat_info = os.stat(path)
+                size, mtime = stat_info.st_size, stat_info.st_mtime
+            cached = self.lookup(path, size, mtime)
+            if cached is not None:
+                return cached
+            content_hash = f"{EXTRACTOR_VERSION}:{digest}" if digest else hash_file(path)
+        except OSError as e:
+            logger.debug(f"Could not read '{path}' for text extraction: {e}")
+            return "", None
+
+        text = self._lookup_content(content_hash)
+        if text is not None:
+            self.store(path, size, mtime, content_hash, None)
+            return text, content_hash
+        text, complete = extract_text_checked(Path(path))
+        if complete:
+            self.store(path, size, mtime, content_hash, text)
+        else:
+            # A failure may be transient; caching its fallback text would pin it to this content for good.
+            logger.debug(f"Not caching the text of '{path}' because its extraction failed.")
+        return text, content_hash
+
+# 5. SINGLETON ACCESS ###########################################################################################
+def get_extracted_text_cache() -> ExtractedTextCache:
+    """Returns the process-wide extracted text cache using a singleton pattern."""
+    global _EXTRACTED_TEXT_CACHE
+    if _EXTRACTED_TEXT_CACHE is None:
+        params = get_config("text_extraction") or {}
+        _EXTRACTED_TEXT_CACHE = ExtractedTextCache(
+            max_bytes=int(params.get("cache_max_mb", DEFAULT_CACHE_MAX_MB) * 1024 * 1024),
+            compression_level=params.get("compression_level", DEFAULT_COMPRESSION_LEVEL)
+        )
+    return _EXTRACTED_TEXT_CACHE
+
+def get_document_text(file_path: Path) -> str:
+    """Returns a file's extracted text through the shared cache."""
+    return get_extracted_text_cache().get_text(str(file_path))
+
+def extract_texts(paths: List[str]) -> List[str]:
+    """
+    Process-pool entry point: returns the text of each path, in order, through
+    the cache. A file that cannot be extracted yields "" without failing the batch.
+    """
+    cache = get_extracted_text_cache()
+    texts = []
+    for path in paths:
+        try:
+            texts.append(cache.get_text(path))
+        except Exception:
+            logger.warning(f"Text extraction failed for '{path}'.", exc_info=True)
+            texts.append("")
+    return texts
+
+def extract_text_and_hash(path: str, content_hash: Optional[str] = None, size: Optional[int] = None,
+                          mtime: Optional[float] = None) -> Tuple[str, str, int, float]:
+    """
+    Process-pool entry point for semantic indexing: returns a file's text
+    through the cache together with its content digest and the size and mtime
+    it had before it was read, so a change made while it is being read shows
+    up as a changed mtime next time. `content_hash` is a digest the caller
+    computed when the file had `size` and `mtime`; it is only used if the file
+    still has them, and then the file is not hashed again. Otherwise the digest
+    comes from the cache key the lookup found or computed.
+    """
+    stat_info = os.stat(path)
+    if (stat_info.st_size, stat_info.st_mtime) != (size, mtime):
+        content_hash = None
+    text, cache_key = get_extracted_text_cache().get_text_and_hash(path, stat_info.st_size, stat_info.st_mtime, content_hash)
+    if not content_hash:
+        content_hash = cache_key.partition(":")[2] if cache_key else file_digest(path)
+    return text, content_hash, stat_info.st_size, stat_info.st_mtime
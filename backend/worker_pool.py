@@ -0,0 +1,156 @@
+# backend/worker_pool.py
+
+"""
+# Precision File Search
+# Copyright (c) 2025 Ali Kazemi
+# Licensed under MPL 2.0
+# This file is part of a derivative work and must retain this notice.
+
+Shared, long-lived worker pool for classic searches.
+
+Giving every search its own thread pool multiplies threads by the number of
+concurrent searches, and all of them contend for the same disks. `WorkerPool`
+owns a single set of threads sized by a global budget, and every search
+submits its work through its own `PoolClient`:
+
+-   **Global Budget:** The pool never runs more than `max_workers` tasks at
+    once, however many searches are active. Threads start lazily.
+-   **Fair Scheduling:** Clients with queued work are served round-robin, one
+    task at a time, so a huge search cannot starve a small one.
+-   **Per-Root I/O Limits:** Clients may belong to a named group (a storage
+    root) whose concurrency is capped across all of its clients, e.g. high for
+    an SSD and low for a spinning disk or an NFS mount.
+-   **Executor Interface:** `PoolClient.submit()` returns a standard
+    `concurrent.futures.Future`, and `shutdown(cancel_futures=True)` cancels
+    the client's queued tasks, so clients can stand in for a `ThreadPoolExecutor`.
+"""
+
+# 1. IMPORTS ####################################################################################################
+import threading
+import logging
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# 2. SETUP & CONSTANTS ##########################################################################################
+logger = logging.getLogger(__name__)
+
+_WorkItem = Tuple[Future, Callable[..., Any], tuple]
+
+# 3. POOL CLIENT CLASS ##########################################################################################
+class PoolClient:
+    """A search's handle on the shared pool, with its own queue and concurrency cap."""
+    def __init__(self, pool: "WorkerPool", max_concurrency: int, group: Optional[str], name: str):
+        self.pool = pool
+        self.max_concurrency = max(1, max_concurrency)
+        self.group = group
+        self.name = name
+        self._queue: Deque[_WorkItem] = deque()
+        self._running = 0
+        self._scheduled = False
+        self._closed = False
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        future: Future = Future()
+        self.pool._enqueue(self, (future, fn, args))
+        return future
+
+    def shutdown(self, wait: bool = False, cancel_futures: bool = True):
+        """Stops accepting work and, with `cancel_futures`, cancels everything still queued."""
+        for future in self.pool._close_client(self, cancel_futures):
+            future.cancel()
+
+# 4. WORKER POOL CLASS ##########################################################################################
+class WorkerPool:
+    """Runs tasks from many clients on a bounded set of long-lived threads."""
+    def __init__(self, max_workers: int, group_limits: Optional[Dict[str, int]] = None, name: str = "search-pool"):
+        self.max_workers = max(1, max_workers)
+        self.group_limits = dict(group_limits or {})
+        self.name = name
+        self._condition = threading.Condition()
+        self._ready: Deque[PoolClient] = deque()
+        self._group_running: Dict[str, int] = {}
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+
+    def client(self, max_concurrency: Optional[int] = None, group: Optional[str] = None, name: str = "") -> PoolClient:
+        """Creates a client. `group` names a storage root whose limit is shared by all its clients."""
+        return PoolClient(self, max_concurrency or self.max_workers, group, name)
+
+    def set_group_limit(self, group: str, limit: int):
+        with self._condition:
+            self.group_limits[group] = max(1, limit)
+            self._condition.notify_all()
+
+    # --- Client side ----------------------------------------------------------------------------------------------
+    def _enqueue(self, client: PoolClient, item: _WorkItem):
+        with self._condition:
+            if client._closed:
+                raise RuntimeError("cannot schedule new work after the client has been shut down")
+            client._queue.append(item)
+            self._schedule(client)
+            if self._idle == 0 and len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._condition.notify()
+
+    def _close_client(self, client: PoolClient, cancel_futures: bool) -> List[Future]:
+        with self._condition:
+            client._closed = True
+            if not cancel_futures:
+                return []
+            futures = [future for future, _, _ in client._queue]
+            client._queue.clear()
+            return futures
+
+    # --- Scheduling -----------------------------------------------------------------------------------------------
+    def _schedule(self, client: PoolClient):
+        if not client._scheduled and client._queue:
+            client._scheduled = True
+            self._ready.append(client)
+
+    def _can_run(self, client: PoolClient) -> bool:
+        if client._running >= client.max_concurrency:
+            return False
+        limit = self.group_limits.get(client.group) if client.group is not None else None
+        return limit is None or self._group_running.get(client.group, 0) < limit
+
+    def _next_item(self) -> Tuple[PoolClient, _WorkItem]:
+        """Waits for the next runnable task, serving ready clients round-robin."""
+        while True:
+            for _ in range(len(self._ready)):
+                client = self._ready.popleft()
+                client._scheduled = False
+                if not client._queue:
+                    continue
+                if not self._can_run(client):
+                    self._schedule(client)
+                    continue
+                item = client._queue.popleft()
+                client._running += 1
+                if client.group is not None:
+                    self._group_running[client.group] = self._group_running.get(client.group, 0) + 1
+                self._schedule(client)
+                return client, item
+            self._idle += 1
+            self._condition.wait()
+            self._idle -= 1
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                client, (future, fn, args) = self._next_item()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._condition:
+                    client._running -= 1
+                    if client.group is not None:
+                        self._group_running[client.group] -= 1
+                    self._schedule(client)
+                    self._condition.notify_all()
@@ -0,0 +1,145 @@
+# benchmarks/bench_classic_search.py
+
+"""
+Benchmark for the classic search pipeline in `backend.file_engine`.
+
+Builds a synthetic directory tree (optionally with one very large directory),
+runs `FileSearchEngine.run_search` against it with an in-memory websocket, and
+reports wall time, throughput and peak memory. Peak memory is measured with
+`tracemalloc` (Python allocations) and the process's maximum RSS.
+
+Usage:
+    python -m benchmarks.bench_classic_search --dirs 200 --files-per-dir 500 --big-dir 500000
+    python -m benchmarks.bench_classic_search --search-type file_content --keywords needle
+    python -m benchmarks.bench_classic_search --search-type file_content --use-regex \
+        --keywords "lorem*amet*zzz" --execution-mode processes
+    python -m benchmarks.bench_classic_search --path ~/Documents --search-type file_content --keywords invoice --document-text
+"""
+
+# 1. IMPORTS ####################################################################################################
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.file_engine import FileSearchEngine  # noqa: E402
+
+# 2. HELPERS ####################################################################################################
+class CollectingWebSocket:
+    """Minimal stand-in for a Starlette websocket that only counts messages."""
+    def __init__(self):
+        self.messages = 0
+        self.found = 0
+
+    async def send_json(self, data):
+        self.messages += 1
+        if data.get("type") == "item_found":
+            self.found += 1
+        elif data.get("type") == "items_found":
+            self.found += len(data["items"])
+        elif data.get("type") == "items_evicted":
+            self.found -= len(data["paths"])
+
+    async def send_text(self, text):
+        await self.send_json(json.loads(text))
+
+def build_tree(root: str, dirs: int, files_per_dir: int, big_dir: int, needle_every: int):
+    payload = "lorem ipsum dolor sit amet " * 40
+    counter = 0
+    for d in range(dirs):
+        dirpath = os.path.join(root, f"dir_{d:05d}", "nested")
+        os.makedirs(dirpath, exist_ok=True)
+        for f in range(files_per_dir):
+            counter += 1
+            with open(os.path.join(dirpath, f"file_{f:06d}.txt"), "w", encoding="utf-8") as fh:
+                fh.write(payload + ("needle" if counter % needle_every == 0 else ""))
+    if big_dir:
+        dirpath = os.path.join(root, "big_dir")
+        os.makedirs(dirpath, exist_ok=True)
+        for f in range(big_dir):
+            with open(os.path.join(dirpath, f"item_{f:07d}.log"), "w", encoding="utf-8") as fh:
+                fh.write("x")
+
+def make_request(args) -> SimpleNamespace:
+    return SimpleNamespace(
+        search_path=args.path, keywords=[args.keywords], search_type=SimpleNamespace(value=args.search_type),
+        excluded_folders=None, file_extensions=None if args.document_text else [".txt", ".log"], include_dot_folders=False,
+        case_sensitive=False, use_regex=args.use_regex, file_category=None, min_size=None, max_size=None,
+        skip_binary_files=True, max_snippets_per_file=3, max_results=None, sort=SimpleNamespace(value="mtime_desc"),
+        execution_mode=SimpleNamespace(value=args.execution_mode), search_document_text=args.document_text,
+    )
+
+def max_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+# 3. MAIN #######################################################################################################
+async def run(args):
+    engine = FileSearchEngine(default_excluded_folders=set(), default_file_extensions=[".txt", ".log"])
+    engine.catalog = None  # Always measure the disk pipeline, not the catalog.
+    websocket = CollectingWebSocket()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await engine.run_search(websocket, "benchmark", make_request(args))
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_files = args.dirs * args.files_per_dir + args.big_dir
+    print(f"search_type      : {args.search_type} ({args.execution_mode})")
+    print(f"files on disk    : {total_files}")
+    print(f"matches          : {websocket.found}")
+    print(f"websocket frames : {websocket.messages}")
+    print(f"wall time        : {duration:.2f} s")
+    print(f"throughput       : {total_files / duration:,.0f} files/s")
+    print(f"peak traced mem  : {peak / (1024 * 1024):.1f} MB")
+    print(f"max RSS          : {max_rss_mb():.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the classic search pipeline.")
+    parser.add_argument("--path", help="Existing directory to search. A synthetic tree is generated if omitted.")
+    parser.add_argument("--dirs", type=int, default=100)
+    parser.add_argument("--files-per-dir", type=int, default=200)
+    parser.add_argument("--big-dir", type=int, default=0, help="Number of files in one extra, very large directory.")
+    parser.add_argument("--needle-every", type=int, default=97)
+    parser.add_argument("--search-type", default="file_name", choices=["file_name", "file_content", "folder_name", "file_category"])
+    parser.add_argument("--keywords", default="needle")
+    parser.add_argument("--use-regex", action="store_true")
+    parser.add_argument("--execution-mode", default="auto", choices=["auto", "threads", "processes"])
+    parser.add_argument("--document-text", action="store_true", help="Match PDF/Office files against their extracted text.")
+    args = parser.parse_args()
+
+    temp_dir = None
+    if not args.path:
+        temp_dir = tempfile.mkdtemp(prefix="pfs-bench-")
+        print(f"Generating synthetic tree in {temp_dir}...")
+        build_tree(temp_dir, args.dirs, args.files_per_dir, args.big_dir, args.needle_every)
+        args.path = temp_dir
+    else:
+        args.dirs, args.files_per_dir, args.big_dir = 0, 0, sum(len(f) for _, _, f in os.walk(args.path))
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
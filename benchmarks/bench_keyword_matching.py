@@ -0,0 +1,81 @@
+# benchmarks/bench_keyword_matching.py
+
+"""
+Benchmark for multi-keyword content matching.
+
+Compares, for a growing number of plain keywords, the joined alternation regex
+built by `FileSearchEngine._compile_search_pattern` against the Aho-Corasick
+`KeywordAutomaton` used by `ContentMatcher` for long keyword lists, plus the
+one-`bytes.find`-per-keyword loop the matcher uses for short lists. All are
+asked the same question: which keywords occur in the data. The data is
+synthetic text containing a few of the keywords.
+
+Usage:
+    python -m benchmarks.bench_keyword_matching --keywords 10 100 1000 5000 --size-kb 1024
+"""
+
+# 1. IMPORTS ####################################################################################################
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.keyword_automaton import KeywordAutomaton  # noqa: E402
+
+# 2. HELPERS ####################################################################################################
+def make_keywords(count: int, rng: random.Random):
+    return list({"".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 14))) for _ in range(count * 2)})[:count]
+
+def make_data(size: int, keywords, rng: random.Random) -> bytes:
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do"]
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(keywords) if rng.random() < 0.0005 else rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts).encode("utf-8")
+
+def timed(func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+# 3. MAIN #######################################################################################################
+def main():
+    parser = argparse.ArgumentParser(description="Compare the alternation regex with the keyword automaton.")
+    parser.add_argument("--keywords", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--size-kb", type=int, default=1024, help="Size of the searched data in KB.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'keywords':>9} | {'regex build':>11} | {'regex scan':>10} | {'find loop':>9} | {'AC build':>9} | {'AC scan':>9} | {'found':>5} | backend")
+    for count in args.keywords:
+        keywords = make_keywords(count, rng)
+        data = make_data(args.size_kb * 1024, keywords, rng).lower()
+        encoded = [k.encode("utf-8") for k in keywords]
+
+        regex_build, pattern = timed(lambda: re.compile(b"|".join(map(re.escape, encoded))), 1)
+        regex_scan, regex_found = timed(lambda: set(pattern.findall(data)), args.repeat)
+        find_scan, _ = timed(lambda: [k for k in encoded if data.find(k) != -1], args.repeat)
+        ac_build, automaton = timed(lambda: KeywordAutomaton(encoded), 1)
+        ac_scan, ac_found = timed(lambda: automaton.find_all(data), args.repeat)
+
+        if {encoded[i] for i in ac_found} != regex_found:
+            print(f"warning: results differ for {count} keywords")
+        print(
+            f"{count:>9} | {regex_build:>10.3f}s | {regex_scan:>9.3f}s | {find_scan:>8.3f}s | {ac_build:>8.3f}s | "
+            f"{ac_scan:>8.3f}s | {len(ac_found):>5} | {automaton.backend}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# benchmarks/bench_semantic_indexing.py
+
+"""
+Benchmark for the streaming semantic indexing pipeline in `backend.semantic_search`.
+
+Generates synthetic text corpora of increasing size and indexes each one with
+`run_indexing_task` in a fresh subprocess (so every run starts from an empty
+data folder and its own max RSS), then prints peak RSS against corpus size.
+With a streaming pipeline peak RSS should stay roughly flat as the corpus grows.
+
+The embedding model is replaced by a cheap deterministic hash embedder, and by
+default Qdrant by a client that discards points, so the numbers reflect the
+pipeline itself. Pass `--qdrant-url` to upsert into a real Qdrant server.
+
+Usage:
+    python -m benchmarks.bench_semantic_indexing --sizes-mb 10 40 160
+    python -m benchmarks.bench_semantic_indexing --sizes-mb 50 --qdrant-url http://localhost:6333
+"""
+
+# 1. IMPORTS ####################################################################################################
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+         "et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi").split()
+
+# 2. HELPERS ####################################################################################################
+class HashEmbeddings:
+    """Deterministic stand-in for the embedding model: one cheap pseudo-random vector per text."""
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def embed_query(self, text: str):
+        rng = random.Random(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest())
+        return [rng.uniform(-1.0, 1.0) for _ in range(self.dimension)]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+class DiscardingQdrantClient:
+    """Accepts collection setup, deletes and upserts without storing anything."""
+    def __init__(self):
+        self.points = 0
+
+    def get_collections(self):
+        from types import SimpleNamespace
+        return SimpleNamespace(collections=[])
+
+    def recreate_collection(self, **kwargs):
+        pass
+
+    def create_payload_index(self, **kwargs):
+        pass
+
+    def scroll(self, **kwargs):
+        return [], None
+
+    def delete(self, **kwargs):
+        pass
+
+    def upsert(self, collection_name, points, wait=True):
+        self.points += len(points)
+
+def build_corpus(root: str, size_mb: int, file_kb: int):
+    rng = random.Random(42)
+    files = max(1, size_mb * 1024 // file_kb)
+    for i in range(files):
+        dirpath = os.path.join(root, f"dir_{i // 500:04d}")
+        os.makedirs(dirpath, exist_ok=True)
+        words = []
+        written = 0
+        while written < file_kb * 1024:
+            sentence = " ".join(rng.choice(WORDS) for _ in range(12)) + ".\n"
+            words.append(sentence)
+            written += len(sentence)
+        with open(os.path.join(dirpath, f"doc_{i:06d}.txt"), "w", encoding="utf-8") as fh:
+            fh.write("".join(words))
+    return files
+
+def max_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+# 3. CHILD RUN ##################################################################################################
+def run_child(args):
+    """Indexes one corpus; runs in its own process with its own data folder."""
+    sys.path.insert(0, ROOT)
+    from backend import semantic_search
+
+    embeddings = HashEmbeddings()
+    semantic_search.EMBEDDINGS = embeddings
+    semantic_search.EMBEDDING_DIMENSION = embeddings.dimension
+    if args.qdrant_url:
+        from qdrant_client import QdrantClient
+        semantic_search.QDRANT_CLIENT = QdrantClient(url=args.qdrant_url)
+    else:
+        semantic_search.QDRANT_CLIENT = DiscardingQdrantClient()
+
+    corpus = os.path.join(args.workdir, "corpus")
+    files = build_corpus(corpus, args.size_mb, args.file_kb)
+    baseline_rss = max_rss_mb()
+    start = time.perf_counter()
+    semantic_search.run_indexing_task(corpus, set(), [".txt"], False)
+    duration = time.perf_counter() - start
+    with open(semantic_search.STATUS_FILE, encoding="utf-8") as fh:
+        status = json.load(fh)
+    print(json.dumps({
+        "size_mb": args.size_mb, "files": files, "seconds": duration, "status": status["status"],
+        "baseline_rss_mb": baseline_rss, "peak_rss_mb": max_rss_mb(),
+    }))
+
+# 4. MAIN #######################################################################################################
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of semantic indexing against corpus size.")
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[10, 40, 160])
+    parser.add_argument("--file-kb", type=int, default=32, help="Size of each generated document.")
+    parser.add_argument("--qdrant-url", help="Upsert into this Qdrant server instead of discarding points.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size-mb", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    print(f"{'corpus':>10} {'files':>8} {'time':>9} {'files/s':>9} {'base RSS':>10} {'peak RSS':>10}")
+    for size_mb in args.sizes_mb:
+        workdir = tempfile.mkdtemp(prefix="pfs-index-bench-")
+        # A private config home gives each run an empty docstore, text cache and status file.
+        env = dict(os.environ, XDG_CONFIG_HOME=os.path.join(workdir, "config"), APPDATA=os.path.join(workdir, "config"))
+        command = [sys.executable, "-m", "benchmarks.bench_semantic_indexing", "--child", "--size-mb", str(size_mb),
+                   "--file-kb", str(args.file_kb), "--workdir", workdir]
+        if args.qdrant_url:
+            command += ["--qdrant-url", args.qdrant_url]
+        try:
+            output = subprocess.run(command, cwd=ROOT, env=env, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{size_mb:>7} MB {result['files']:>8} {result['seconds']:>7.1f} s "
+                  f"{result['files'] / result['seconds']:>9.1f} {result['baseline_rss_mb']:>7.1f} MB "
+                  f"{result['peak_rss_mb']:>7.1f} MB  ({result['status']})")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ This script is responsible for initializing and running the FastAPI web server t
 powers the entire backend. Its key responsibilities include:
 
 - **Argument Parsing:** Uses `argparse` to allow setting the logging level via
-  command-line arguments (e.g., `python main.py --debug`).
+  command-line arguments (e.g., `python main.py --debug`), and to run one-off
+  maintenance such as `python main.py --compact-index`.
 - **Logging Setup:** Initializes the application-wide logging configuration
   from `backend.logging_config` at the very beginning of execution.
 - **Database Initialization:** Ensures that the SQLite database for the document
@@ -25,6 +26,7 @@ powers the entire backend. Its key responsibilities include:
 """
 
 # 1. IMPORTS & SETUP ############################################################################################
+import sys
 import threading
 import webbrowser
 import sqlite3
@@ -38,9 +40,6 @@ from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 import logging
 
-from backend.kb_manager import load_and_index_knowledge_base
-from backend.routes import router as api_router
-from backend.app_logic import DB_FILE
 from backend.logging_config import setup_logging, LOG_LEVELS, DEFAULT_LOG_LEVEL
 
 load_dotenv()
@@ -49,6 +48,7 @@ logger = None # Will be initialized after setup_logging
 # 2. APPLICATION INITIALIZATION HELPERS #########################################################################
 def init_db():
     """Initializes the classifier's SQLite database and table if they don't exist."""
+    from backend.app_logic import DB_FILE
     try:
         conn = sqlite3.connect(DB_FILE)
         cursor = conn.cursor()
@@ -119,6 +119,7 @@ async def lifespan(app: FastAPI):
     if logger:
         logger.info("FastAPI application startup...")
     
+    from backend.kb_manager import load_and_index_knowledge_base
     load_and_index_knowledge_base()
     
     if hasattr(app.state, "startup_event"):
@@ -136,7 +137,11 @@ app = FastAPI(
     lifespan=lifespan
 )
 app.mount("/static", StaticFiles(directory="static"), name="static")
-app.include_router(api_router)
+# Worker processes of the search and indexing pools re-import this module as "__mp_main__". They only run
+# backend worker functions, so they skip the API routes and the AI models those routes load on import.
+if __name__ != "__mp_main__":
+    from backend.routes import router as api_router
+    app.include_router(api_router)
 
 # 4. STATIC HTML ENDPOINTS ######################################################################################
 @app.get("/", response_class=HTMLResponse)
@@ -174,6 +179,10 @@ if __name__ == "__main__":
         "-d", "--debug", action="store_true",
         help="Enable DEBUG logging level. A shorthand for --level DEBUG."
     )
+    parser.add_argument(
+        "--compact-index", action="store_true",
+        help="Remove stale vectors and parent chunks from the semantic index, then exit."
+    )
     args = parser.parse_args()
     log_level_to_use = "DEBUG" if args.debug else args.level
 
@@ -181,6 +190,12 @@ if __name__ == "__main__":
     logger = logging.getLogger(__name__)
     
     init_db()
+
+    if args.compact_index:
+        from backend.semantic_search import compact_index
+        removed = compact_index()
+        logger.info(f"Removed {removed['parents']} parent chunks and {removed['vectors']} vectors.")
+        sys.exit(0)
     
     logger.info("="*60)
     logger.info("Starting Precision File Search (PFS)...")
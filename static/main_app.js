@@ -189,7 +189,7 @@ const searchTypeRadios = document.querySelectorAll('input[name="search_type"]');
 const categorySelectorContainer = document.getElementById('category_selector_container');
 const fileCategorySelect = document.getElementById('file_category');
 const sizeFilterContainer = document.getElementById('size-filter-container');
-let ws; let logProgressElement = null; let searchResults = [];
+let ws; let logProgressElement = null; let searchResults = []; let resultDetails = new Map(); let currentTaskId = null;
 
 const saveSearchButton = document.getElementById('saveSearchButton');
 const savedSearchesContainer = document.getElementById('saved-searches-container');
@@ -199,6 +199,8 @@ const deleteSearchButton = document.getElementById('deleteSearchButton');
 const searchHistoryContainer = document.getElementById('search-history-container');
 const searchHistoryList = document.getElementById('search-history-list');
 const MAX_HISTORY = 15;
+// Matching lines shown under each content-search result.
+const MAX_SNIPPETS_PER_FILE = 3;
 
 const allViews = {
     search: { view: searchView, button: searchViewBtn },
@@ -306,6 +308,9 @@ function buildSearchPayload() {
         include_dot_folders: includeDotFoldersCheckbox.checked,
         case_sensitive: document.getElementById('case_sensitive').checked,
         use_regex: document.getElementById('use_regex').checked,
+        search_document_text: document.getElementById('search_document_text').checked,
+        skip_binary_files: document.getElementById('skip_binary_files').checked,
+        max_snippets_per_file: MAX_SNIPPETS_PER_FILE,
         file_category: document.getElementById('file_category').value,
         min_size: convertSizeToBytes(minSizeValue, document.getElementById('min_size_unit').value),
         max_size: convertSizeToBytes(maxSizeValue, document.getElementById('max_size_unit').value)
@@ -322,18 +327,31 @@ function handleWebSocketMessage(data) {
     if (data.type === 'error') {
         appendLog(`<span class="status-error">> ERROR: ${data.message}</span>`);
         if(ws && ws.readyState === WebSocket.OPEN) ws.close();
-    } else if (data.type === 'scan_start') { appendLog(`> TASK ID ${data.task_id} INITIATED.`);
-    } else if (data.type === 'item_found') { appendSingleResult(data.path);
+    } else if (data.type === 'scan_start') { currentTaskId = data.task_id; appendLog(`> TASK ID ${data.task_id} INITIATED.`);
+    } else if (data.type === 'items_found') {
+        data.items.forEach(item => {
+            if (item.keywords || item.snippets) resultDetails.set(item.path, { keywords: item.keywords, snippets: item.snippets });
+            appendSingleResult(item.path);
+        });
+    } else if (data.type === 'items_evicted') {
+        removeResults(data.paths);
     } else if (data.type === 'scan_progress') { updateScanProgress(data);
+    } else if (data.type === 'scan_results') {
+        if (data.page === 1) searchResults = [];
+        searchResults.push(...data.results);
     } else if (data.type === 'scan_complete') {
         logProgressElement = null; appendLog(`<span class="status-complete">> ${data.summary}</span>`);
-        searchResults = data.results; renderResults(searchResults);
+        renderResults(searchResults);
         finishSound.play().catch(error => console.error("Audio playback failed:", error));
+        currentTaskId = null; if (ws && ws.readyState === WebSocket.OPEN) ws.close();
+    } else if (data.type === 'scan_cancelled') {
+        logProgressElement = null; currentTaskId = null;
+        if (ws && ws.readyState === WebSocket.OPEN) ws.close();
     }
 }
 
 function resetUIBeforeSearch() {
-    searchResults = []; resultsSection.classList.remove('hidden');
+    searchResults = []; resultDetails = new Map(); resultsSection.classList.remove('hidden');
     resultsDiv.innerHTML = currentTranslations['awaitingData'] || '> AWAITING DATA...';
     statusSection.classList.remove('hidden'); exportButton.classList.add('hidden');
     searchForm.classList.add('hidden'); scanControlsContainer.classList.remove('hidden');
@@ -353,9 +371,14 @@ function resetUIForNewSearch() {
 function appendSingleResult(path) {
     if (resultsDiv.textContent.startsWith('>')) { resultsDiv.innerHTML = ''; }
     const item = document.createElement('div');
-    item.className = 'result-item';
+    item.className = 'result-item'; item.dataset.path = path;
+    const details = resultDetails.get(path) || {};
+    const keywordsTitle = details.keywords ? ` title="${escapeHTML(details.keywords.join(', '))}"` : '';
+    const snippetsHTML = (details.snippets || []).map(s =>
+        `<div class="result-snippet"><span class="snippet-line">${s.line}:</span> ${escapeHTML(s.before)}<mark>${escapeHTML(s.match)}</mark>${escapeHTML(s.after)}</div>`
+    ).join('');
     item.innerHTML = `
-        <span class="result-path">${escapeHTML(path)}</span>
+        <div class="result-path"${keywordsTitle}>${escapeHTML(path)}${snippetsHTML}</div>
         <div class="result-actions">
             <i class="fas fa-folder-open action-btn" data-path="${escapeHTML(path)}" data-action="folder" title="Open Containing Folder"></i>
             <i class="fas fa-file-alt action-btn" data-path="${escapeHTML(path)}" data-action="file" title="Open File"></i>
@@ -363,6 +386,13 @@ function appendSingleResult(path) {
     resultsDiv.appendChild(item); resultsDiv.scrollTop = resultsDiv.scrollHeight;
 }
 
+function removeResults(paths) {
+    const evicted = new Set(paths);
+    resultsDiv.querySelectorAll('.result-item').forEach(item => {
+        if (evicted.has(item.dataset.path)) { item.remove(); resultDetails.delete(item.dataset.path); }
+    });
+}
+
 function renderResults(results) {
     resultsDiv.innerHTML = '';
     if (results && results.length > 0) {
@@ -385,7 +415,10 @@ function updateScanProgress(data) {
 }
 
 function stopSearch() {
-    if (ws && ws.readyState === WebSocket.OPEN) ws.close();
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        if (currentTaskId) ws.send(JSON.stringify({ type: "cancel_search", task_id: currentTaskId }));
+        else ws.close();
+    }
     appendLog('<span class="status-error">> SCAN MANUALLY TERMINATED.</span>');
     stopButton.disabled = true; const stopButtonSpan = stopButton.querySelector('span');
     if(stopButtonSpan) stopButtonSpan.textContent = 'TERMINATED';
@@ -407,6 +440,8 @@ function populateForm(data) {
     document.querySelector(`input[name="search_type"][value="${data.search_type || 'file_content'}"]`).checked = true;
     document.getElementById('case_sensitive').checked = data.case_sensitive || false;
     document.getElementById('use_regex').checked = data.use_regex || false;
+    document.getElementById('search_document_text').checked = data.search_document_text || false;
+    document.getElementById('skip_binary_files').checked = data.skip_binary_files || false;
     includeDotFoldersCheckbox.checked = data.include_dot_folders || false;
     document.getElementById('file_category').value = data.file_category || '';
     const sizeFields = { min: data.min_size, max: data.max_size };
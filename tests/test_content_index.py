@@ -0,0 +1,113 @@
+# tests/test_content_index.py
+
+import os
+import re
+
+import pytest
+
+from backend.content_index import ContentIndex, build_trigram_query, read_indexable_text
+
+TEXTS = [
+    "The needle is somewhere in this haystack.",
+    "NEEDLE in upper case, and a Colour too.",
+    "foo bar baz",
+    "barbaz without the other one",
+    "alphagamma and betagamma",
+    "xyzyzw repeated groups",
+    "abc then some text and then def",
+    "Café au lait, CAFÉ NOIR",
+    "nothing to see here",
+    "a word; words; sword",
+    "",
+]
+
+PATTERNS = [
+    "needle",
+    "(?i)needle",
+    "foo|barbaz",
+    "abc.*def",
+    "x(yz)+w",
+    "(?:alpha|be)gamma",
+    "colou?r",
+    "(?i)colou?r",
+    "(?i)café",
+    "café",
+    "[ab]cde",
+    r"\bword\b",
+    "(?i:NeEdLe) is",
+    "ab",
+    r"\d+",
+]
+
+
+@pytest.fixture
+def indexed(tmp_path):
+    index = ContentIndex(db_file=str(tmp_path / "index.db"))
+    folder = tmp_path / "files"
+    folder.mkdir()
+    paths = []
+    for number, text in enumerate(TEXTS):
+        path = folder / f"{number}.txt"
+        path.write_text(text, encoding="utf-8")
+        stat_info = path.stat()
+        assert index.index_file(str(path), stat_info.st_size, stat_info.st_mtime) == text
+        paths.append(str(path))
+    index.flush()
+    return index, folder, paths
+
+
+@pytest.mark.parametrize("source", PATTERNS)
+def test_index_never_skips_a_matching_file(indexed, source):
+    index, folder, paths = indexed
+    pattern = re.compile(source)
+    search = index.prepare_search(str(folder), pattern)
+
+    for path, text in zip(paths, TEXTS):
+        stat_info = os.stat(path)
+        if pattern.search(text):
+            assert not search.can_skip(path, stat_info.st_size, stat_info.st_mtime), (source, text)
+
+
+def test_index_narrows_literal_searches(indexed):
+    index, folder, paths = indexed
+    search = index.prepare_search(str(folder), re.compile("barbaz"))
+
+    skipped = {path for path in paths if search.can_skip(path, os.stat(path).st_size, os.stat(path).st_mtime)}
+    assert set(paths) - skipped == {paths[3]}
+
+
+@pytest.mark.parametrize("source", ["ab", r"\d+", "a.b", "[a-z]{5}", "x|yz"])
+def test_patterns_without_required_trigrams_have_no_plan(source):
+    assert build_trigram_query(re.compile(source)) is None
+
+
+def test_stale_and_unindexed_files_are_never_skipped(indexed):
+    index, folder, paths = indexed
+    stat_info = os.stat(paths[8])
+    index.record(paths[7], os.stat(paths[7]).st_size, os.stat(paths[7]).st_mtime, None)
+    index.flush()
+    search = index.prepare_search(str(folder), re.compile("needle"))
+
+    assert search.can_skip(paths[8], stat_info.st_size, stat_info.st_mtime)
+    assert not search.can_skip(paths[8], stat_info.st_size + 1, stat_info.st_mtime)
+    assert not search.can_skip(paths[8], stat_info.st_size, stat_info.st_mtime + 1)
+    assert not search.can_skip(paths[7], os.stat(paths[7]).st_size, os.stat(paths[7]).st_mtime)
+
+
+def test_utf16_files_are_indexed_by_their_text(tmp_path):
+    path = tmp_path / "wide.txt"
+    path.write_bytes("\ufeffa needle in UTF-16".encode("utf-16-le"))
+
+    text = read_indexable_text(str(path), path.stat().st_size, 1024)
+
+    assert text is not None and "needle" in text
+
+
+def test_large_and_binary_files_are_not_indexed(tmp_path):
+    large = tmp_path / "large.txt"
+    large.write_text("x" * 2048)
+    binary = tmp_path / "data.bin"
+    binary.write_bytes(b"needle\x00\x01\x02" * 10)
+
+    assert read_indexable_text(str(large), large.stat().st_size, 1024) is None
+    assert read_indexable_text(str(binary), binary.stat().st_size, 1024) is None
@@ -0,0 +1,112 @@
+# tests/test_content_matcher.py
+
+import re
+
+import pytest
+
+from backend import content_matcher
+from backend.content_matcher import ContentMatcher, is_binary_block, is_bytes_safe_pattern
+
+TEXTS = [
+    "plain ascii text with a needle",
+    "Straße and STRASSE",
+    "naïve café, résumé",
+    "tab\tseparated\tvalues 12345",
+    "emoji 🎉 party",
+    "λόγος and ΛΌΓΟΣ",
+    "word-boundary:word_char",
+    "",
+]
+
+
+@pytest.mark.parametrize("source, flags, safe", [
+    ("needle", 0, True),
+    ("needle", re.IGNORECASE, True),
+    ("foo|ba[rz]+", 0, True),
+    ("a[0-9]{2,}b", 0, True),
+    ("(?=abc)abc", 0, True),
+    (".", 0, False),
+    ("caf.", 0, False),
+    (r"\w+", 0, False),
+    (r"\d", 0, False),
+    (r"\s", 0, False),
+    ("[^a]", 0, False),
+    (r"\bword\b", 0, False),
+    ("café", 0, False),
+    ("[a-é]", 0, False),
+])
+def test_is_bytes_safe_pattern(source, flags, safe):
+    assert is_bytes_safe_pattern(re.compile(source, flags)) is safe
+
+
+@pytest.mark.parametrize("source", ["needle", "ca|ST", "[a-z]{5} ", "e(?!e)", "(ab|a)+c", "^$"])
+@pytest.mark.parametrize("flags", [0, re.IGNORECASE])
+def test_bytes_safe_patterns_match_bytes_like_text(source, flags):
+    pattern = re.compile(source, flags)
+    assert is_bytes_safe_pattern(pattern)
+    bytes_pattern = re.compile(source.encode("utf-8"), flags)
+    for text in TEXTS:
+        assert (bytes_pattern.search(text.encode("utf-8")) is not None) == (pattern.search(text) is not None), text
+
+
+@pytest.mark.parametrize("keywords, use_regex, case_sensitive, source", [
+    (["needle"], False, False, "needle"),
+    (["NEEDLE", "straße"], False, True, "NEEDLE|straße"),
+    (["café", "ΛΌΓΟΣ"], False, False, "café|ΛΌΓΟΣ"),
+    (["ne?dle", "caf*"], True, False, "ne.dle|caf.*"),
+    (["par*y"], True, True, "par.*y"),
+])
+def test_match_file_agrees_with_the_text_pattern(tmp_path, keywords, use_regex, case_sensitive, source):
+    pattern = re.compile(source, 0 if case_sensitive else re.IGNORECASE)
+    matcher = ContentMatcher(keywords, use_regex, case_sensitive, pattern)
+
+    for number, text in enumerate(TEXTS):
+        path = tmp_path / f"{number}.txt"
+        path.write_text(text, encoding="utf-8")
+        match = matcher.match_file(str(path), path.stat().st_size)
+        assert match.matched == (pattern.search(text) is not None), text
+        assert not match.is_binary
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-32", "utf-8-sig"])
+def test_files_with_a_byte_order_mark_are_text(tmp_path, encoding):
+    path = tmp_path / "bom.txt"
+    path.write_text("a needle in a haystack\n" * 20, encoding=encoding)
+    matcher = ContentMatcher(["NEEDLE"], False, False, re.compile("NEEDLE", re.IGNORECASE), max_snippets=1)
+
+    match = matcher.match_file(str(path), path.stat().st_size)
+
+    assert not is_binary_block(path.read_bytes()[:content_matcher.BINARY_SNIFF_SIZE])
+    assert match.matched and not match.is_binary
+    assert match.snippets[0]["match"] == "needle"
+
+
+def test_binary_files_are_skipped_only_on_request(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"\x00\x01\x02needle\x00" * 100)
+    matcher = ContentMatcher(["needle"], False, False, re.compile("needle", re.IGNORECASE))
+
+    assert matcher.match_file(str(path), path.stat().st_size, skip_binary=True) == (False, True, None, None)
+    assert matcher.match_file(str(path), path.stat().st_size, skip_binary=False).matched
+
+
+def test_memory_mapped_files_are_searched_across_windows(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_matcher, "MMAP_THRESHOLD", 1024)
+    monkeypatch.setattr(content_matcher, "LOWERCASE_WINDOW", 4096)
+    path = tmp_path / "large.txt"
+    # Place the keyword across the first window boundary.
+    path.write_bytes(b"x" * 4093 + b"NeEdLe" + b"y" * 8192)
+    matcher = ContentMatcher(["needle"], False, False, re.compile("needle", re.IGNORECASE))
+
+    assert matcher.match_file(str(path), path.stat().st_size).matched
+
+
+def test_snippets_report_line_and_context():
+    pattern = re.compile("needle")
+    matcher = ContentMatcher(["needle"], False, True, pattern, max_snippets=2)
+
+    match = matcher.match_text("first line\nthe needle here\nno match\nneedle again needle\nlast needle")
+
+    assert [(s["line"], s["before"], s["match"], s["after"]) for s in match.snippets] == [
+        (2, "the ", "needle", " here"), (4, "", "needle", " again needle")
+    ]
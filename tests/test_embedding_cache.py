@@ -0,0 +1,70 @@
+# tests/test_embedding_cache.py
+
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from backend import embedding_cache
+from backend.embedding_cache import EmbeddingCache, hash_chunk
+
+
+class CountingEmbeddings:
+    """Stands in for an embedding model; records every text it is asked to embed."""
+    def __init__(self, offset: float = 0.0):
+        self.offset = offset
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)) + self.offset, self.offset] for text in texts]
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "embeddings.db")
+
+
+def test_only_unseen_chunks_are_embedded(db_file):
+    cache = EmbeddingCache("model-a", db_file=db_file)
+    embeddings = CountingEmbeddings()
+
+    first = cache.embed_documents(embeddings, ["alpha", "beta", "alpha"])
+    second = cache.embed_documents(embeddings, ["beta", "gamma!"])
+
+    assert embeddings.calls == [["alpha", "beta"], ["gamma!"]]
+    assert first == [[5.0, 0.0], [4.0, 0.0], [5.0, 0.0]]
+    assert second == [[4.0, 0.0], [6.0, 0.0]]
+
+
+def test_vectors_survive_a_restart(db_file):
+    EmbeddingCache("model-a", db_file=db_file).embed_documents(CountingEmbeddings(), ["alpha"])
+
+    assert EmbeddingCache("model-a", db_file=db_file).lookup([hash_chunk("alpha")]) == {hash_chunk("alpha"): [5.0, 0.0]}
+
+
+def test_model_change_invalidates_the_cache(db_file):
+    EmbeddingCache("model-a", db_file=db_file).embed_documents(CountingEmbeddings(), ["alpha"])
+
+    cache = EmbeddingCache("model-b", db_file=db_file)
+    embeddings = CountingEmbeddings(offset=1.0)
+
+    assert cache.lookup([hash_chunk("alpha")]) == {}
+    assert cache.embed_documents(embeddings, ["alpha"]) == [[6.0, 1.0]]
+    assert embeddings.calls == [["alpha"]]
+    # Switching back does not resurrect the old model's vectors.
+    assert EmbeddingCache("model-a", db_file=db_file).lookup([hash_chunk("alpha")]) == {}
+
+
+def test_least_recently_used_vectors_are_evicted(db_file, monkeypatch):
+    clock = itertools.count(1_700_000_000)
+    monkeypatch.setattr(embedding_cache, "time", SimpleNamespace(time=lambda: float(next(clock))))
+    # Two floats per vector are 8 bytes; room for three vectors.
+    cache = EmbeddingCache("model-a", db_file=db_file, max_bytes=24)
+    embeddings = CountingEmbeddings()
+    for text in ["one", "two", "three", "four"]:
+        cache.embed_documents(embeddings, [text])
+
+    remaining = cache.lookup([hash_chunk(text) for text in ["one", "two", "three", "four"]])
+
+    assert set(remaining) == {hash_chunk("three"), hash_chunk("four")}
@@ -0,0 +1,154 @@
+# tests/test_file_catalog.py
+
+import os
+import threading
+import time
+
+import pytest
+
+from backend import file_catalog
+from backend.file_catalog import FileCatalog
+
+EXCLUDED = {"node_modules"}
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return FileCatalog(db_file=str(tmp_path / "catalog.db"))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "tree"
+    (root / "docs" / "deep").mkdir(parents=True)
+    (root / "node_modules").mkdir()
+    (root / ".hidden").mkdir()
+    (root / "readme.txt").write_text("a")
+    (root / "docs" / "report.pdf").write_text("b")
+    (root / "docs" / "deep" / "notes.md").write_text("c")
+    (root / "node_modules" / "lib.js").write_text("d")
+    (root / ".hidden" / "secret.txt").write_text("e")
+    return root
+
+
+def catalogued_files(catalog, search_path):
+    root_id, _, _ = catalog.find_root(str(search_path), EXCLUDED, False)
+    return {os.path.relpath(path, search_path) for path, _, _, _ in catalog.iter_files(root_id, str(search_path))}
+
+
+def test_cold_catalog_has_no_root(catalog, tree):
+    assert catalog.find_root(str(tree), EXCLUDED, False) is None
+    assert catalog.prepare_search(str(tree), EXCLUDED, False) is None
+
+
+def test_refresh_catalogues_unpruned_files(catalog, tree):
+    stats = catalog.refresh(str(tree), EXCLUDED, False)
+
+    assert stats["relisted"] == stats["directories"]
+    assert catalogued_files(catalog, tree) == {
+        "readme.txt", os.path.join("docs", "report.pdf"), os.path.join("docs", "deep", "notes.md")
+    }
+
+
+def test_roots_are_scoped_by_pruning_settings(catalog, tree):
+    catalog.refresh(str(tree), EXCLUDED, False)
+
+    assert catalog.find_root(str(tree), EXCLUDED, True) is None
+    assert catalog.find_root(str(tree / "docs"), EXCLUDED, False)[1] == str(tree)
+    # Paths inside a pruned folder were never catalogued.
+    assert catalog.find_root(str(tree / "node_modules"), EXCLUDED, False) is None
+
+
+def test_extension_filter(catalog, tree):
+    catalog.refresh(str(tree), EXCLUDED, False)
+    root_id, _, _ = catalog.find_root(str(tree), EXCLUDED, False)
+
+    names = {name for _, name, _, _ in catalog.iter_files(root_id, str(tree), [".PDF", ".md"])}
+    assert names == {"report.pdf", "notes.md"}
+
+
+def test_incremental_refresh_only_relists_changed_directories(catalog, tree):
+    catalog.refresh(str(tree), EXCLUDED, False)
+    (tree / "docs" / "deep" / "added.txt").write_text("f")
+    (tree / "readme.txt").unlink()
+
+    stats = catalog.refresh(str(tree), EXCLUDED, False)
+
+    assert stats["relisted"] == 2
+    assert catalogued_files(catalog, tree) == {
+        os.path.join("docs", "report.pdf"), os.path.join("docs", "deep", "notes.md"),
+        os.path.join("docs", "deep", "added.txt")
+    }
+
+
+def test_removed_directories_are_dropped(catalog, tree):
+    catalog.refresh(str(tree), EXCLUDED, False)
+    (tree / "docs" / "deep" / "notes.md").unlink()
+    (tree / "docs" / "deep").rmdir()
+
+    stats = catalog.refresh(str(tree), EXCLUDED, False)
+
+    assert stats["removed_directories"] == 1
+    assert catalogued_files(catalog, tree) == {"readme.txt", os.path.join("docs", "report.pdf")}
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks are not supported")
+def test_symlinked_directories_are_not_descended(catalog, tree, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "linked.txt").write_text("g")
+    try:
+        os.symlink(outside, tree / "link", target_is_directory=True)
+    except OSError:
+        pytest.skip("cannot create symlinks here")
+
+    catalog.refresh(str(tree), EXCLUDED, False)
+    root_id, _, _ = catalog.find_root(str(tree), EXCLUDED, False)
+
+    assert "link" in {name for _, name, _ in catalog.iter_directories(root_id, str(tree))}
+    assert "linked.txt" not in {name for _, name, _, _ in catalog.iter_files(root_id, str(tree))}
+    assert catalog.find_root(str(tree / "link"), EXCLUDED, False) is None
+
+
+def test_prepare_search_refreshes_a_stale_subtree(catalog, tree, monkeypatch):
+    catalog.refresh(str(tree), EXCLUDED, False)
+    (tree / "docs" / "late.txt").write_text("h")
+    (tree / "outside_subtree.txt").write_text("i")
+    monkeypatch.setattr(file_catalog, "SEARCH_FRESHNESS_WINDOW", 0.0)
+
+    assert catalog.prepare_search(str(tree / "docs"), EXCLUDED, False) == (
+        catalog.find_root(str(tree), EXCLUDED, False)[0], str(tree)
+    )
+    files = catalogued_files(catalog, tree)
+    assert os.path.join("docs", "late.txt") in files
+    # Only the searched subtree was refreshed.
+    assert "outside_subtree.txt" not in files
+
+
+def test_prepare_search_reuses_a_recent_refresh(catalog, tree, monkeypatch):
+    catalog.refresh(str(tree), EXCLUDED, False)
+    monkeypatch.setattr(catalog, "refresh", lambda *args, **kwargs: pytest.fail("refreshed again"))
+
+    assert catalog.prepare_search(str(tree / "docs"), EXCLUDED, False) is not None
+
+
+def test_prepare_search_waits_for_a_running_refresh(catalog, tree, monkeypatch):
+    catalog.refresh(str(tree), EXCLUDED, False)
+    monkeypatch.setattr(file_catalog, "SEARCH_FRESHNESS_WINDOW", 0.0)
+    monkeypatch.setattr(catalog, "refresh", lambda *args, **kwargs: pytest.fail("refresh was duplicated"))
+    running = threading.Event()
+    catalog._active_refreshes[(str(tree), catalog.scope_key(EXCLUDED, False))] = running
+    finished_at = []
+
+    def finish():
+        time.sleep(0.2)
+        finished_at.append(time.monotonic())
+        running.set()
+
+    thread = threading.Thread(target=finish)
+    thread.start()
+    assert catalog.prepare_search(str(tree / "docs"), EXCLUDED, False) is not None
+    returned_at = time.monotonic()
+    thread.join()
+
+    assert finished_at and returned_at >= finished_at[0]
@@ -0,0 +1,71 @@
+# tests/test_keyword_automaton.py
+
+import random
+import re
+
+import pytest
+
+from backend import content_matcher, keyword_automaton
+from backend.content_matcher import ContentMatcher
+from backend.keyword_automaton import KeywordAutomaton
+
+
+@pytest.fixture(params=["python", "pyahocorasick"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(keyword_automaton, "ahocorasick", None)
+    elif keyword_automaton.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed")
+    return request.param
+
+
+def regex_find_all(keywords, data):
+    return {index for index, keyword in enumerate(keywords) if keyword and re.search(re.escape(keyword), data)}
+
+
+def test_overlapping_keywords(backend):
+    keywords = [b"he", b"she", b"his", b"hers", b"", b"he"]
+    automaton = KeywordAutomaton(keywords)
+
+    assert automaton.backend == backend
+    assert automaton.find_all(b"ushers") == {0, 1, 3, 5}
+    assert automaton.find_all(b"ahishe") == {0, 1, 2, 5}
+    assert automaton.find_all(b"nothing") == set()
+
+
+def test_agrees_with_regex_on_random_data(backend):
+    rng = random.Random(7)
+    alphabet = b"abc\xc3\xa9\x00"
+    keywords = [bytes(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(300)]
+    automaton = KeywordAutomaton(keywords)
+
+    for _ in range(50):
+        data = bytes(rng.choice(alphabet) for _ in range(rng.randint(0, 200)))
+        assert automaton.find_all(data) == regex_find_all(keywords, data)
+
+
+@pytest.mark.parametrize("case_sensitive", [True, False])
+def test_matcher_with_automaton_agrees_with_regex(tmp_path, monkeypatch, backend, case_sensitive):
+    monkeypatch.setattr(content_matcher, "MMAP_THRESHOLD", 1024)
+    monkeypatch.setattr(content_matcher, "LOWERCASE_WINDOW", 2048)
+    rng = random.Random(11)
+    keywords = [f"Word{number}x" for number in range(250)]
+    pattern = re.compile("|".join(map(re.escape, keywords)), 0 if case_sensitive else re.IGNORECASE)
+    automaton_matcher = ContentMatcher(keywords, False, case_sensitive, pattern, use_automaton=True, max_snippets=1)
+    regex_matcher = ContentMatcher(keywords, False, case_sensitive, pattern, use_automaton=False)
+    assert automaton_matcher.automaton is not None
+
+    for number in range(20):
+        chosen = rng.sample(keywords, rng.randint(0, 3))
+        words = [rng.choice([k, k.upper()]) for k in chosen] + ["filler"] * rng.randint(0, 800)
+        rng.shuffle(words)
+        path = tmp_path / f"{number}.txt"
+        path.write_text(" ".join(words))
+        text = path.read_text()
+
+        match = automaton_matcher.match_file(str(path), path.stat().st_size)
+        expected = {keywords.index(k) for k in keywords if re.search(re.escape(k), text, 0 if case_sensitive else re.IGNORECASE)}
+        assert match.matched == regex_matcher.match_file(str(path), path.stat().st_size).matched == bool(expected)
+        assert set(match.keywords or []) == {keywords[i] for i in expected}
+        if match.matched:
+            assert pattern.fullmatch(match.snippets[0]["match"])
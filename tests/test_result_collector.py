@@ -0,0 +1,78 @@
+# tests/test_result_collector.py
+
+import asyncio
+import json
+import random
+
+from backend import search_events
+from backend.result_collector import ResultCollector, SORT_MTIME_ASC, SORT_MTIME_DESC, SORT_NONE
+from backend.search_events import SearchEventStream
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+
+def offer(collector, count, seed=3):
+    rng = random.Random(seed)
+    items = [{"path": f"/f{number}", "mtime": rng.random()} for number in range(count)]
+    for item in items:
+        collector.add(item)
+    return items
+
+
+def test_sorted_limit_keeps_the_newest():
+    collector = ResultCollector(5, SORT_MTIME_DESC)
+    items = offer(collector, 100)
+
+    expected = [item["path"] for item in sorted(items, key=lambda item: item["mtime"], reverse=True)[:5]]
+    assert collector.paths() == expected
+    assert collector.truncated and not collector.is_full
+
+
+def test_ascending_sort_keeps_the_oldest():
+    collector = ResultCollector(3, SORT_MTIME_ASC)
+    items = offer(collector, 50)
+
+    assert collector.paths() == [item["path"] for item in sorted(items, key=lambda item: item["mtime"])[:3]]
+
+
+def test_unsorted_limit_is_full_after_k_results():
+    collector = ResultCollector(4, SORT_NONE)
+    offer(collector, 10)
+
+    assert collector.is_full
+    assert collector.paths() == ["/f0", "/f1", "/f2", "/f3"]
+    assert collector.take_evicted() == []
+
+
+def test_streamed_items_minus_evictions_equal_the_final_results(monkeypatch):
+    monkeypatch.setattr(search_events, "ITEM_BATCH_SIZE", 3)
+    websocket = RecordingWebSocket()
+    events = SearchEventStream(websocket, "task")
+    collector = ResultCollector(10, SORT_MTIME_DESC)
+
+    async def run():
+        rng = random.Random(5)
+        for number in range(300):
+            if collector.add({"path": f"/f{number}", "mtime": rng.random()}):
+                await events.item({"path": f"/f{number}"})
+                evicted = collector.take_evicted()
+                if evicted:
+                    await events.evict(evicted)
+        await events.flush()
+
+    asyncio.run(run())
+
+    shown = []
+    for frame in websocket.frames:
+        if frame["type"] == "items_found":
+            shown.extend(item["path"] for item in frame["items"])
+        elif frame["type"] == "items_evicted":
+            for path in frame["paths"]:
+                shown.remove(path)
+    assert sorted(shown) == sorted(collector.paths())
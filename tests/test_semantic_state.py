@@ -0,0 +1,90 @@
+# tests/test_semantic_state.py
+
+import os
+import uuid
+
+import pytest
+
+# Importing the module also loads the configured embedding model.
+semantic_search = pytest.importorskip("backend.semantic_search")
+
+FileState = semantic_search.FileState
+file_digest = semantic_search.file_digest
+_chunk_id = semantic_search._chunk_id
+_content_unchanged = semantic_search._content_unchanged
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("original content")
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    stat_info = path.stat()
+    return path, FileState(stat_info.st_mtime, stat_info.st_size, file_digest(str(path)))
+
+
+def test_chunk_ids_are_stable_uuid5s():
+    chunk_id = _chunk_id("/docs/a.txt", 3, "some chunk text")
+
+    assert chunk_id == _chunk_id("/docs/a.txt", 3, "some chunk text")
+    assert uuid.UUID(chunk_id).version == 5
+
+
+@pytest.mark.parametrize("scope, ordinal, content", [
+    ("/docs/b.txt", 3, "some chunk text"),
+    ("/docs/a.txt", 4, "some chunk text"),
+    ("/docs/a.txt", 3, "other chunk text"),
+    ("/docs/a.txt#3", 0, "some chunk text"),
+])
+def test_chunk_ids_change_with_location_and_content(scope, ordinal, content):
+    assert _chunk_id(scope, ordinal, content) != _chunk_id("/docs/a.txt", 3, "some chunk text")
+
+
+def test_untouched_file_is_not_hashed(document, monkeypatch):
+    path, state = document
+    monkeypatch.setattr(semantic_search, "file_digest", lambda path: pytest.fail("file was hashed"))
+
+    assert _content_unchanged(path, state) == (True, None)
+
+
+def test_size_change_is_a_change(document):
+    path, state = document
+    path.write_text("original content, extended")
+
+    assert _content_unchanged(path, state) == (False, None)
+
+
+def test_touched_file_with_same_content_is_unchanged(document):
+    path, state = document
+    os.utime(path, (1_700_000_100, 1_700_000_100))
+
+    unchanged, new_state = _content_unchanged(path, state)
+
+    assert unchanged
+    assert new_state == FileState(path.stat().st_mtime, state.size, state.content_hash)
+
+
+def test_same_size_rewrite_is_a_change(document):
+    path, state = document
+    path.write_text("modified content")
+    assert path.stat().st_size == state.size
+
+    unchanged, new_state = _content_unchanged(path, state)
+
+    assert not unchanged
+    assert new_state.content_hash == file_digest(str(path)) != state.content_hash
+
+
+def test_legacy_state_is_completed_once(document):
+    path, state = document
+
+    unchanged, new_state = _content_unchanged(path, FileState(state.modified_time, None, None))
+
+    assert unchanged and new_state == state
+
+
+def test_touched_file_without_a_recorded_hash_is_a_change(document):
+    path, state = document
+    os.utime(path, (1_700_000_100, 1_700_000_100))
+
+    assert _content_unchanged(path, state._replace(content_hash=None)) == (False, None)
@@ -0,0 +1,46 @@
+# tests/test_text_extraction.py
+
+import pytest
+
+text_extraction = pytest.importorskip("backend.text_extraction")
+
+SAMPLE = "Grüße, naïve café — ΛΌΓΟΣ\nsecond line"
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "utf-32"])
+def test_plain_text_is_decoded_by_its_byte_order_mark(tmp_path, encoding):
+    path = tmp_path / "sample.txt"
+    data = SAMPLE.encode(encoding)
+    if encoding in ("utf-16-le", "utf-16-be"):
+        data = "\ufeff".encode(encoding) + data
+    path.write_bytes(data)
+
+    assert text_extraction.read_text_file(path) == SAMPLE
+
+
+def test_legacy_encodings_fall_back_to_cp1252(tmp_path):
+    path = tmp_path / "legacy.txt"
+    path.write_bytes("naïve café – “quoted”".encode("cp1252"))
+
+    assert text_extraction.read_text_file(path) == "naïve café – “quoted”"
+
+
+def test_text_files_are_read_without_unstructured(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_extraction, "partition", lambda **kwargs: pytest.fail("unstructured was used"))
+    path = tmp_path / "notes.MD"
+    path.write_text(SAMPLE, encoding="utf-16")
+
+    assert text_extraction.extract_text_checked(path) == (SAMPLE, True)
+
+
+def test_failed_extractions_are_not_cached(tmp_path, monkeypatch):
+    cache = text_extraction.ExtractedTextCache(db_file=str(tmp_path / "text.db"))
+    path = tmp_path / "report.docx"
+    path.write_bytes(b"not really a document")
+    results = iter([("raw fallback", False), ("extracted text", True)])
+    monkeypatch.setattr(text_extraction, "extract_text_checked", lambda file_path: next(results))
+
+    assert cache.get_text(str(path)) == "raw fallback"
+    assert cache.get_text(str(path)) == "extracted text"
+    # The complete extraction is cached and served without extracting again.
+    assert cache.get_text(str(path)) == "extracted text"